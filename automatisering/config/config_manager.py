@@ -14,15 +14,46 @@ class ExportFormat(str, Enum):
     PDF = "pdf"
     EPUB = "epub"
 
+class OutputBackend(str, Enum):
+    FILES = "files"  # Losse bestanden per paragraaf (Chapter X/Paragraph Y/...)
+    SQLITE = "sqlite"  # Eén geïndexeerd archief per boek (exports/<boek>.sqlite)
+
+class TableFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"  # Eén regel per rij; objecten als de tabel een kopregel heeft
+
+class ExtractionMode(str, Enum):
+    PER_FIELD = "per_field"  # Eén Playwright call per veld (oud gedrag)
+    BATCH = "batch"  # Alle selectors in één page.evaluate
+
+class ReadyStrategy(str, Enum):
+    NETWORKIDLE = "networkidle"  # Wacht tot er geen netwerk verkeer meer is
+    DOM_SETTLE = "dom_settle"  # Wacht tot de DOM een tijdje niet meer verandert
+    SELECTOR = "selector"  # Wacht tot een doel-element verschijnt
+
 class UITheme(str, Enum):
     LIGHT = "light"
     DARK = "dark"
 
+class LogLevel(str, Enum):
+    DEBUG = "DEBUG"
+    INFO = "INFO"
+    WARNING = "WARNING"
+    ERROR = "ERROR"
+
 class ScrapeField(BaseModel):
     """Een door de gebruiker gedefinieerd veld voor Point-and-Click scraping"""
     name: str
     selector: str
-    action: str = "Tekst" # Tekst, HTML, Link, Afbeelding
+    action: str = "Tekst" # Tekst, HTML, Link, Afbeelding, Tabel
+
+class ReadyConfig(BaseModel):
+    """Hoe bepaald wordt dat de pagina klaar is na een klik of navigatie"""
+    strategy: ReadyStrategy = ReadyStrategy.NETWORKIDLE
+    quiet_ms: int = Field(300, description="Periode zonder DOM mutaties voordat de pagina als stabiel geldt (dom_settle)")
+    selector: Optional[str] = Field(None, description="Element dat moet verschijnen (selector), anders de standaard voor deze plek")
+    settle_ms: int = Field(1000, description="Vaste extra pauze na networkidle (oud gedrag)")
+    timeout_ms: Optional[int] = Field(None, description="Maximale wachttijd, standaard de navigatie timeout")
 
 class LoginStep(BaseModel):
     """Een enkele stap in het login proces"""
@@ -34,6 +65,7 @@ class LoginStep(BaseModel):
     wait_after_ms: Optional[int] = Field(1000, description="Wacht tijd na actie in milliseconden")
     expected_element: Optional[str] = Field(None, description="Selector om op te wachten na actie")
     indices: Optional[List[int]] = Field(None, description="Lijst van indices om over te lussen (voor loop_ acties)")
+    ready: Optional[ReadyConfig] = Field(None, description="Wacht strategie na de actie (vervangt wait_after_ms indien gezet)")
 
 class LoginConfig(BaseModel):
     use_login: bool = True
@@ -67,16 +99,45 @@ class UIStructureConfig(BaseModel):
     assignments_sidebar_item_selector: str = ".assignments .nav-item"
     lesson_content_selector: str = ".lesson-content"
     image_selector: str = ".lesson-content img"
+    chapter_ready: ReadyConfig = ReadyConfig(settle_ms=0)
+    paragraph_ready: ReadyConfig = ReadyConfig()
+
+class DownloadConfig(BaseModel):
+    """Gedeelde HTTP client voor afbeelding en media downloads"""
+    max_connections: int = Field(32, ge=1, description="Maximaal aantal open verbindingen in totaal")
+    max_connections_per_host: int = Field(6, ge=1, description="Maximaal aantal open verbindingen per host")
+    keepalive_timeout: float = Field(30.0, description="Hoe lang een idle verbinding open blijft (s)")
+    timeout: float = Field(30.0, description="Timeout per request (s)")
+    max_retries: int = Field(3, ge=1, description="Aantal pogingen per download")
+    retry_backoff: float = Field(2.0, description="Wachttijd voor de eerste retry, verdubbelt per poging (s)")
+    use_browser_cookies: bool = Field(True, description="Stuur de cookies van de browser context mee")
+    media_max_concurrent: int = Field(3, ge=1, description="Maximaal aantal gelijktijdige media downloads")
+    media_max_per_host: int = Field(2, ge=1, description="Maximaal aantal gelijktijdige media downloads per host")
+    media_drain_timeout: float = Field(300.0, description="Hoe lang afsluiten op lopende media downloads wacht (s)")
 
 class UIConfig(BaseModel):
     theme: UITheme = UITheme.LIGHT
+    overlay_log_level: LogLevel = Field(LogLevel.INFO, description="Minimum niveau van log regels in de browser overlay")
+    gui_log_level: LogLevel = Field(LogLevel.DEBUG, description="Minimum niveau van log regels in het GUI log venster")
+    log_flush_ms: int = Field(100, ge=10, description="Interval (ms) waarmee gebufferde log regels naar overlay en GUI gaan")
 
 class OutputConfig(BaseModel):
     output_dir: str = str(Path.home() / "Documents" / "boek-extracts")
     filename_template: str = "{book}_{chapter_index}_{paragraph_index}_{label}.txt"
     manifest_filename: str = "manifest.json"
     save_images: bool = False
+    write_queue_size: int = Field(64, ge=1, description="Maximaal aantal paragrafen dat op schrijven wacht voordat de scraper afremt")
+    write_batch_size: int = Field(16, ge=1, description="Aantal paragrafen dat per schrijfronde weggeschreven wordt")
+    capture_images: bool = Field(True, description="Neem afbeeldingen over uit de browser responses i.p.v. ze opnieuw te downloaden")
+    image_capture_cache_mb: int = Field(64, ge=1, description="Maximale grootte van de cache met afbeeldingen uit de browser")
+    dedupe_images: bool = Field(False, description="Bewaar afbeeldingen één keer in een gedeelde blob store (blobs/) i.p.v. per paragraaf")
     export_format: ExportFormat = ExportFormat.TXT
+    incremental: bool = Field(False, description="Herhaalde run: alleen gewijzigde paragrafen en afbeeldingen opnieuw wegschrijven")
+    search_index: bool = Field(True, description="Houd een full-text zoekindex (search.db) bij van alle geëxporteerde paragrafen")
+    output_backend: OutputBackend = Field(OutputBackend.FILES, description="Losse bestanden of één SQLite archief per boek")
+    table_format: TableFormat = Field(TableFormat.CSV, description="Formaat van tabellen uit custom velden met actie 'Tabel' (naast de paragraaf export)")
+    metrics_interval: int = Field(15, ge=0, description="Schrijf elke N seconden metrics.json en metrics.prom in de run map (0 = uit)")
+    trace: bool = Field(False, description="Schrijf een Chrome trace (runs/<id>/trace.json) van stappen, lussen, paragrafen en schrijfacties")
     download_videos: bool = False
 
 class BrowserConfig(BaseModel):
@@ -88,8 +149,17 @@ class BrowserConfig(BaseModel):
     keep_open_on_error: bool = True
     resume_mode: bool = False
     parallel_mode: bool = False
+    parallel_workers: int = Field(3, ge=1, description="Aantal warme worker pagina's in parallel mode")
+    highlight_pause_ms: int = Field(500, description="Pauze na het highlighten van een element (0 = geen pauze)")
+    storage_state_path: Optional[str] = Field(None, description="Playwright storage state (cookies/localStorage) om een nieuwe context mee te starten")
     use_stealth: bool = True
 
+class ResourcePolicyConfig(BaseModel):
+    """Welke requests de browser mag doen en welke Python te zien krijgt"""
+    blocked_resource_types: List[str] = Field(default_factory=list, description="Resource types om te blokkeren, bijv. font, media, websocket")
+    blocked_url_patterns: List[str] = Field(default_factory=list, description="URL globs om te blokkeren, bijv. **/google-analytics.com/**")
+    passthrough_url_patterns: List[str] = Field(default_factory=list, description="URL globs die altijd doorgaan zonder Python te bereiken")
+
 class TimeoutsConfig(BaseModel):
     navigation: int = 15000
     selector: int = 8000
@@ -112,10 +182,13 @@ class ScraperConfig(BaseModel):
     ui: UIConfig = UIConfig()
     output: OutputConfig = OutputConfig()
     browser: BrowserConfig = BrowserConfig()
+    resource_policy: ResourcePolicyConfig = ResourcePolicyConfig()
+    download: DownloadConfig = DownloadConfig()
     timeouts: TimeoutsConfig = TimeoutsConfig()
     retry_policy: RetryPolicyConfig = RetryPolicyConfig()
     auto_scrape: bool = False
     custom_fields: List[ScrapeField] = Field(default_factory=list)
+    extraction_mode: ExtractionMode = ExtractionMode.BATCH
     target: TargetConfig = TargetConfig()
 
 class ConfigManager:
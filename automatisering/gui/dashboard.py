@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSlot, QSize
 from PyQt6.QtGui import QFont, QColor
 
+from utils.metrics import STAGES
+
 class StatCard(QFrame):
     """Een moderne statistiek-kaart voor op het dashboard"""
     def __init__(self, title, icon, value="0", unit="", color="#4a9eff"):
@@ -141,6 +143,40 @@ class DashboardWidget(QWidget):
         progress_layout.addWidget(self.progress_bar)
         
         self.main_layout.addWidget(progress_group)
+        
+        # Fasen Sectie: waar gaat de tijd per paragraaf naartoe
+        stages_group = QFrame()
+        stages_group.setStyleSheet("""
+            QFrame {
+                background-color: #2b2b2b;
+                border: 1px solid #3d3d3d;
+                border-radius: 8px;
+            }
+            QLabel {
+                border: none;
+            }
+        """)
+        stages_layout = QGridLayout(stages_group)
+        stages_layout.setContentsMargins(15, 15, 15, 15)
+        stages_layout.setHorizontalSpacing(20)
+        
+        for col, header in enumerate(["Fase", "p50", "p95", "p99", "Per min"]):
+            header_lbl = QLabel(header)
+            header_lbl.setStyleSheet("font-size: 11px; font-weight: bold; color: #888888;")
+            stages_layout.addWidget(header_lbl, 0, col)
+        
+        self.stage_labels = {}
+        for row, (stage, label) in enumerate(STAGES.items(), start=1):
+            stages_layout.addWidget(QLabel(label), row, 0)
+            values = []
+            for col in range(1, 5):
+                value_lbl = QLabel("-")
+                value_lbl.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                stages_layout.addWidget(value_lbl, row, col)
+                values.append(value_lbl)
+            self.stage_labels[stage] = values
+        
+        self.main_layout.addWidget(stages_group)
         self.main_layout.addStretch()
         
     @pyqtSlot(dict)
@@ -161,6 +197,21 @@ class DashboardWidget(QWidget):
         self.progress_bar.setValue(int(progress))
         self.lbl_pct.setText(f"{int(progress)}%")
         
+        for stage, stats in summary.get("stages", {}).items():
+            labels = self.stage_labels.get(stage)
+            if not labels or not stats.get("count"):
+                continue
+            p50, p95, p99, per_min = labels
+            p50.setText(self._format_ms(stats["p50_ms"]))
+            p95.setText(self._format_ms(stats["p95_ms"]))
+            p99.setText(self._format_ms(stats["p99_ms"]))
+            per_min.setText(f"{stats['per_min']:.1f}")
+        
+    @staticmethod
+    def _format_ms(ms: float) -> str:
+        """Korte weergave van een duur: ms onder de seconde, anders seconden"""
+        return f"{ms:.0f} ms" if ms < 1000 else f"{ms / 1000:.1f} s"
+        
     def reset(self):
         """Reset alle dashboard waarden"""
         self.card_progress.update_value("0 / 0")
@@ -169,3 +220,6 @@ class DashboardWidget(QWidget):
         self.card_eta.update_value("--:--:--")
         self.progress_bar.setValue(0)
         self.lbl_pct.setText("0%")
+        for labels in self.stage_labels.values():
+            for value_lbl in labels:
+                value_lbl.setText("-")
@@ -725,12 +725,40 @@ class MainWindow(QMainWindow):
         grid.addWidget(self.chk_save_images, row, 0, 1, 2)
         row += 1
         
+        # Dedupe images checkbox
+        self.chk_dedupe_images = QCheckBox("Dubbele afbeeldingen één keer opslaan (blobs/)")
+        self.chk_dedupe_images.setChecked(False)
+        grid.addWidget(self.chk_dedupe_images, row, 0, 1, 2)
+        row += 1
+        
+        # Capture images checkbox
+        self.chk_capture_images = QCheckBox("Afbeeldingen uit de browser overnemen (geen extra download)")
+        self.chk_capture_images.setChecked(True)
+        grid.addWidget(self.chk_capture_images, row, 0, 1, 2)
+        row += 1
+        
         # Download videos checkbox (Nieuw)
         self.chk_download_videos = QCheckBox("Video's downloaden")
         self.chk_download_videos.setChecked(False)
         grid.addWidget(self.chk_download_videos, row, 0, 1, 2)
         row += 1
         
+        self.chk_incremental = QCheckBox("Incrementeel: alleen gewijzigde paragrafen herschrijven")
+        self.chk_incremental.setChecked(False)
+        grid.addWidget(self.chk_incremental, row, 0, 1, 2)
+        row += 1
+        
+        self.chk_fresh_start = QCheckBox("Opnieuw beginnen (voortgang van een afgebroken run negeren)")
+        self.chk_fresh_start.setChecked(False)
+        self.chk_fresh_start.setToolTip("Zelfde als --fresh op de command line: wist de crawl frontier van deze configuratie")
+        grid.addWidget(self.chk_fresh_start, row, 0, 1, 2)
+        row += 1
+        
+        self.chk_trace = QCheckBox("Trace opnemen (runs/<id>/trace.json, voor Perfetto/chrome://tracing)")
+        self.chk_trace.setChecked(False)
+        grid.addWidget(self.chk_trace, row, 0, 1, 2)
+        row += 1
+        
         # Export Format (Nieuw)
         self.lbl_export_format = QLabel("Export Formaat:")
         self.cmb_export_format = QComboBox()
@@ -739,6 +767,41 @@ class MainWindow(QMainWindow):
         grid.addWidget(self.cmb_export_format, row, 1)
         row += 1
         
+        # Opslag: losse bestanden of één archief per boek
+        self.lbl_output_backend = QLabel("Opslag:")
+        self.cmb_output_backend = QComboBox()
+        self.cmb_output_backend.addItem("Losse bestanden", "files")
+        self.cmb_output_backend.addItem("Eén archief per boek (SQLite)", "sqlite")
+        grid.addWidget(self.lbl_output_backend, row, 0)
+        grid.addWidget(self.cmb_output_backend, row, 1)
+        row += 1
+        
+        # Formaat voor tabellen uit custom velden met actie "Tabel"
+        self.lbl_table_format = QLabel("Tabel Formaat:")
+        self.cmb_table_format = QComboBox()
+        self.cmb_table_format.addItem("CSV", "csv")
+        self.cmb_table_format.addItem("JSONL", "jsonl")
+        grid.addWidget(self.lbl_table_format, row, 0)
+        grid.addWidget(self.cmb_table_format, row, 1)
+        row += 1
+        
+        # Minimum log niveau per bestemming (overlay in de browser, GUI log venster)
+        self.lbl_overlay_log_level = QLabel("Overlay Log Niveau:")
+        self.cmb_overlay_log_level = QComboBox()
+        self.cmb_overlay_log_level.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.cmb_overlay_log_level.setCurrentText("INFO")
+        grid.addWidget(self.lbl_overlay_log_level, row, 0)
+        grid.addWidget(self.cmb_overlay_log_level, row, 1)
+        row += 1
+        
+        self.lbl_gui_log_level = QLabel("GUI Log Niveau:")
+        self.cmb_gui_log_level = QComboBox()
+        self.cmb_gui_log_level.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.cmb_gui_log_level.setCurrentText("DEBUG")
+        grid.addWidget(self.lbl_gui_log_level, row, 0)
+        grid.addWidget(self.cmb_gui_log_level, row, 1)
+        row += 1
+        
         # Images directory (alleen zichtbaar als save images is aangevinkt)
         self.lbl_images_dir = QLabel("Afbeeldingen Directory:")
         self.txt_images_dir = QLineEdit()
@@ -802,6 +865,14 @@ class MainWindow(QMainWindow):
         browser_layout.addWidget(self.chk_parallel_mode, row, 0, 1, 2)
         row += 1
         
+        self.lbl_parallel_workers = QLabel("Parallelle worker pagina's:")
+        self.spin_parallel_workers = QSpinBox()
+        self.spin_parallel_workers.setRange(1, 32)
+        self.spin_parallel_workers.setValue(3)
+        browser_layout.addWidget(self.lbl_parallel_workers, row, 0)
+        browser_layout.addWidget(self.spin_parallel_workers, row, 1)
+        row += 1
+        
         # Stealth Mode (Nieuw)
         self.chk_use_stealth = QCheckBox("Stealth Mode (voorkom bot-detectie)")
         self.chk_use_stealth.setChecked(True)
@@ -1085,6 +1156,11 @@ class MainWindow(QMainWindow):
         qt_handler = self.logger.get_qt_handler()
         qt_handler.log_signal.connect(self.handle_log_message)
         
+    def handle_log_batch(self, entries: list):
+        """Verwerk een gebufferde batch runner logs (via de LogBus) in één keer"""
+        for message, level, _timestamp in entries:
+            self.handle_log_message(message, level)
+        
     def handle_log_message(self, message: str, level):
         """Verwerk log berichten voor GUI weergave.
         Ondersteunt zowel logger (int levels) als runner (str levels)."""
@@ -1679,6 +1755,8 @@ class MainWindow(QMainWindow):
         self.lbl_images_dir.setVisible(enabled)
         self.txt_images_dir.setVisible(enabled)
         self.btn_browse_images.setVisible(enabled)
+        self.chk_dedupe_images.setVisible(enabled)
+        self.chk_capture_images.setVisible(enabled)
         
     def toggle_user_data_dir(self):
         """Toon/verberg user data directory velden"""
@@ -1878,8 +1956,14 @@ class MainWindow(QMainWindow):
             filename_template=self.txt_filename_template.text(),
             manifest_filename="manifest.json",
             save_images=self.chk_save_images.isChecked(),
+            dedupe_images=self.chk_dedupe_images.isChecked(),
+            capture_images=self.chk_capture_images.isChecked(),
             export_format=self.cmb_export_format.currentText(),
-            download_videos=self.chk_download_videos.isChecked()
+            output_backend=self.cmb_output_backend.currentData(),
+            table_format=self.cmb_table_format.currentData(),
+            download_videos=self.chk_download_videos.isChecked(),
+            incremental=self.chk_incremental.isChecked(),
+            trace=self.chk_trace.isChecked()
         )
 
         browser_config = BrowserConfig(
@@ -1891,6 +1975,7 @@ class MainWindow(QMainWindow):
             keep_open_on_error=self.chk_keep_open_on_error.isChecked(),
             resume_mode=getattr(self, '_resume_mode', False),
             parallel_mode=self.chk_parallel_mode.isChecked(),
+            parallel_workers=self.spin_parallel_workers.value(),
             use_stealth=self.chk_use_stealth.isChecked()
         )
 
@@ -1905,7 +1990,10 @@ class MainWindow(QMainWindow):
         )
 
         ui_config = UIConfig(
-            theme=self.current_theme
+            theme=self.current_theme,
+            overlay_log_level=self.cmb_overlay_log_level.currentText(),
+            gui_log_level=self.cmb_gui_log_level.currentText(),
+            log_flush_ms=self.current_config.ui.log_flush_ms if self.current_config else 100
         )
 
         # Haal custom fields op (Point-and-Click Scraper)
@@ -1983,15 +2071,31 @@ class MainWindow(QMainWindow):
         self.txt_output_dir.setText(config.output.output_dir)
         self.txt_filename_template.setText(config.output.filename_template)
         self.chk_save_images.setChecked(config.output.save_images)
+        self.chk_dedupe_images.setChecked(getattr(config.output, 'dedupe_images', False))
+        self.chk_capture_images.setChecked(getattr(config.output, 'capture_images', True))
         
         # New Output settings
         self.chk_download_videos.setChecked(getattr(config.output, 'download_videos', False))
+        self.chk_incremental.setChecked(getattr(config.output, 'incremental', False))
+        self.chk_trace.setChecked(getattr(config.output, 'trace', False))
         export_format = getattr(config.output, 'export_format', 'txt')
         if hasattr(export_format, 'value'): # Als het een enum is
             export_format = export_format.value
         index = self.cmb_export_format.findText(export_format)
         if index >= 0:
             self.cmb_export_format.setCurrentIndex(index)
+        output_backend = getattr(config.output, 'output_backend', 'files')
+        if hasattr(output_backend, 'value'):
+            output_backend = output_backend.value
+        index = self.cmb_output_backend.findData(output_backend)
+        if index >= 0:
+            self.cmb_output_backend.setCurrentIndex(index)
+        table_format = getattr(config.output, 'table_format', 'csv')
+        if hasattr(table_format, 'value'):
+            table_format = table_format.value
+        index = self.cmb_table_format.findData(table_format)
+        if index >= 0:
+            self.cmb_table_format.setCurrentIndex(index)
 
         # Browser config
         self.chk_headless.setChecked(config.browser.headless)
@@ -2007,9 +2111,13 @@ class MainWindow(QMainWindow):
             self.btn_theme_toggle.setChecked(self.current_theme == UITheme.DARK)
             self.btn_theme_toggle.setText("🌙 Dark Mode" if self.current_theme == UITheme.DARK else "☀️ Light Mode")
             ThemeManager.apply_theme(QApplication.instance(), self.current_theme)
+            for combo, level in ((self.cmb_overlay_log_level, getattr(config.ui, 'overlay_log_level', 'INFO')),
+                                 (self.cmb_gui_log_level, getattr(config.ui, 'gui_log_level', 'DEBUG'))):
+                combo.setCurrentText(getattr(level, 'value', level))
         
         # New Browser settings
         self.chk_parallel_mode.setChecked(getattr(config.browser, 'parallel_mode', False))
+        self.spin_parallel_workers.setValue(getattr(config.browser, 'parallel_workers', 3))
         self.chk_use_stealth.setChecked(getattr(config.browser, 'use_stealth', True))
 
         # Timeouts config
@@ -2184,6 +2292,14 @@ class MainWindow(QMainWindow):
                     self.runner_thread.quit()
                     self.runner_thread.wait()
 
+            if self.chk_fresh_start.isChecked():
+                # Zelfde als --fresh: niet hervatten waar een afgebroken run gebleven was
+                from storage.frontier import CrawlFrontier
+                frontier = CrawlFrontier.for_config(config)
+                frontier.reset()
+                frontier.close()
+                self.logger.info("Crawl frontier gewist, run begint opnieuw")
+
             # Blokkeer signals van de tabel en het model tijdens startup om loops te voorkomen
             self.login_steps_table.blockSignals(True)
             if self.login_steps_table.model():
@@ -2226,7 +2342,7 @@ class MainWindow(QMainWindow):
             
             self.runner.progress_update.connect(self.update_progress)
             self.runner.status_update.connect(self.update_status)
-            self.runner.log_message.connect(self.handle_log_message)
+            self.runner.log_batch.connect(self.handle_log_batch)
             self.runner.error_occurred.connect(self.handle_runner_error)
             self.runner.captcha_detected.connect(self.handle_captcha)
             self.runner.book_found.connect(self.on_books_found)
@@ -2469,7 +2585,7 @@ class MainWindow(QMainWindow):
         
         # Actie kolom (bijv. "Tekst", "Attribuut", "HTML")
         combo = QComboBox()
-        combo.addItems(["Tekst", "HTML", "Link (href)", "Afbeelding (src)"])
+        combo.addItems(["Tekst", "HTML", "Link (href)", "Afbeelding (src)", "Tabel"])
         self.field_table.setCellWidget(row, 2, combo)
         
         # Selecteer de nieuwe rij
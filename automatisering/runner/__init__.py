@@ -7,8 +7,13 @@ Bevat Playwright scraping logica.
 __version__ = "1.0.0"
 __author__ = "Noordhoff Scraper Team"
 
-from .playwright_runner import BookScrapeRunner
+from .playwright_runner import ScrapeRunner, HAS_QT
 from .navigator import Navigator
 from .extractor import Extractor
 
-__all__ = ['BookScrapeRunner', 'Navigator', 'Extractor']
\ No newline at end of file
+__all__ = ['ScrapeRunner', 'Navigator', 'Extractor']
+
+# Qt adapter alleen beschikbaar als PyQt6 geïnstalleerd is
+if HAS_QT:
+    from .playwright_runner import BookScrapeRunner
+    __all__.append('BookScrapeRunner')
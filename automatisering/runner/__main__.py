@@ -0,0 +1,133 @@
+# runner/__main__.py
+"""
+Headless command line runner.
+
+Gebruik:
+    python -m runner --config mijn_config.json --headless --books "0-3"
+    python -m runner --config mijn_config.json --headless --workers 4
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from config.config_manager import ConfigManager
+from runner.coordinator import ScrapeCoordinator
+from runner.playwright_runner import ScrapeRunner
+from storage.frontier import CrawlFrontier
+from utils.helpers import parse_indices
+from utils.logger import Logger
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m runner",
+        description="Voer een scraper configuratie uit zonder GUI"
+    )
+    parser.add_argument("--config", required=True, help="Pad naar de JSON configuratie")
+    parser.add_argument("--headless", action="store_true", help="Start de browser zonder venster")
+    parser.add_argument("--books", help="Boek indices om te scrapen, bijv. \"0, 2-4\" (overschrijft de configuratie)")
+    parser.add_argument("--output", help="Output map (overschrijft de configuratie)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Aantal browser processen waarover de boeken verdeeld worden")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Negeer de crawl frontier van een eerdere (gecrashte) run en begin opnieuw")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Loop geëxporteerde paragrafen opnieuw na en herschrijf alleen wat veranderd is")
+    parser.add_argument("--trace", action="store_true",
+                        help="Schrijf een Chrome trace naar runs/<id>/trace.json")
+    return parser
+
+
+async def run_cli(args: argparse.Namespace, runners: Optional[List[ScrapeRunner]] = None) -> int:
+    """
+    Laad de configuratie, draai één batch run en retourneer de exit code.
+    De runner komt in `runners` zodat main() hem na een Ctrl-C kan opruimen.
+    """
+    config = ConfigManager().load_config(args.config)
+
+    if args.headless:
+        config.browser.headless = True
+    if args.books:
+        config.target.books = parse_indices(args.books)
+    if args.output:
+        config.output.output_dir = args.output
+    if args.incremental:
+        config.output.incremental = True
+    if args.trace:
+        config.output.trace = True
+
+    if args.fresh:
+        frontier = CrawlFrontier.for_config(config)
+        frontier.reset()
+        frontier.close()
+
+    # Batch run: geen GUI die de browser kan overnemen of nieuwe stappen kan sturen
+    config.auto_scrape = True
+    config.browser.keep_open_on_error = False
+
+    logger = Logger(use_qt=False)
+
+    if args.workers > 1:
+        coordinator = ScrapeCoordinator(config, workers=args.workers, logger=logger, fresh=args.fresh)
+        try:
+            results = await coordinator.run()
+        finally:
+            logger.cleanup()
+        errors = [error for result in results for error in result["errors"]]
+        for error in errors:
+            print(f"Fout: {error}", file=sys.stderr)
+        return 1 if errors or not results else 0
+
+    runner = ScrapeRunner(config, logger)
+    runner.live_mode = False
+    if runners is not None:
+        runners.append(runner)
+
+    errors = []
+    runner.error_occurred.connect(errors.append)
+
+    def on_captcha(screenshot_path: str, html_path: str):
+        # Niemand om de CAPTCHA op te lossen: stop in plaats van eeuwig te wachten
+        errors.append(f"CAPTCHA gedetecteerd, run gestopt (screenshot: {screenshot_path})")
+        runner.stop()
+
+    runner.captcha_detected.connect(on_captcha)
+
+    try:
+        await runner.run()
+    finally:
+        logger.cleanup()
+
+    for error in errors:
+        print(f"Fout: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    runners: List[ScrapeRunner] = []
+    # Eigen event loop i.p.v. asyncio.run: na een Ctrl-C moet de cleanup nog in
+    # dezelfde loop kunnen draaien, anders is de Playwright verbinding al weg
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    task = loop.create_task(run_cli(args, runners))
+    try:
+        return loop.run_until_complete(task)
+    except KeyboardInterrupt:
+        print("Onderbroken, browser sluiten en voortgang opslaan...", file=sys.stderr)
+        for runner in runners:
+            runner.stop()
+        task.cancel()
+        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        for runner in runners:
+            loop.run_until_complete(runner.cleanup())
+        return 130
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
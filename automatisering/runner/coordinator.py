@@ -0,0 +1,236 @@
+# runner/coordinator.py
+"""
+Verdeelt de boeken van één configuratie over meerdere worker processen.
+
+Elk proces draait een eigen ScrapeRunner met een eigen Playwright instance
+en browser context. Inloggen gebeurt één keer: de coordinator voert de
+stappen vóór de eerste lus uit, bewaart de storage state (cookies en
+localStorage) en start elke worker daarmee. Voltooide paragrafen komen in
+de gedeelde ProgressIndex in de output directory terecht, en de exports
+staan in dezelfde exports/<boek> structuur als bij een run in één proces.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from config.config_manager import ScraperConfig, LoginStep
+from utils.helpers import generate_run_id
+from utils.tracing import Tracer, merge_traces
+
+LOOP_ACTIONS = ("loop_books", "loop_chapters", "loop_paragraphs")
+STORAGE_STATE_FILENAME = "storage_state.json"
+
+
+def shard_books(books: List[int], workers: int) -> List[List[int]]:
+    """
+    Verdeel boek indices round-robin over maximaal `workers` shards.
+    Lege shards worden weggelaten.
+    """
+    workers = max(1, min(workers, len(books)))
+    shards = [books[i::workers] for i in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+def split_login_steps(steps: List[LoginStep]) -> Tuple[List[LoginStep], List[LoginStep]]:
+    """Splits stappen in een login deel (vóór de eerste lus) en de rest"""
+    for i, step in enumerate(steps):
+        if step.action in LOOP_ACTIONS:
+            return steps[:i], steps[i:]
+    return steps, []
+
+
+def build_worker_config(config: ScraperConfig, books: List[int], storage_state_path: str) -> ScraperConfig:
+    """
+    Maak de configuratie voor één worker: alleen de eigen boeken, geen
+    login stappen (de sessie komt uit de storage state) en een losse context.
+    """
+    worker = config.model_copy(deep=True)
+    _, remaining = split_login_steps(worker.login.login_steps)
+
+    has_book_loop = False
+    for step in remaining:
+        if step.action == "loop_books":
+            step.indices = list(books)
+            has_book_loop = True
+
+    worker.login.login_steps = remaining
+    worker.target.books = list(books)
+    # Zonder boeken-lus moet de standaard flow de boeken scrapen
+    worker.auto_scrape = worker.auto_scrape or not has_book_loop
+
+    # Een persistent profiel of CDP browser kan niet door meerdere processen gedeeld worden
+    worker.browser.use_persistent_context = False
+    worker.browser.attach_to_existing = False
+    worker.browser.keep_open_on_error = False
+    worker.browser.resume_mode = False
+    worker.browser.storage_state_path = storage_state_path
+    return worker
+
+
+async def prepare_session(config: ScraperConfig, storage_state_path: Path, logger=None) -> List[int]:
+    """
+    Log één keer in en bewaar de sessie voor de workers.
+
+    Returns:
+        Indices van alle gevonden boeken (voor als de configuratie er geen noemt)
+    """
+    from runner.playwright_runner import ScrapeRunner
+
+    runner = ScrapeRunner(config, logger)
+    runner.live_mode = False
+    runner.intentional_stop = True  # Browser altijd sluiten na het vastleggen van de sessie
+    runner.loop = asyncio.get_running_loop()
+
+    try:
+        await runner.setup_browser()
+        await runner.page.goto(
+            config.start_url,
+            timeout=config.timeouts.navigation,
+            wait_until="networkidle"
+        )
+
+        login_steps, _ = split_login_steps(config.login.login_steps)
+        if login_steps:
+            await runner._execute_sequence(login_steps, 0)
+
+        storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        await runner.context.storage_state(path=str(storage_state_path))
+        runner.log(f"Sessie opgeslagen in {storage_state_path}", "SUCCESS")
+
+        if config.target.books:
+            return list(config.target.books)
+        try:
+            books = await runner.find_books()
+        except Exception as e:
+            runner.log(f"Boeken zoeken mislukt: {str(e)}", "WARNING")
+            return []
+        return [index for _, index in books]
+    finally:
+        await runner.cleanup()
+
+
+def _run_worker(config_data: Dict[str, Any], worker_id: int, fresh: bool = False) -> Dict[str, Any]:
+    """Entry point van een worker proces (moet op module niveau staan voor spawn)"""
+    from runner.playwright_runner import ScrapeRunner
+    from storage.frontier import CrawlFrontier
+    from utils.logger import Logger
+
+    config = ScraperConfig(**config_data)
+    if fresh:
+        frontier = CrawlFrontier.for_config(config)
+        frontier.reset()
+        frontier.close()
+    logger = Logger(use_qt=False)
+    runner = ScrapeRunner(config, logger)
+    runner.live_mode = False
+
+    errors: List[str] = []
+    runner.error_occurred.connect(errors.append)
+
+    def on_captcha(screenshot_path: str, html_path: str):
+        errors.append(f"CAPTCHA gedetecteerd in worker {worker_id} (screenshot: {screenshot_path})")
+        runner.stop()
+
+    runner.captcha_detected.connect(on_captcha)
+
+    try:
+        asyncio.run(runner.run())
+    except Exception as e:
+        errors.append(f"Worker {worker_id} gecrasht: {str(e)}")
+    finally:
+        logger.cleanup()
+
+    return {
+        "worker_id": worker_id,
+        "books": config.target.books,
+        "run_id": runner.run_id,
+        "errors": errors
+    }
+
+
+class ScrapeCoordinator:
+    """Draait één configuratie verdeeld over een pool van worker processen"""
+
+    def __init__(self, config: ScraperConfig, workers: int = 2, logger=None, fresh: bool = False):
+        """
+        Args:
+            config: Volledige scraper configuratie (inclusief login stappen)
+            workers: Maximaal aantal gelijktijdige browser processen
+            logger: Optionele logger voor de coordinator zelf
+            fresh: Negeer de crawl frontier van eerdere runs per worker
+        """
+        self.config = config
+        self.workers = max(1, int(workers))
+        self.fresh = fresh
+        self.logger = logger
+        self.storage_state_path = Path(config.output.output_dir) / STORAGE_STATE_FILENAME
+
+    def log(self, message: str, level: str = "INFO"):
+        if self.logger and hasattr(self.logger, level.lower()):
+            getattr(self.logger, level.lower())(message)
+        else:
+            print(f"[{level}] {message}")
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """
+        Log in, verdeel de boeken en wacht tot alle workers klaar zijn.
+
+        Returns:
+            Resultaat per worker (boeken, run_id, fouten)
+        """
+        try:
+            books = await prepare_session(self.config, self.storage_state_path, self.logger)
+            if not books:
+                self.log("Geen boeken om te verdelen", "WARNING")
+                return []
+            return await self._run_shards(books)
+        finally:
+            # De storage state bevat sessie cookies, niet laten slingeren
+            self.storage_state_path.unlink(missing_ok=True)
+
+    async def _run_shards(self, books: List[int]) -> List[Dict[str, Any]]:
+        """Start een worker proces per shard en verzamel de resultaten"""
+        shards = shard_books(books, self.workers)
+        self.log(f"{len(books)} boek(en) verdeeld over {len(shards)} worker(s)", "INFO")
+
+        # Spawn in plaats van fork: Playwright en asyncio zijn niet fork-safe
+        mp_context = multiprocessing.get_context("spawn")
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=mp_context) as pool:
+            futures = [
+                loop.run_in_executor(
+                    pool,
+                    _run_worker,
+                    build_worker_config(self.config, shard, str(self.storage_state_path)).model_dump(mode="json"),
+                    worker_id,
+                    self.fresh
+                )
+                for worker_id, shard in enumerate(shards, start=1)
+            ]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+
+        summary: List[Dict[str, Any]] = []
+        for worker_id, (shard, result) in enumerate(zip(shards, results), start=1):
+            if isinstance(result, Exception):
+                result = {"worker_id": worker_id, "books": shard, "run_id": None,
+                          "errors": [f"Worker {worker_id} proces fout: {str(result)}"]}
+            for error in result["errors"]:
+                self.log(error, "ERROR")
+            summary.append(result)
+
+        if self.config.output.trace:
+            self._merge_worker_traces(summary)
+        return summary
+
+    def _merge_worker_traces(self, summary: List[Dict[str, Any]]):
+        """Voeg de traces van alle workers samen, zodat de overlap tussen processen zichtbaar is"""
+        runs_dir = Path(self.config.output.output_dir) / "runs"
+        paths = [runs_dir / result["run_id"] / Tracer.FILENAME for result in summary if result.get("run_id")]
+        paths = [path for path in paths if path.exists()]
+        if not paths:
+            return
+        target = runs_dir / generate_run_id() / Tracer.FILENAME
+        count = merge_traces(paths, target)
+        self.log(f"Traces van {len(paths)} worker(s) samengevoegd ({count} events): {target}", "INFO")
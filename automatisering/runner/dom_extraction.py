@@ -0,0 +1,199 @@
+# runner/dom_extraction.py
+from typing import Dict, Any, Optional
+
+from playwright.async_api import Page
+
+from config.config_manager import ScraperConfig
+
+# Custom veld actie waarmee een hele tabel uitgelezen wordt
+TABLE_ACTION = "Tabel"
+
+# Zet een tabel (of het eerste <table> binnen het element) in de pagina om naar
+# een rechthoekig grid. Cellen met rowspan/colspan worden over alle posities
+# die ze beslaan herhaald; header geeft aan of de eerste rij uit <th> bestaat.
+READ_TABLE_JS = """
+(el) => {
+    const table = el.tagName === 'TABLE' ? el : el.querySelector('table');
+    if (!table) return null;
+    const trs = Array.from(table.rows);
+    const grid = trs.map(() => []);
+    trs.forEach((tr, r) => {
+        let c = 0;
+        for (const cell of tr.cells) {
+            while (grid[r][c] !== undefined) c++;
+            const text = cell.innerText.trim();
+            const rowSpan = Math.min(Math.max(1, cell.rowSpan), trs.length - r);
+            const colSpan = Math.max(1, cell.colSpan);
+            for (let dr = 0; dr < rowSpan; dr++) {
+                for (let dc = 0; dc < colSpan; dc++) grid[r + dr][c + dc] = text;
+            }
+            c += colSpan;
+        }
+    });
+    const width = grid.reduce((max, row) => Math.max(max, row.length), 0);
+    const firstRow = trs.find(tr => tr.cells.length);
+    return {
+        rows: grid.filter(row => row.length)
+                  .map(row => Array.from({length: width}, (_, i) => row[i] ?? '')),
+        header: !!firstRow && Array.from(firstRow.cells).every(cell => cell.tagName === 'TH')
+    };
+}
+"""
+
+# Losse tabel extractie: één evaluate in plaats van een round trip per rij en cel
+EXTRACT_TABLE_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    return el ? (""" + READ_TABLE_JS + """)(el) : null;
+}
+"""
+
+# Eén in-page script dat alle geconfigureerde selectors in één keer uitleest.
+# Het wacht (binnen de timeout) tot leerdoelen en leerstof zichtbaar zijn en
+# retourneert daarna alles als één JSON object, zodat een paragraaf maar één
+# CDP round trip kost in plaats van één per veld.
+EXTRACT_PARAGRAPH_JS = """
+async (spec) => {
+    const readTable = """ + READ_TABLE_JS + """;
+    const isVisible = (el) => {
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && el.getClientRects().length > 0;
+    };
+    const required = [spec.objectives, spec.lesson].filter(Boolean);
+    const allVisible = () => required.every(sel => isVisible(document.querySelector(sel)));
+
+    if (required.length && !allVisible()) {
+        await new Promise(resolve => {
+            const done = () => { observer.disconnect(); clearTimeout(timer); resolve(); };
+            const observer = new MutationObserver(() => { if (allVisible()) done(); });
+            const timer = setTimeout(done, spec.timeout);
+            observer.observe(document.documentElement, {
+                childList: true, subtree: true, attributes: true, characterData: true
+            });
+        });
+    }
+
+    const readText = (sel) => {
+        if (!sel) return null;
+        const el = document.querySelector(sel);
+        return isVisible(el) ? el.innerText : null;
+    };
+
+    const result = {
+        objectives: readText(spec.objectives),
+        lesson: readText(spec.lesson),
+        custom_data: {},
+        tables: {},
+        images: []
+    };
+
+    const overlay = window.__logOverlay;
+    for (const field of spec.fields) {
+        if (field.action === '""" + TABLE_ACTION + """') {
+            // Tabellen gaan apart mee; ze worden naast de paragraaf als CSV/JSONL bewaard
+            try {
+                const el = document.querySelector(field.selector);
+                const table = el ? readTable(el) : null;
+                if (table) {
+                    if (overlay && spec.highlight) overlay.highlight(el);
+                    result.tables[field.name] = table;
+                }
+            } catch (e) {}
+            continue;
+        }
+        let value = '';
+        try {
+            const el = document.querySelector(field.selector);
+            if (el) {
+                if (overlay && spec.highlight) overlay.highlight(el);
+                if (field.action === 'HTML') value = el.innerHTML;
+                else if (field.action === 'Link (href)') value = el.getAttribute('href');
+                else if (field.action === 'Afbeelding (src)') value = el.getAttribute('src');
+                else value = el.innerText;
+            }
+        } catch (e) {
+            value = '';
+        }
+        result.custom_data[field.name] = value;
+    }
+
+    if (spec.images) {
+        result.images = Array.from(document.querySelectorAll(spec.images))
+            .map(img => img.getAttribute('src'));
+    }
+
+    return result;
+}
+"""
+
+
+def build_extraction_spec(config: ScraperConfig, include_images: bool = True) -> Dict[str, Any]:
+    """
+    Bouw de selector specificatie voor het extractie script uit de configuratie.
+
+    Args:
+        config: Actieve scraper configuratie
+        include_images: Of afbeelding URLs ook verzameld moeten worden
+
+    Returns:
+        JSON-serialiseerbare specificatie voor EXTRACT_PARAGRAPH_JS
+    """
+    ui = config.ui_structure
+    return {
+        "objectives": ui.learning_objectives_selector or None,
+        "lesson": ui.lesson_content_selector or None,
+        "fields": [
+            {"name": field.name, "selector": field.selector, "action": field.action}
+            for field in config.custom_fields
+        ],
+        "images": ui.image_selector if include_images and ui.image_selector else None,
+        "timeout": config.timeouts.selector,
+        "highlight": not config.browser.headless
+    }
+
+
+async def extract_paragraph(page: Page, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extraheer leerdoelen, leerstof, custom velden en afbeelding URLs in één evaluate.
+
+    Args:
+        page: Playwright Page object
+        spec: Specificatie uit build_extraction_spec
+
+    Returns:
+        Dictionary met objectives, lesson, custom_data, tables (veldnaam ->
+        {"rows", "header"}), images en missing (lijst van verplichte secties
+        die niet gevonden werden)
+    """
+    result = await page.evaluate(EXTRACT_PARAGRAPH_JS, spec)
+
+    missing = []
+    if spec.get("objectives") and result.get("objectives") is None:
+        missing.append("objectives")
+    if spec.get("lesson") and result.get("lesson") is None:
+        missing.append("lesson")
+
+    return {
+        "objectives": result.get("objectives") or "",
+        "lesson": result.get("lesson") or "",
+        "custom_data": {name: value or "" for name, value in (result.get("custom_data") or {}).items()},
+        "tables": result.get("tables") or {},
+        "images": result.get("images") or [],
+        "missing": missing
+    }
+
+
+async def extract_table(page: Page, selector: str) -> Optional[Dict[str, Any]]:
+    """
+    Lees een tabel in één evaluate uit, inclusief rowspan/colspan.
+
+    Args:
+        page: Playwright Page object
+        selector: Selector van de tabel of een element dat de tabel bevat
+
+    Returns:
+        {"rows": 2D lijst met celteksten, "header": eerste rij is een kopregel},
+        of None als er geen tabel gevonden is
+    """
+    return await page.evaluate(EXTRACT_TABLE_JS, selector)
@@ -0,0 +1,100 @@
+# runner/events.py
+import asyncio
+from typing import Any, Callable, Dict, List, Tuple, AsyncIterator
+
+
+class BoundSignal:
+    """Signaal gebonden aan één runner instance (Qt-vrije tegenhanger van pyqtSignal)"""
+
+    def __init__(self, owner: Any, name: str):
+        self._owner = owner
+        self._name = name
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable):
+        """Registreer een callback die bij elke emit aangeroepen wordt"""
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Callable = None):
+        """Verwijder een callback (of alle callbacks als slot None is)"""
+        if slot is None:
+            self._slots.clear()
+        elif slot in self._slots:
+            self._slots.remove(slot)
+
+    def emit(self, *args):
+        """Roep alle callbacks aan en publiceer het event op de event stream"""
+        for slot in list(self._slots):
+            try:
+                slot(*args)
+            except Exception as e:
+                print(f"Fout in callback voor signaal '{self._name}': {str(e)}")
+
+        publish = getattr(self._owner, "_publish_event", None)
+        if publish:
+            publish(self._name, args)
+
+
+class Signal:
+    """
+    Descriptor die per instance een BoundSignal oplevert.
+
+    Heeft dezelfde interface als pyqtSignal (connect/emit), zodat de runner
+    zonder Qt kan draaien en een Qt adapter de signalen simpelweg kan
+    overschrijven met echte pyqtSignals.
+    """
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = ""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        key = f"_signal_{self.name}"
+        bound = instance.__dict__.get(key)
+        if bound is None:
+            bound = BoundSignal(instance, self.name)
+            instance.__dict__[key] = bound
+        return bound
+
+
+def signal_types(cls) -> Dict[str, Tuple]:
+    """Alle Signal descriptors van een klasse (inclusief basisklassen) als naam -> argument types"""
+    signals = {}
+    for klass in reversed(cls.__mro__):
+        for name, attr in vars(klass).items():
+            if isinstance(attr, Signal):
+                signals[name] = attr.types
+    return signals
+
+
+class EventStreamMixin:
+    """Biedt alle geëmitte signalen aan als async event stream"""
+
+    def _publish_event(self, name: str, args: Tuple):
+        for queue in list(self.__dict__.get("_event_queues", [])):
+            try:
+                queue.put_nowait((name, args))
+            except asyncio.QueueFull:
+                pass  # Trage consumer, event laten vallen in plaats van de runner te blokkeren
+
+    async def events(self, maxsize: int = 1000) -> AsyncIterator[Tuple[str, Tuple]]:
+        """
+        Async iterator over alle runner events als (signaal naam, argumenten).
+
+        Gebruik:
+            async for name, args in runner.events():
+                ...
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        queues = self.__dict__.setdefault("_event_queues", [])
+        queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            queues.remove(queue)
@@ -4,6 +4,28 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 from playwright.async_api import Page, ElementHandle
 
+from runner.dom_extraction import extract_table
+
+# Patronen worden één keer gecompileerd; de tekstfuncties hieronder draaien
+# ook in bulk (zie storage/postprocess.py) en mogen per aanroep niets opbouwen
+_WHITESPACE_RE = re.compile(r'\s+')
+_LIST_ITEM_RE = re.compile(r'^(?:[•\-\*]|\d+\.)\s+')
+_HEADING_RE = re.compile(r'^[A-Z][^a-z]*$')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_URL_RE = re.compile(r'https?://[^\s<>"\']+|www\.[^\s<>"\']+')
+_NO_WHITESPACE_TABLE = str.maketrans('', '', ' \n\t')
+
+# Keywords voor verschillende content types, in volgorde van voorrang
+_CONTENT_TYPE_PATTERNS = [
+    (content_type, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+    for content_type, keywords in (
+        ("objectives", ["leerdoel", "doelstelling", "doelen", "na dit hoofdstuk", "je leert"]),
+        ("exercise", ["opdracht", "oefening", "vraag", "opgave", "antwoord"]),
+        ("summary", ["samenvatting", "conclusie", "kernpunten", "belangrijkste"]),
+    )
+]
+
+
 class Extractor:
     """Helper class voor het extraheren van content"""
     
@@ -21,19 +43,9 @@ class Extractor:
         if not text:
             return ""
             
-        # Vervang meerdere whitespace karakters door enkele spatie
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Trim whitespace aan begin en eind
-        text = text.strip()
-        
-        # Normaliseer newlines voor consistentie
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Verwijder lege regels aan begin en eind
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        return '\n'.join(lines)
+        # Vervang meerdere whitespace karakters (ook newlines) door enkele spatie
+        # en trim begin en eind; daarna zijn er geen regels meer om te normaliseren
+        return _WHITESPACE_RE.sub(' ', text).strip()
     
     @staticmethod
     def extract_structured_content(text: str) -> Dict[str, List[str]]:
@@ -68,7 +80,7 @@ class Extractor:
                 continue
                 
             # Detecteer lijst items
-            if re.match(r'^[•\-\*]\s+', line) or re.match(r'^\d+\.\s+', line):
+            if _LIST_ITEM_RE.match(line):
                 if not in_list and current_paragraph:
                     # Sla huidige paragraaf op
                     result["paragraphs"].append(' '.join(current_paragraph))
@@ -78,7 +90,7 @@ class Extractor:
                 current_list.append(line)
                 
             # Detecteer headings (korte regels, vaak met speciale formatting)
-            elif len(line) < 100 and (line.isupper() or re.match(r'^[A-Z][^a-z]*$', line)):
+            elif len(line) < 100 and (line.isupper() or _HEADING_RE.match(line)):
                 result["headings"].append(line)
                 
             else:
@@ -149,8 +161,7 @@ class Extractor:
             List van dictionaries met link informatie
         """
         # Eenvoudige regex voor URL detectie
-        url_pattern = r'https?://[^\s<>"\']+|www\.[^\s<>"\']+'
-        urls = re.findall(url_pattern, text)
+        urls = _URL_RE.findall(text)
         
         links = []
         for idx, url in enumerate(urls, start=1):
@@ -187,13 +198,13 @@ class Extractor:
             
         # Tel karakters (zonder whitespace)
         chars = len(text)
-        chars_no_ws = len(text.replace(' ', '').replace('\n', '').replace('\t', ''))
+        chars_no_ws = len(text.translate(_NO_WHITESPACE_TABLE))
         
         # Tel woorden
         words = len(text.split())
         
         # Tel zinnen (eenvoudige benadering)
-        sentences = len(re.split(r'[.!?]+', text))
+        sentences = len(_SENTENCE_END_RE.split(text))
         
         # Tel paragrafen
         paragraphs = len([p for p in text.split('\n\n') if p.strip()])
@@ -213,7 +224,8 @@ class Extractor:
     @staticmethod
     async def extract_table_data(page: Page, selector: str) -> Optional[List[List[str]]]:
         """
-        Extraheer tabel data.
+        Extraheer tabel data in één evaluate (zie runner/dom_extraction.py).
+        Cellen met rowspan/colspan worden herhaald, zodat elke rij even breed is.
         
         Args:
             page: Playwright Page object
@@ -223,27 +235,8 @@ class Extractor:
             2D lijst met tabel data of None bij fout
         """
         try:
-            table_element = await page.query_selector(selector)
-            if not table_element:
-                return None
-                
-            # Extraheer rij data
-            rows = []
-            table_rows = await table_element.query_selector_all("tr")
-            
-            for tr in table_rows:
-                row_data = []
-                
-                # Haal alle cellen op (th en td)
-                cells = await tr.query_selector_all("th, td")
-                for cell in cells:
-                    cell_text = await cell.inner_text()
-                    row_data.append(cell_text.strip())
-                    
-                if row_data:  # Alleen niet-lege rijen toevoegen
-                    rows.append(row_data)
-                    
-            return rows if rows else None
+            table = await extract_table(page, selector)
+            return table["rows"] if table and table["rows"] else None
             
         except Exception as e:
             print(f"Tabel extractie fout: {str(e)}")
@@ -265,16 +258,7 @@ class Extractor:
             
         text_lower = text.lower()
         
-        # Keywords voor verschillende content types
-        objectives_keywords = ["leerdoel", "doelstelling", "doelen", "na dit hoofdstuk", "je leert"]
-        exercise_keywords = ["opdracht", "oefening", "vraag", "opgave", "antwoord"]
-        summary_keywords = ["samenvatting", "conclusie", "kernpunten", "belangrijkste"]
-        
-        if any(keyword in text_lower for keyword in objectives_keywords):
-            return "objectives"
-        elif any(keyword in text_lower for keyword in exercise_keywords):
-            return "exercise"
-        elif any(keyword in text_lower for keyword in summary_keywords):
-            return "summary"
-        else:
-            return "lesson"
\ No newline at end of file
+        for content_type, pattern in _CONTENT_TYPE_PATTERNS:
+            if pattern.search(text_lower):
+                return content_type
+        return "lesson"
\ No newline at end of file
@@ -0,0 +1,120 @@
+# runner/image_capture.py
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from playwright.async_api import Response
+
+from storage.http_client import FetchResult
+
+# Wachttijd op een body die nog uit de browser gelezen wordt
+CAPTURE_WAIT_TIMEOUT = 5.0
+
+
+class ImageCapture:
+    """
+    LRU cache van afbeeldingen die de browser zelf al geladen heeft.
+
+    Bij een response wordt alleen het Response object onthouden; de body
+    wordt pas uit de browser gelezen als DataSaver er om vraagt. Zo kosten
+    afbeeldingen die niet bij een image_selector horen (iconen, logo's,
+    advertenties) geen geheugen of IPC. DataSaver vraagt eerst hier en
+    downloadt alleen bij een miss. Het geheugen is begrensd: de oudste
+    afbeeldingen vallen eruit zodra max_bytes overschreden wordt.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_item_bytes: Optional[int] = None,
+                 max_responses: int = 1024):
+        """
+        Args:
+            max_bytes: Maximale totale grootte van de cache
+            max_item_bytes: Grotere afbeeldingen worden niet bewaard (standaard een kwart van max_bytes)
+            max_responses: Maximaal aantal onthouden, nog niet gelezen responses
+        """
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes or max_bytes // 4
+        self.max_responses = max_responses
+        self._items: "OrderedDict[str, FetchResult]" = OrderedDict()
+        self._responses: "OrderedDict[str, Response]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def on_response(self, response: Response):
+        """Response listener: onthoud geslaagde afbeelding responses, zonder de body te lezen"""
+        url = response.url
+        if (response.request.resource_type != "image" or response.status != 200
+                or url.startswith("data:") or url in self._items or url in self._pending):
+            return
+        length = response.headers.get("content-length")
+        if length and length.isdigit() and int(length) > self.max_item_bytes:
+            return
+        self._responses.pop(url, None)
+        self._responses[url] = response
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+
+    async def _capture(self, response: Response):
+        try:
+            body = await response.body()
+        except Exception:
+            # Pagina weg genavigeerd of body niet (meer) beschikbaar: dan wordt het een download
+            return
+        if len(body) > self.max_item_bytes:
+            return
+        headers = response.headers
+        self._store(response.url, FetchResult(
+            status=200,
+            body=body,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified")
+        ))
+
+    def _store(self, url: str, result: FetchResult):
+        if url in self._items:
+            self._size -= len(self._items.pop(url).body)
+        self._items[url] = result
+        self._size += len(result.body)
+        while self._size > self.max_bytes and self._items:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    async def get(self, url: str) -> Optional[FetchResult]:
+        """
+        Haal een door de browser geladen afbeelding op. De body wordt bij
+        de eerste vraag uit de browser gelezen. None betekent: zelf downloaden.
+        """
+        response = self._responses.pop(url, None)
+        if response is not None and url not in self._pending:
+            task = asyncio.create_task(self._capture(response))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+
+        pending = self._pending.get(url)
+        if pending is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), timeout=CAPTURE_WAIT_TIMEOUT)
+            except Exception:
+                pass
+
+        result = self._items.get(url)
+        if result is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(url)
+        self.hits += 1
+        return result
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Leeg de cache en vergeet lopende captures"""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        self._responses.clear()
+        self._items.clear()
+        self._size = 0
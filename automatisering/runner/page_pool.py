@@ -0,0 +1,153 @@
+# runner/page_pool.py
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, List, Callable, Awaitable
+
+from playwright.async_api import BrowserContext, Page
+
+
+class PagePool:
+    """
+    Pool van warme worker pagina's binnen één BrowserContext.
+
+    Elke pagina blijft op de boekweergave staan en wordt tussen paragrafen
+    hergebruikt, zodat de boek-shell niet voor elke paragraaf opnieuw
+    geladen hoeft te worden.
+    """
+
+    def __init__(self, context: BrowserContext, size: int = 3,
+                 navigation_timeout: int = 15000, selector_timeout: int = 8000,
+                 on_page_created: Optional[Callable[[Page], Awaitable[None]]] = None):
+        """
+        Args:
+            context: BrowserContext waarin de worker pagina's geopend worden
+            size: Maximaal aantal gelijktijdige worker pagina's
+            navigation_timeout: Navigatie timeout per pagina (ms)
+            selector_timeout: Standaard selector timeout per pagina (ms)
+            on_page_created: Optionele hook voor extra setup van een nieuwe pagina
+        """
+        self.context = context
+        self.size = max(1, int(size))
+        self.navigation_timeout = navigation_timeout
+        self.selector_timeout = selector_timeout
+        self.on_page_created = on_page_created
+
+        self.home_url: Optional[str] = None
+        self._pages: List[Page] = []
+        self._page_home: Dict[Page, str] = {}  # Welke boek URL een pagina geladen heeft
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._opening = 0
+
+    @property
+    def is_opening(self) -> bool:
+        """True zolang de pool zelf een nieuwe pagina aan het openen is"""
+        return self._opening > 0
+
+    def owns(self, page: Page) -> bool:
+        """Check of een pagina door deze pool beheerd wordt"""
+        return page in self._pages
+
+    async def warm_up(self, url: str):
+        """
+        Zet de pool klaar op de gegeven boek URL.
+        Ontbrekende pagina's worden parallel geopend; bestaande pagina's die nog
+        op een ander boek staan worden bij de volgende acquire opnieuw geladen.
+        """
+        self.home_url = url
+        missing = self.size - len(self._pages)
+        if missing <= 0:
+            return
+
+        results = await asyncio.gather(
+            *[self._open_page() for _ in range(missing)],
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Waarschuwing: Kon worker pagina niet openen: {str(result)}")
+
+        if not self._pages:
+            raise RuntimeError("Geen enkele worker pagina kon geopend worden")
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Leen een warme pagina uit de pool. De pagina wordt na gebruik
+        automatisch teruggegeven en blijft open voor de volgende paragraaf.
+        """
+        page = await self._idle.get()
+        try:
+            if page.is_closed():
+                page = await self._replace(page)
+            elif self._page_home.get(page) != self.home_url:
+                await self.reset_page(page)
+            yield page
+        finally:
+            if not page.is_closed():
+                self._idle.put_nowait(page)
+            else:
+                self._forget(page)
+                # Houd de pool op sterkte zodat wachtende workers niet blokkeren
+                try:
+                    await self._open_page()
+                except Exception as e:
+                    print(f"Waarschuwing: Kon gesloten worker pagina niet vervangen: {str(e)}")
+
+    async def reset_page(self, page: Page):
+        """Laad de boekweergave opnieuw op een worker pagina"""
+        if not self.home_url:
+            return
+        await page.goto(self.home_url, timeout=self.navigation_timeout)
+        await page.wait_for_load_state("networkidle")
+        self._page_home[page] = self.home_url
+
+    async def close(self):
+        """Sluit alle worker pagina's"""
+        pages = list(self._pages)
+        self._pages.clear()
+        self._page_home.clear()
+        self._idle = asyncio.Queue()
+        for page in pages:
+            try:
+                if not page.is_closed():
+                    await page.close()
+            except Exception:
+                pass
+
+    async def _open_page(self) -> Page:
+        """Open een nieuwe worker pagina en laad de boekweergave"""
+        self._opening += 1
+        try:
+            page = await self.context.new_page()
+        finally:
+            self._opening -= 1
+
+        page.set_default_timeout(self.selector_timeout)
+        page.set_default_navigation_timeout(self.navigation_timeout)
+        self._pages.append(page)
+
+        try:
+            if self.on_page_created:
+                await self.on_page_created(page)
+            await self.reset_page(page)
+        except Exception:
+            self._forget(page)
+            try:
+                await page.close()
+            except Exception:
+                pass
+            raise
+
+        self._idle.put_nowait(page)
+        return page
+
+    async def _replace(self, page: Page) -> Page:
+        """Vervang een gesloten pagina door een nieuwe"""
+        self._forget(page)
+        await self._open_page()
+        return await self._idle.get()
+
+    def _forget(self, page: Page):
+        if page in self._pages:
+            self._pages.remove(page)
+        self._page_home.pop(page, None)
@@ -6,10 +6,17 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
+from urllib.parse import urljoin
 
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
 import threading
 
+# PyQt6 is optioneel: zonder Qt is alleen de headless ScrapeRunner beschikbaar
+try:
+    from PyQt6.QtCore import QObject, pyqtSignal
+    HAS_QT = True
+except ImportError:
+    HAS_QT = False
+
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Response
 try:
     from playwright_stealth import stealth_async
@@ -152,10 +159,19 @@ OVERLAY_JS = """
         return btn;
     }
 
+    // Stuur besturing direct naar Python (push), zodat de runner niet hoeft te pollen
+    function sendControl(type, direction) {
+        if (window.pythonControl) {
+            window.pythonControl({type: type, direction: direction || 0}).catch(() => {});
+        }
+    }
+
     const rewindBtn = createControlButton('⏮', 'Stap terug', '#555', () => {
-        localStorage.setItem('skipDirection', '-1');
         localStorage.setItem('isPaused', 'false');
         window.isPaused = false;
+        resumeBtn.style.display = 'none';
+        pauseBtn.style.display = 'block';
+        sendControl('skip', -1);
         window.__logOverlay.addLog("Opdracht verzonden: Stap terug", "INFO");
     });
 
@@ -164,6 +180,7 @@ OVERLAY_JS = """
         window.isPaused = true;
         pauseBtn.style.display = 'none';
         resumeBtn.style.display = 'block';
+        sendControl('pause');
         window.__logOverlay.addLog("Automatisering gepauzeerd", "WARNING");
     });
 
@@ -172,13 +189,16 @@ OVERLAY_JS = """
         window.isPaused = false;
         resumeBtn.style.display = 'none';
         pauseBtn.style.display = 'block';
+        sendControl('resume');
         window.__logOverlay.addLog("Automatisering hervat", "SUCCESS");
     });
 
     const skipBtn = createControlButton('⏭', 'Stap overslaan', '#555', () => {
-        localStorage.setItem('skipDirection', '1');
         localStorage.setItem('isPaused', 'false');
         window.isPaused = false;
+        resumeBtn.style.display = 'none';
+        pauseBtn.style.display = 'block';
+        sendControl('skip', 1);
         window.__logOverlay.addLog("Opdracht verzonden: Stap overslaan", "INFO");
     });
 
@@ -280,52 +300,62 @@ OVERLAY_JS = """
             this.addLog(`Status: ${step}`, "INFO");
         },
         addLog: function(msg, level) {
+            this.addLogs([[msg, level]]);
+        },
+        // Batch van [msg, level, ts?] regels (LogBus): één DOM insert en één scroll per batch
+        addLogs: function(entries) {
             const logList = document.getElementById('automation-log-list');
             if (!logList) {
                 // Buffer logs if list isn't ready yet
                 if (!window.__logBuffer) window.__logBuffer = [];
-                window.__logBuffer.push({msg, level});
+                entries.forEach(([msg, level, ts]) => window.__logBuffer.push({msg, level, ts}));
                 return;
             }
 
-            const entry = document.createElement('div');
-            Object.assign(entry.style, {
-                marginBottom: '6px',
-                lineHeight: '1.4',
-                wordBreak: 'break-word',
-                borderLeft: '2px solid transparent',
-                paddingLeft: '8px'
+            const fragment = document.createDocumentFragment();
+            // Alleen de laatste 50 regels blijven zichtbaar; de rest hoeft niet eens in de DOM
+            entries.slice(-50).forEach(([msg, level, ts]) => {
+                const entry = document.createElement('div');
+                Object.assign(entry.style, {
+                    marginBottom: '6px',
+                    lineHeight: '1.4',
+                    wordBreak: 'break-word',
+                    borderLeft: '2px solid transparent',
+                    paddingLeft: '8px'
+                });
+                
+                const time = new Date(ts || Date.now()).toLocaleTimeString([], {hour: '2-digit', minute:'2-digit', second:'2-digit'});
+                
+                let color = '#e0e0e0';
+                let prefix = 'INFO';
+                let borderColor = '#444';
+                
+                if (level === 'ERROR') { 
+                    color = '#ff5252'; prefix = 'FAIL'; borderColor = '#ff5252';
+                } else if (level === 'WARNING') { 
+                    color = '#ffd740'; prefix = 'WARN'; borderColor = '#ffd740';
+                } else if (level === 'SUCCESS') { 
+                    color = '#69f0ae'; prefix = 'DONE'; borderColor = '#69f0ae';
+                } else if (level === 'STEP') {
+                    color = '#64B5F6'; prefix = 'STEP'; borderColor = '#64B5F6';
+                } else if (level === 'DEBUG') {
+                    color = '#9e9e9e'; prefix = 'DBG'; borderColor = '#666';
+                }
+                
+                entry.style.borderLeftColor = borderColor;
+                entry.innerHTML = `
+                    <span style="color: #666; font-size: 10px;">${time}</span>
+                    <span style="color: ${color}; font-weight: bold; font-size: 10px; margin: 0 4px;">[${prefix}]</span>
+                    <span style="color: ${color}">${msg}</span>
+                `;
+                fragment.appendChild(entry);
             });
             
-            const time = new Date().toLocaleTimeString([], {hour: '2-digit', minute:'2-digit', second:'2-digit'});
-            
-            let color = '#e0e0e0';
-            let prefix = 'INFO';
-            let borderColor = '#444';
-            
-            if (level === 'ERROR') { 
-                color = '#ff5252'; prefix = 'FAIL'; borderColor = '#ff5252';
-            } else if (level === 'WARNING') { 
-                color = '#ffd740'; prefix = 'WARN'; borderColor = '#ffd740';
-            } else if (level === 'SUCCESS') { 
-                color = '#69f0ae'; prefix = 'DONE'; borderColor = '#69f0ae';
-            } else if (level === 'STEP') {
-                color = '#64B5F6'; prefix = 'STEP'; borderColor = '#64B5F6';
-            }
-            
-            entry.style.borderLeftColor = borderColor;
-            entry.innerHTML = `
-                <span style="color: #666; font-size: 10px;">${time}</span>
-                <span style="color: ${color}; font-weight: bold; font-size: 10px; margin: 0 4px;">[${prefix}]</span>
-                <span style="color: ${color}">${msg}</span>
-            `;
-            
-            logList.appendChild(entry);
-            logList.scrollTop = logList.scrollHeight;
-            
+            logList.appendChild(fragment);
             while (logList.children.length > 50) {
                 logList.removeChild(logList.firstChild);
             }
+            logList.scrollTop = logList.scrollHeight;
         },
         highlight: function(selectorOrEl) {
             const el = (typeof selectorOrEl === 'string') 
@@ -498,10 +528,15 @@ OVERLAY_JS = """
         
         // Flush buffered logs
         if (window.__logBuffer) {
-            window.__logBuffer.forEach(log => window.__logOverlay.addLog(log.msg, log.level));
+            window.__logOverlay.addLogs(window.__logBuffer.map(log => [log.msg, log.level, log.ts]));
             window.__logBuffer = [];
         }
 
+        // Een pauze die over een navigatie heen bewaard is, opnieuw melden aan Python
+        if (localStorage.getItem('isPaused') === 'true') {
+            sendControl('pause');
+        }
+
         // Check initial state from python
         if (window.pythonGetState) {
             window.pythonGetState().then(state => {
@@ -535,10 +570,31 @@ OVERLAY_JS = """
 })();
 """
 
+# Eén batch regels van de LogBus; false als de overlay (nog) niet bestaat
+PUSH_LOGS_JS = """
+(entries) => {
+    if (!window.__logOverlay || !window.__logOverlay.addLogs) return false;
+    window.__logOverlay.addLogs(entries);
+    return true;
+}
+"""
+
 
 from storage.saver import DataSaver
+from storage.frontier import CrawlFrontier
+from storage.write_queue import WriteQueue
+from storage.book_export import BookExporter, BOOK_EXPORT_FORMATS, HAS_REPORTLAB
+from runner.image_capture import ImageCapture
+from storage.media_scheduler import MediaScheduler, PRIORITY_MEDIA, PRIORITY_GUESSED
+from runner.page_pool import PagePool
+from runner.dom_extraction import build_extraction_spec, extract_paragraph, extract_table, TABLE_ACTION
+from runner.ready import wait_until_ready
+from runner.resource_policy import ResourcePolicy
+from runner.events import Signal, EventStreamMixin, signal_types
 from utils.helpers import generate_run_id, sanitize_filename
-from config.config_manager import ScraperConfig, LoginStep
+from utils.log_bus import LogBus
+from utils.tracing import Tracer, traced
+from config.config_manager import ScraperConfig, LoginStep, ExtractionMode, ReadyConfig
 
 @dataclass
 class RunStatus:
@@ -558,46 +614,67 @@ class NavigationInterrupt(Exception):
         self.direction = direction # 1 voor vooruit, -1 voor achteruit
         super().__init__(f"Navigation interrupt: {direction}")
 
-class BookScrapeRunner(QObject):
-    """Hoofd runner voor scraping met Playwright"""
+class ScrapeRunner(EventStreamMixin):
+    """
+    Hoofd runner voor scraping met Playwright.
+    Niet gebonden aan Qt: voortgang wordt gemeld via Signal callbacks of de
+    async event stream (zie runner.events). BookScrapeRunner is de Qt adapter.
+    """
     
     # Signalen voor GUI communicatie
-    progress_update = pyqtSignal(int, int)  # current, total
-    status_update = pyqtSignal(str)  # status message
-    log_message = pyqtSignal(str, str)  # message, level
-    error_occurred = pyqtSignal(str)  # error message
-    captcha_detected = pyqtSignal(str, str)  # screenshot_path, html_dump
-    finished = pyqtSignal()  # wanneer run klaar is
-    book_found = pyqtSignal(list)  # list van (title, index)
-    book_selection_needed = pyqtSignal()
-    step_started = pyqtSignal(int)  # index van de stap die start
-    step_finished = pyqtSignal(int, bool)  # index, success
-    user_action_recorded = pyqtSignal(dict)  # actie, selector, waarde
+    progress_update = Signal(int, int)  # current, total
+    status_update = Signal(str)  # status message
+    log_batch = Signal(list)  # gebufferde [(message, level, ts_ms)] via de LogBus
+    error_occurred = Signal(str)  # error message
+    captcha_detected = Signal(str, str)  # screenshot_path, html_dump
+    finished = Signal()  # wanneer run klaar is
+    book_found = Signal(list)  # list van (title, index)
+    book_selection_needed = Signal()
+    step_started = Signal(int)  # index van de stap die start
+    step_finished = Signal(int, bool)  # index, success
+    user_action_recorded = Signal(dict)  # actie, selector, waarde
     
     # Nieuwe signalen voor hiërarchische voortgang
-    book_started = pyqtSignal(str)  # titel
-    chapter_started = pyqtSignal(str, int)  # titel, index
-    paragraph_started = pyqtSignal(str, int)  # titel, index
-    item_completed = pyqtSignal(str, str, str)  # type (book/chapter/paragraph), status (✅/❌), info
+    book_started = Signal(str)  # titel
+    chapter_started = Signal(str, int)  # titel, index
+    paragraph_started = Signal(str, int)  # titel, index
+    item_completed = Signal(str, str, str)  # type (book/chapter/paragraph), status (✅/❌), info
     
     # Nieuwe signalen voor Phase 4
-    metrics_updated = pyqtSignal(dict)  # Verzendt de samenvatting van metrics
-    data_collected = pyqtSignal(dict)  # Verzendt de gescrapte data voor de live tabel
-    selector_captured = pyqtSignal(str)  # Verzendt een CSS selector bij klik in selection mode
+    metrics_updated = Signal(dict)  # Verzendt de samenvatting van metrics
+    data_collected = Signal(dict)  # Verzendt de gescrapte data voor de live tabel
+    selector_captured = Signal(str)  # Verzendt een CSS selector bij klik in selection mode
 
     def __init__(self, config: ScraperConfig, logger):
         super().__init__()
         self.config = config
         self.logger = logger
         
+        # Live mode: na alle stappen wachten op nieuwe configuratie van de GUI.
+        # Batch runs (CLI) zetten dit uit zodat de runner na één doorloop stopt.
+        self.live_mode = True
+        
         # Metrics Tracker (Phase 4)
         from utils.metrics import MetricsTracker
         self.metrics = MetricsTracker()
         self.status = RunStatus()
         self.saver: Optional[DataSaver] = None
+        self.playwright = None
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self.context: Optional[BrowserContext] = None
+        self.page_pool: Optional[PagePool] = None
+        self.frontier: Optional[CrawlFrontier] = None
+        self.write_queue: Optional[WriteQueue] = None
+        self.book_exporter: Optional[BookExporter] = None
+        self.image_capture: Optional[ImageCapture] = None
+        self.media_scheduler: Optional[MediaScheduler] = None
+        self.metrics_task: Optional[asyncio.Task] = None
+        self.tracer = Tracer()  # Uitgeschakeld tot run() een trace bestand opent
+        # Logs gaan gebufferd naar GUI en overlay: één signaal/evaluate per interval i.p.v. per regel
+        self.log_bus = LogBus(interval=config.ui.log_flush_ms / 1000)
+        self.log_bus.add_sink("gui", lambda entries: self.log_batch.emit(entries), config.ui.gui_log_level.value)
+        self.log_bus.add_sink("overlay", self._push_logs_to_browser, config.ui.overlay_log_level.value)
         self.is_running = True
         self.is_recording = False
         self.is_selection_mode = False
@@ -610,30 +687,24 @@ class BookScrapeRunner(QObject):
         self.mutex = threading.Lock()
         self.book_selected_event = threading.Event()
         self.config_updated_event = asyncio.Event()
+        
+        # Pauze/skip status die door de overlay gepusht wordt (zie _on_overlay_control)
+        self.is_paused = False
+        self.pending_skip_direction = 0
+        self.control_event = asyncio.Event()
+        
         self.last_executed_step_index = -1
         self.start_url_visited = False
         self.clicked_buttons_text = [] # Voor bestandsnaam generatie
         
     def log(self, message: str, level: str = "INFO"):
-        """Log een bericht en stuur naar browser overlay indien beschikbaar"""
-        try:
-            self.log_message.emit(message, level)
-        except RuntimeError:
-            # Kan gebeuren als object al is verwijderd tijdens shutdown
-            return
-            
+        """Log een bericht; GUI en browser overlay krijgen het gebufferd via de LogBus"""
         if hasattr(self, 'logger') and self.logger:
             if hasattr(self.logger, level.lower()):
                 getattr(self.logger, level.lower())(message)
             
-        # Stuur naar browser overlay
-        if self.page:
-            try:
-                # We gebruiken een veilige manier om JS uit te voeren
-                # We moeten controleren of de overlay nog bestaat (bijv. na navigatie)
-                asyncio.create_task(self._push_log_to_browser(message, level))
-            except:
-                pass
+        # Geen Qt signaal per regel: de GUI krijgt batches via log_batch
+        self.log_bus.publish(message, level)
 
     async def update_overlay_status(self, step: str, detail: str = ""):
         """Update de status in de browser overlay"""
@@ -650,27 +721,34 @@ class BookScrapeRunner(QObject):
         except:
             pass
 
-    async def _push_log_to_browser(self, message: str, level: str):
-        """Push een log bericht naar de browser overlay"""
-        if not self.page:
+    async def _push_logs_to_browser(self, entries: list):
+        """Push een batch log berichten naar de browser overlay (één evaluate per batch)"""
+        page = self.page
+        if not page:
             return
-            
-        try:
-            # Zorg dat overlay bestaat
-            await self.page.evaluate(OVERLAY_JS)
-            # Voeg log toe
-            await self.page.evaluate(f"window.__logOverlay.addLog({json.dumps(message)}, {json.dumps(level)})")
-        except:
-            # Kan gebeuren als pagina gesloten wordt of navigeert
-            pass
+        # Fouten (pagina gesloten of midden in een navigatie) vangt de LogBus af
+        added = await page.evaluate(PUSH_LOGS_JS, entries)
+        if not added:
+            # Overlay verdwenen (bijv. na navigatie): opnieuw injecteren en nog eens proberen
+            await page.evaluate(OVERLAY_JS)
+            await page.evaluate(PUSH_LOGS_JS, entries)
 
     def update_config(self, new_config: ScraperConfig):
         """Bijwerken van configuratie vanuit GUI"""
         with self.mutex:
             self.config = new_config
+            # Andere stappen of doelen horen bij een andere frontier
+            old_frontier, self.frontier = self.frontier, None
+            self.log_bus.set_level("gui", new_config.ui.gui_log_level.value)
+            self.log_bus.set_level("overlay", new_config.ui.overlay_log_level.value)
             # Trigger event in de event loop
             if hasattr(self, 'loop') and self.loop:
+                # De loop thread kan de oude frontier nog gebruiken: sluit hem daar
+                if old_frontier:
+                    self.loop.call_soon_threadsafe(old_frontier.close)
                 self.loop.call_soon_threadsafe(self.config_updated_event.set)
+            elif old_frontier:
+                old_frontier.close()
 
     def set_recording(self, enabled: bool, use_coordinates: bool = False):
         """Activeer of deactiveer de recorder vanuit de GUI"""
@@ -719,12 +797,56 @@ class BookScrapeRunner(QObject):
         
         while self.is_running and total_retries < max_total_retries:
             try:
+                self.log_bus.start()  # No-op als de bus al draait
                 self.log(f"Runner start/herstart (Live Mode, poging {total_retries + 1})", "INFO")
                 self.status_update.emit("Runner initialiseren...")
                 
                 # Initialiseer saver indien nog niet gedaan
                 if not self.saver:
-                    self.saver = DataSaver(self.config.output, self.run_id)
+                    if self.config.output.trace and not self.tracer.enabled:
+                        self.tracer = Tracer.for_run(self.config.output.output_dir, self.run_id)
+                    # Afbeeldingen die de browser al geladen heeft niet nog eens downloaden
+                    if self.config.output.save_images and self.config.output.capture_images:
+                        self.image_capture = ImageCapture(
+                            max_bytes=self.config.output.image_capture_cache_mb * 1024 * 1024
+                        )
+                    self.saver = DataSaver(
+                        self.config.output,
+                        self.run_id,
+                        download_config=self.config.download,
+                        cookie_provider=self._browser_cookies,
+                        capture_provider=self.image_capture.get if self.image_capture else None,
+                        tracer=self.tracer
+                    )
+                if not self.media_scheduler:
+                    self.media_scheduler = MediaScheduler(
+                        self.saver,
+                        metrics=self.metrics,
+                        max_concurrent=self.config.download.media_max_concurrent,
+                        max_per_host=self.config.download.media_max_per_host
+                    )
+                if not self.write_queue:
+                    self.write_queue = WriteQueue(
+                        self.saver,
+                        maxsize=self.config.output.write_queue_size,
+                        batch_size=self.config.output.write_batch_size,
+                        on_written=self._on_record_written,
+                        metrics=self.metrics
+                    )
+                if self.config.output.metrics_interval and not self.metrics_task:
+                    # metrics.json / metrics.prom in de run map, voor dashboards buiten de GUI
+                    self.metrics_task = asyncio.create_task(self.metrics.export_periodically(
+                        self.saver.run_dir, self.config.output.metrics_interval
+                    ))
+                
+                # Open de crawl frontier; na een crash staat hier waar we gebleven waren
+                frontier = self._get_frontier()
+                pending = len(frontier.pending())
+                if pending:
+                    self.log(f"Crawl frontier: {pending} openstaand(e) item(s) van een vorige poging", "INFO")
+                elif self.config.output.incremental and total_retries == 0:
+                    # Een afgeronde vorige run moet opnieuw langs alle paragrafen om wijzigingen te vinden
+                    frontier.reset()
                 
                 # Start browser indien nog niet gestart
                 if not self.browser and not self.context:
@@ -742,21 +864,27 @@ class BookScrapeRunner(QObject):
                                 self.log(f"Navigeren naar start URL: {self.config.start_url}", "INFO")
                                 self.status_update.emit(f"Navigeren naar {self.config.start_url}")
                                 try:
-                                    await self.page.goto(
-                                        self.config.start_url,
-                                        timeout=self.config.timeouts.navigation,
-                                        wait_until="networkidle"
-                                    )
+                                    with self.metrics.stage("navigation"):
+                                        await self.page.goto(
+                                            self.config.start_url,
+                                            timeout=self.config.timeouts.navigation,
+                                            wait_until="networkidle"
+                                        )
                                     self.log(f"Pagina geladen: {self.page.url}", "SUCCESS")
                                     self.start_url_visited = True
                                 except Exception as e:
                                     self.log(f"Fout bij navigeren naar start URL: {str(e)}", "ERROR")
                                     # Probeer het later opnieuw als het mislukt
                         
+                        # Bijhouden of deze doorloop werk deed en zonder fouten eindigde
+                        ran_work = False
+                        pass_failed = False
+                        
                         # Voer nieuwe login/automatisering stappen uit (NIET als we aan het opnemen zijn)
                         steps = self.config.login.login_steps
                         if not self.is_recording and len(steps) > self.last_executed_step_index + 1:
                             start_idx = self.last_executed_step_index + 1
+                            ran_work = True
                             
                             # Gebruik de nieuwe sequence executor die lussen ondersteunt
                             try:
@@ -764,14 +892,21 @@ class BookScrapeRunner(QObject):
                                 self.last_executed_step_index = len(steps) - 1
                             except Exception as seq_error:
                                 self.log(f"Fout tijdens uitvoering van stappen: {str(seq_error)}", "ERROR")
+                                pass_failed = True
                                 # We gaan toch door
                                 self.last_executed_step_index = len(steps) - 1
                         
                         # Als auto_scrape aan staat, doe dan de normale flow (NIET als we aan het opnemen zijn)
                         if not self.is_recording and self.config.auto_scrape:
+                            ran_work = True
                             # Zoek boeken
                             try:
-                                books = await self.find_books()
+                                if not self.live_mode and self.config.target.books:
+                                    # Batch run: geen GUI om op te wachten, scrape de doelboeken
+                                    await self.scrape_books(self.config.target.books)
+                                    books = []
+                                else:
+                                    books = await self.find_books()
                                 if books:
                                     self.book_found.emit(books)
                                     self.book_selection_paused = True
@@ -783,6 +918,16 @@ class BookScrapeRunner(QObject):
                                         await self.scrape_content()
                             except Exception as scrape_error:
                                 self.log(f"Fout tijdens scraping flow: {str(scrape_error)}", "ERROR")
+                                pass_failed = True
+                        
+                        if ran_work and not pass_failed:
+                            # Doorloop afgerond: een volgende run moet alles opnieuw langs
+                            self._finish_frontier()
+                            
+                        if not self.live_mode:
+                            # Batch run: één doorloop is genoeg
+                            self.is_running = False
+                            break
                             
                         self.status_update.emit("Wachten op nieuwe acties...")
                         
@@ -818,9 +963,12 @@ class BookScrapeRunner(QObject):
                 
                 # Probeer browser te herstarten bij kritieke fout
                 self.log("Poging tot herstel: Browser afsluiten en opnieuw opstarten...", "INFO")
-                await self.cleanup()
+                await self.cleanup(final=False)
                 self.start_url_visited = False
                 self.last_executed_step_index = -1 # Reset stappen bij volledige herstart
+                # Voltooide items staan in de frontier, de lussen slaan die over
+                if self.frontier:
+                    self.frontier.requeue_in_flight()
                 await asyncio.sleep(5) # Wacht even voor herstart
 
         self.log("Runner proces voltooid", "INFO")
@@ -845,62 +993,98 @@ class BookScrapeRunner(QObject):
                 self.loop
             ) if hasattr(self, 'loop') else None
 
+    async def _expose_bindings(self, context: BrowserContext):
+        """Registreer de functies waarmee de overlay status opvraagt en opdrachten naar Python pusht"""
+        try:
+            await context.expose_binding(
+                "pythonGetState",
+                lambda source: {
+                    "is_recording": self.is_recording,
+                    "is_selection_mode": self.is_selection_mode,
+                    "use_coordinates": getattr(self, "use_coordinate_recording", False),
+                    "current_step": getattr(self, "_current_overlay_step", ""),
+                    "current_detail": getattr(self, "_current_overlay_detail", "")
+                }
+            )
+        except: pass
+
+        try:
+            await context.expose_binding(
+                "pythonControl",
+                lambda source, command: self._on_overlay_control(command)
+            )
+        except: pass
+
+        try:
+            await context.expose_binding(
+                "pythonRecordAction", 
+                lambda source, action: self.user_action_recorded.emit(action)
+            )
+        except: pass
+
+        try:
+            await context.expose_binding(
+                "pythonCaptureSelector", 
+                lambda source, selector: self.selector_captured.emit(selector)
+            )
+        except: pass
+
+    def _on_overlay_control(self, command: Dict[str, Any]):
+        """
+        Verwerk een pauze/hervat/skip opdracht die de overlay via pythonControl pusht.
+        Draait in de event loop van de runner, dus we kunnen de status direct aanpassen.
+        """
+        command_type = (command or {}).get("type")
+        if command_type == "pause":
+            self.is_paused = True
+        elif command_type == "resume":
+            self.is_paused = False
+        elif command_type == "skip":
+            direction = int(command.get("direction") or 0)
+            if direction != 0:
+                self.pending_skip_direction = direction
+                self.is_paused = False
+        self.control_event.set()
+
     async def check_status(self):
         """
         Controleert de status van de run (pauze, stop, skip).
-        Wordt aangeroepen voor elke belangrijke actie.
+        Wordt aangeroepen voor elke belangrijke actie. Dit is een lokale check:
+        de overlay pusht pauze/skip opdrachten, er is dus geen browser round trip nodig.
         """
         if not self.is_running:
             raise asyncio.CancelledError("Runner gestopt")
 
-        if not self.page:
-            return
+        self._raise_pending_skip()
 
-        try:
-            # Controleer status in browser overlay
-            status = await self.page.evaluate("""() => {
-                return {
-                    isPaused: localStorage.getItem('isPaused') === 'true',
-                    skipDirection: parseInt(localStorage.getItem('skipDirection') || '0')
-                };
-            }""")
-
-            # Verwerk skip/rewind (NavigationInterrupt)
-            skip_direction = status.get('skipDirection', 0)
-            if skip_direction != 0:
-                # Reset skipDirection in browser
-                await self.page.evaluate("localStorage.setItem('skipDirection', '0'); window.skipDirection = 0;")
-                self.log(f"Navigatie interrupt gedetecteerd: {'vooruit' if skip_direction > 0 else 'achteruit'}", "INFO")
-                raise NavigationInterrupt(skip_direction)
-
-            # Verwerk pauze
-            if status.get('isPaused', False):
-                self.log("Run gepauzeerd via browser overlay...", "WARNING")
-                self.status_update.emit("Gepauzeerd via overlay")
-                
-                while self.is_running:
-                    # Check of pauze is opgeheven
-                    is_paused = await self.page.evaluate("localStorage.getItem('isPaused') === 'true'")
-                    if not is_paused:
-                        self.log("Run hervat via browser overlay", "SUCCESS")
-                        self.status_update.emit("Hervat...")
-                        break
-                        
-                    # Check ook voor skip tijdens pauze
-                    skip_direction = await self.page.evaluate("parseInt(localStorage.getItem('skipDirection') || '0')")
-                    if skip_direction != 0:
-                        await self.page.evaluate("localStorage.setItem('skipDirection', '0'); window.skipDirection = 0;")
-                        raise NavigationInterrupt(skip_direction)
-                        
-                    await asyncio.sleep(0.5)
+        # Wacht op handmatige CAPTCHA oplossing (gedetecteerd door de response listener)
+        while self.captcha_paused and self.is_running:
+            self.control_event.clear()
+            await self.control_event.wait()
 
-        except NavigationInterrupt:
-            raise
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            # Bijv. als pagina navigeert of gesloten is, negeer en ga door
-            pass
+        # Verwerk pauze
+        if self.is_paused:
+            self.log("Run gepauzeerd via browser overlay...", "WARNING")
+            self.status_update.emit("Gepauzeerd via overlay")
+            
+            while self.is_running and self.is_paused and not self.pending_skip_direction:
+                self.control_event.clear()
+                await self.control_event.wait()
+            
+            # Skip of rewind tijdens pauze
+            self._raise_pending_skip()
+            
+            if self.is_running:
+                self.log("Run hervat via browser overlay", "SUCCESS")
+                self.status_update.emit("Hervat...")
+
+    def _raise_pending_skip(self):
+        """Gooi een NavigationInterrupt als de overlay om skip/rewind gevraagd heeft"""
+        skip_direction = self.pending_skip_direction
+        if skip_direction != 0:
+            self.pending_skip_direction = 0
+            self.log(f"Navigatie interrupt gedetecteerd: {'vooruit' if skip_direction > 0 else 'achteruit'}", "INFO")
+            raise NavigationInterrupt(skip_direction)
 
     async def _execute_sequence(self, steps, start_index=0):
         """Voert een reeks stappen uit, met ondersteuning voor lussen"""
@@ -950,6 +1134,36 @@ class BookScrapeRunner(QObject):
 
         return i
 
+    async def _browser_cookies(self, url: str) -> List[Dict[str, Any]]:
+        """Cookies van de browser context voor een URL (voor downloads buiten de browser)"""
+        if not self.context:
+            return []
+        return await self.context.cookies(url)
+
+    def _get_frontier(self) -> CrawlFrontier:
+        """Haal de crawl frontier voor de huidige configuratie op (of open deze)"""
+        if self.frontier is None:
+            self.frontier = CrawlFrontier.for_config(self.config)
+        return self.frontier
+
+    def _finish_frontier(self):
+        """
+        Wis de frontier na een afgeronde doorloop. De frontier dient alleen om na
+        een crash te hervatten; een nieuwe run van dezelfde configuratie moet
+        hoofdstukken en paragrafen opnieuw ontdekken (is_completed slaat al
+        geëxporteerde paragrafen over).
+        """
+        if self.frontier is None:
+            return
+        try:
+            self.frontier.reset()
+        except Exception as e:
+            self.log(f"Kon crawl frontier niet wissen: {str(e)}", "WARNING")
+
+    def _frontier_key(self, chapter: int = 0, paragraph: int = 0) -> Tuple[str, int, int]:
+        """Frontier sleutel binnen het huidige boek (0 = het hele item)"""
+        return (self.status.current_book or "", chapter, paragraph)
+
     async def _run_loop(self, steps, loop_start_index):
         """Voert een lus uit over een verzameling elementen"""
         loop_step = steps[loop_start_index]
@@ -994,71 +1208,106 @@ class BookScrapeRunner(QObject):
             if indices_to_run is None or len(indices_to_run) == 0:
                 indices_to_run = range(len(elements))
             
+            # Registreer hoofdstukken/paragrafen in de frontier (boek titels zijn pas per iteratie bekend)
+            frontier = self._get_frontier()
+            if loop_step.action == "loop_chapters":
+                frontier.discover([self._frontier_key(idx + 1) for idx in indices_to_run])
+            elif loop_step.action == "loop_paragraphs":
+                frontier.discover([self._frontier_key(self.status.current_chapter or 0, idx + 1) for idx in indices_to_run])
+            
             for idx in indices_to_run:
                 if not self.is_running:
                     break
                     
-                self.log(f"Lus iteratie {idx + 1}/{len(elements)}", "INFO")
+                with self.tracer.span("loop_iteration", action=loop_step.action, index=idx + 1,
+                                      selector=collection_selector):
+                    self.log(f"Lus iteratie {idx + 1}/{len(elements)}", "INFO")
                 
-                # Zoek elementen opnieuw omdat de DOM veranderd kan zijn na navigatie
-                elements = await self.page.query_selector_all(collection_selector)
-                if idx >= len(elements):
-                    self.log(f"Waarschuwing: Index {idx} buiten bereik (totaal {len(elements)} elementen)", "WARNING")
-                    continue
+                    # Zoek elementen opnieuw omdat de DOM veranderd kan zijn na navigatie
+                    elements = await self.page.query_selector_all(collection_selector)
+                    if idx >= len(elements):
+                        self.log(f"Waarschuwing: Index {idx} buiten bereik (totaal {len(elements)} elementen)", "WARNING")
+                        continue
                 
-                element = elements[idx]
+                    element = elements[idx]
                 
-                await self.check_status() # Check status voor elke iteratie
+                    await self.check_status() # Check status voor elke iteratie
                 
-                # Update status
-                if loop_step.action == "loop_books":
-                    try:
-                        title = await element.inner_text()
-                        self.status.current_book = title.strip()
-                    except:
-                        self.status.current_book = f"Boek {idx + 1}"
-                    self.book_started.emit(self.status.current_book)
-                elif loop_step.action == "loop_chapters":
-                    self.status.current_chapter = idx + 1
-                    self.chapter_started.emit(f"Hoofdstuk {idx + 1}", idx + 1)
-                else:
-                    self.status.current_paragraph = idx + 1
-                    self.paragraph_started.emit(f"Paragraaf {idx + 1}", idx + 1)
+                    # Bepaal de frontier sleutel van dit item
+                    if loop_step.action == "loop_books":
+                        try:
+                            title = (await element.inner_text()).strip()
+                        except:
+                            title = f"Boek {idx + 1}"
+                        item_key = (title, 0, 0)
+                    elif loop_step.action == "loop_chapters":
+                        item_key = self._frontier_key(idx + 1)
+                    else:
+                        item_key = self._frontier_key(self.status.current_chapter or 0, idx + 1)
                 
-                await self.check_status()
+                    # Voltooide items overslaan zonder te klikken (hervatten na crash)
+                    if frontier.is_done(item_key):
+                        self.log(f"Lus-item {idx + 1} overgeslagen: al voltooid volgens de frontier", "INFO")
+                        continue
+                
+                    # Update status
+                    if loop_step.action == "loop_books":
+                        self.status.current_book = item_key[0]
+                        self.book_started.emit(self.status.current_book)
+                    elif loop_step.action == "loop_chapters":
+                        self.status.current_chapter = idx + 1
+                        self.chapter_started.emit(f"Hoofdstuk {idx + 1}", idx + 1)
+                    else:
+                        self.status.current_paragraph = idx + 1
+                        self.paragraph_started.emit(f"Paragraaf {idx + 1}", idx + 1)
                 
-                # Klik op het element om naar het item te gaan
-                retry_count = 0
-                while self.is_running:
                     await self.check_status()
-                    try:
-                        # Zoek elementen opnieuw omdat de DOM veranderd kan zijn na navigatie
-                        elements = await self.page.query_selector_all(collection_selector)
-                        if idx >= len(elements):
-                            self.log(f"Waarschuwing: Index {idx} buiten bereik (totaal {len(elements)} elementen)", "WARNING")
-                            break # Ga naar volgende item in de lijst als deze niet meer bestaat
+                    frontier.start(item_key)
+                
+                    # Klik op het element om naar het item te gaan
+                    clicked = False
+                    retry_count = 0
+                    while self.is_running:
+                        await self.check_status()
+                        try:
+                            # Zoek elementen opnieuw omdat de DOM veranderd kan zijn na navigatie
+                            elements = await self.page.query_selector_all(collection_selector)
+                            if idx >= len(elements):
+                                self.log(f"Waarschuwing: Index {idx} buiten bereik (totaal {len(elements)} elementen)", "WARNING")
+                                break # Ga naar volgende item in de lijst als deze niet meer bestaat
                         
-                        element = elements[idx]
+                            element = elements[idx]
                         
-                        # Scroll naar element voor de zekerheid
-                        await element.scroll_into_view_if_needed()
-                        await element.click()
-                        await self.page.wait_for_load_state("networkidle")
-                        await asyncio.sleep(1) # Korte pauze na klik
-                        break # Succes! Verlaat de retry loop
-                    except Exception as e:
-                        retry_count += 1
-                        self.log(f"Fout bij klikken op lus-item {idx + 1} (poging {retry_count}): {str(e)}", "WARNING")
-                        self.log("Stap mislukt. Bezig met oneindig herhalen...", "INFO")
-                        await asyncio.sleep(2) # Wacht even voor volgende poging
+                            # Scroll naar element voor de zekerheid
+                            await element.scroll_into_view_if_needed()
+                            await element.click()
+                            await self._wait_ready(self.page, loop_step.ready or ReadyConfig(), label=f"lus-item {idx + 1}")
+                            clicked = True
+                            break # Succes! Verlaat de retry loop
+                        except Exception as e:
+                            retry_count += 1
+                            self.log(f"Fout bij klikken op lus-item {idx + 1} (poging {retry_count}): {str(e)}", "WARNING")
+                            self.log("Stap mislukt. Bezig met oneindig herhalen...", "INFO")
+                            await asyncio.sleep(2) # Wacht even voor volgende poging
                 
-                if not self.is_running:
-                    break
+                    if not self.is_running:
+                        break
+                
+                    if not clicked:
+                        frontier.fail(item_key, "Element niet meer gevonden")
+                        continue
                 
-                # Voer de stappen binnen de lus uit
-                await self._execute_sequence(inner_steps, 0)
+                    # Voer de stappen binnen de lus uit
+                    await self._execute_sequence(inner_steps, 0)
+                
+                    if not self.is_running:
+                        break  # Onderbroken: blijft in_flight en wordt bij hervatten opnieuw gedaan
+                    # Het item is pas klaar als de tekst uit de stappen echt op schijf staat
+                    if self.write_queue:
+                        await self.write_queue.flush()
+                    frontier.complete(item_key)
                 
-                self.item_completed.emit("paragraph" if loop_step.action == "loop_paragraphs" else "chapter", "✅", "Voltooid")
+                    self.item_completed.emit("paragraph" if loop_step.action == "loop_paragraphs" else "chapter", "✅", "Voltooid")
             
             return loop_end_index
             
@@ -1070,6 +1319,7 @@ class BookScrapeRunner(QObject):
                     return j
             return loop_start_index
 
+    @traced("step", step="step_num", action="step.action", selector="step.selector")
     async def _execute_step(self, step, step_num, total_steps):
         """Voer een enkele login/automatisering stap uit"""
         # Sla loop-gerelateerde stappen over, deze worden door _execute_sequence afgehandeld
@@ -1090,7 +1340,9 @@ class BookScrapeRunner(QObject):
         if step.selector and step.action in ["click", "fill", "scrape"]:
             try:
                 await self.page.evaluate(f"window.__logOverlay.highlight({json.dumps(step.selector)})")
-                await asyncio.sleep(0.5) # Korte pauze voor visuele feedback
+                # Korte pauze voor visuele feedback, alleen zinvol als er iemand meekijkt
+                if self.config.browser.highlight_pause_ms > 0 and not self.config.browser.headless:
+                    await asyncio.sleep(self.config.browser.highlight_pause_ms / 1000)
             except: pass
         
         retry_count = 0
@@ -1162,8 +1414,10 @@ class BookScrapeRunner(QObject):
                 elif step.action == "scrape":
                     await self._scrape_current_page(step.selector)
 
-                # Algemene wacht na stap
-                if step.wait_after_ms > 0:
+                # Algemene wacht na stap: een ready strategie indien geconfigureerd, anders vaste wachttijd
+                if step.ready and step.action not in ["wait", "screenshot"]:
+                    await self._wait_ready(self.page, step.ready, default_selector=step.expected_element, label=f"stap {step_num}")
+                elif step.wait_after_ms > 0:
                     await asyncio.sleep(step.wait_after_ms / 1000)
                 
                 success = True
@@ -1191,6 +1445,17 @@ class BookScrapeRunner(QObject):
                 if not self.is_running:
                     break
 
+    async def _wait_ready(self, page: Page, ready: ReadyConfig, default_selector: Optional[str] = None, label: str = ""):
+        """Wacht tot de pagina klaar is en log welke strategie gebruikt werd en hoe lang het duurde"""
+        with self.metrics.stage("ready"):
+            strategy, elapsed_ms = await wait_until_ready(
+                page,
+                ready,
+                default_selector=default_selector,
+                default_timeout=self.config.timeouts.navigation
+            )
+        self.log(f"Gereed na {elapsed_ms:.0f} ms via {strategy}" + (f" ({label})" if label else ""), "DEBUG")
+
     async def _take_error_screenshot(self, step_num: int, action: str) -> Optional[str]:
         """Maakt een screenshot bij een fout en slaat deze op"""
         if not self.page:
@@ -1242,16 +1507,13 @@ class BookScrapeRunner(QObject):
                 # Zorg dat de directory bestaat (saver heeft deze al ingesteld voor het boek)
                 output_path = Path(self.config.output.output_dir) / filename
                 
-                # Gebruik saver om data op te slaan indien mogelijk, anders direct
-                if self.saver:
-                    # We kunnen de saver uitbreiden of hier direct schrijven
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(text)
+                # Schrijven gebeurt op de achtergrond; de lus kan direct verder
+                if self.write_queue:
+                    await self.write_queue.submit_text(output_path, text)
                 else:
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(text)
-                    
-                self.log(f"Tekst opgeslagen in: {filename}", "SUCCESS")
+                    await asyncio.to_thread(output_path.write_text, text, encoding="utf-8")
+                    self.log(f"Tekst opgeslagen in: {filename}", "SUCCESS")
+                
                 self.data_collected.emit({
                     "Hoofdstuk": self.status.current_chapter,
                     "Paragraaf": self.status.current_paragraph,
@@ -1268,7 +1530,8 @@ class BookScrapeRunner(QObject):
         """Stel Playwright browser in"""
         self.status_update.emit("Browser starten...")
         
-        playwright = await async_playwright().start()
+        self.playwright = await async_playwright().start()
+        playwright = self.playwright
         
         success = False
         if self.config.browser.attach_to_existing:
@@ -1300,9 +1563,11 @@ class BookScrapeRunner(QObject):
         if not success:
             if self.config.browser.use_persistent_context:
                 self.log(f"Nieuwe persistent context starten: {self.config.browser.user_data_dir}", "INFO")
+                if self.config.browser.storage_state_path:
+                    self.log("storage_state_path wordt genegeerd in persistent context mode", "WARNING")
                 self.context = await playwright.chromium.launch_persistent_context(
                     user_data_dir=self.config.browser.user_data_dir,
-                    headless=False, # Forceer zichtbaar venster
+                    headless=self.config.browser.headless,
                     viewport={"width": 1280, "height": 720},
                     args=["--start-maximized"] # Sneller bruikbaar
                 )
@@ -1313,12 +1578,16 @@ class BookScrapeRunner(QObject):
             else:
                 self.log("Nieuwe browser instance starten...", "INFO")
                 self.browser = await playwright.chromium.launch(
-                    headless=False, # Forceer zichtbaar venster
+                    headless=self.config.browser.headless,
                     args=["--start-maximized"]
                 )
-                self.context = await self.browser.new_context(
-                    viewport={"width": 1280, "height": 720}
-                )
+                context_options = {"viewport": {"width": 1280, "height": 720}}
+                state_path = self.config.browser.storage_state_path
+                if state_path and Path(state_path).exists():
+                    # Start met een gedeelde ingelogde sessie (zie runner.coordinator)
+                    context_options["storage_state"] = state_path
+                    self.log(f"Sessie laden uit {state_path}", "INFO")
+                self.context = await self.browser.new_context(**context_options)
                 self.page = await self.context.new_page()
 
         # Direct feedback geven dat browser er is
@@ -1352,36 +1621,15 @@ class BookScrapeRunner(QObject):
         
         self.page.goto = robust_goto
         
-        # Intercept requests om CAPTCHA te detecteren
-        await self.context.route("**/*", self.handle_route)
+        # Request beleid: alleen requests die geblokkeerd kunnen worden gaan via Python
+        self.resource_policy = ResourcePolicy(self.config.resource_policy)
+        await self.resource_policy.install(self.context)
+        
+        # CAPTCHA en video detectie via goedkope response listeners (geen route round trip)
+        self.context.on("response", self._on_response)
 
         # Setup bindings EERST (zodat ze beschikbaar zijn voor de init script)
-        try:
-            await self.context.expose_binding(
-                "pythonGetState",
-                lambda source: {
-                    "is_recording": self.is_recording,
-                    "is_selection_mode": self.is_selection_mode,
-                    "use_coordinates": getattr(self, "use_coordinate_recording", False),
-                    "current_step": getattr(self, "_current_overlay_step", ""),
-                    "current_detail": getattr(self, "_current_overlay_detail", "")
-                }
-            )
-        except: pass
-
-        try:
-            await self.context.expose_binding(
-                "pythonRecordAction", 
-                lambda source, action: self.user_action_recorded.emit(action)
-            )
-        except: pass
-
-        try:
-            await self.context.expose_binding(
-                "pythonCaptureSelector", 
-                lambda source, selector: self.selector_captured.emit(selector)
-            )
-        except: pass
+        await self._expose_bindings(self.context)
 
         # Setup persistent scripts op context niveau
         await self.context.add_init_script(OVERLAY_JS)
@@ -1398,6 +1646,10 @@ class BookScrapeRunner(QObject):
 
     def _on_new_page(self, page):
         """Wordt aangeroepen wanneer een nieuwe pagina (tab) wordt geopend"""
+        # Worker pagina's uit de pool nemen de hoofdpagina niet over
+        if self.page_pool and (self.page_pool.is_opening or self.page_pool.owns(page)):
+            return
+            
         self.page = page
         self.log(f"Nieuw tabblad geopend: {page.url}", "INFO")
         
@@ -1408,29 +1660,34 @@ class BookScrapeRunner(QObject):
         # We hoeven de overlay niet handmatig te injecteren omdat we context.add_init_script gebruiken
         # De overlay zal zichzelf via pythonGetState configureren
             
-    async def handle_route(self, route, request):
-        """Route handler voor request intercepting"""
-        # Controleer op CAPTCHA pagina's
-        url = request.url.lower()
-        captcha_indicators = ["captcha", "recaptcha", "hcaptcha", "cloudflare"]
-        
-        if any(indicator in url for indicator in captcha_indicators):
-            self.log("CAPTCHA pagina gedetecteerd", "WARNING")
-            await self.handle_captcha()
-            
-        # Video detectie indien ingeschakeld
-        if self.config.output.download_videos:
-            video_extensions = [".mp4", ".webm", ".m4v", ".mov"]
-            if any(ext in url for ext in video_extensions) or request.resource_type == "media":
-                self.log(f"Video gedetecteerd: {url}", "INFO")
-                # Download video in de achtergrond
-                asyncio.create_task(self.saver.save_media(
-                    url, 
-                    self.status.current_chapter, 
-                    self.status.current_paragraph
-                ))
-                
-        await route.continue_()
+    def _on_response(self, response: Response):
+        """Response listener voor CAPTCHA en video detectie, en het vangen van afbeeldingen"""
+        try:
+            url = response.url
+            
+            if self.image_capture:
+                self.image_capture.on_response(response)
+            
+            # Controleer op CAPTCHA pagina's
+            if not self.captcha_paused and ResourcePolicy.is_captcha_url(url):
+                self.log("CAPTCHA pagina gedetecteerd", "WARNING")
+                asyncio.create_task(self.handle_captcha())
+                
+            # Video detectie indien ingeschakeld
+            if self.config.output.download_videos and self.media_scheduler:
+                resource_type = response.request.resource_type
+                if ResourcePolicy.is_video(url, resource_type):
+                    # Download in de achtergrond; herhaalde (range) requests worden genegeerd
+                    submitted = self.media_scheduler.submit(
+                        url,
+                        self.status.current_chapter,
+                        self.status.current_paragraph,
+                        priority=PRIORITY_MEDIA if resource_type == "media" else PRIORITY_GUESSED
+                    )
+                    if submitted:
+                        self.log(f"Video gedetecteerd: {url}", "INFO")
+        except Exception as e:
+            self.log(f"Fout in response listener: {str(e)}", "DEBUG")
         
     async def handle_captcha(self):
         """Handle CAPTCHA detectie"""
@@ -1720,6 +1977,28 @@ class BookScrapeRunner(QObject):
             self.log(f"Fout bij selecteren van boek index {book_index}: {str(e)}", "ERROR")
             raise
 
+    async def scrape_books(self, book_indices: List[int]):
+        """Scrape een reeks boeken achter elkaar zonder op boek selectie te wachten"""
+        for position, book_index in enumerate(book_indices):
+            if not self.is_running:
+                break
+            
+            # Terug naar de boekenlijst voor elk volgend boek
+            if position > 0:
+                with self.metrics.stage("navigation"):
+                    await self.page.goto(
+                        self.config.start_url,
+                        timeout=self.config.timeouts.navigation,
+                        wait_until="networkidle"
+                    )
+            
+            try:
+                await self.select_book(book_index)
+                await self.scrape_content()
+            except Exception as e:
+                self.log(f"Boek {book_index} mislukt: {str(e)}", "ERROR")
+                self.item_completed.emit("book", "❌", str(e))
+
     def run_sync(self):
         """Synchron wrapper voor async run"""
         try:
@@ -1761,10 +2040,18 @@ class BookScrapeRunner(QObject):
             self.metrics.update_hierarchy(chapters=len(chapter_elements))
             self.log(f"{self.status.total_chapters} hoofdstuk(ken) gevonden", "INFO")
             
+            frontier = self._get_frontier()
+            frontier.discover([self._frontier_key(idx) for idx in range(1, len(chapter_elements) + 1)])
+            
             # Loop door hoofdstukken
             for chapter_idx, chapter_el in enumerate(chapter_elements, start=1):
                 if not self.is_running:
                     break
+                
+                # Voltooide hoofdstukken niet eens openen
+                if frontier.is_done(self._frontier_key(chapter_idx)):
+                    self.log(f"Hoofdstuk {chapter_idx} overgeslagen: al voltooid volgens de frontier", "INFO")
+                    continue
                     
                 self.status.current_chapter = chapter_idx
                 self.status_update.emit(f"Hoofdstuk {chapter_idx} verwerken...")
@@ -1783,18 +2070,58 @@ class BookScrapeRunner(QObject):
                 
             self.item_completed.emit("book", "✅", "Voltooid")
             self.log("Alle content succesvol gescraped", "SUCCESS")
+            await self._schedule_book_export()
             
         except Exception as e:
             self.log(f"Content scraping mislukt: {str(e)}", "ERROR")
             raise
-            
+    
+    async def _schedule_book_export(self):
+        """
+        Bouw de PDF/EPUB van het huidige boek in een apart proces.
+        De scraper wacht hier niet op; cleanup wacht tot alle exports klaar zijn.
+        """
+        export_format = self.config.output.export_format
+        if export_format not in BOOK_EXPORT_FORMATS or not self.saver:
+            return
+        if export_format == "pdf" and not HAS_REPORTLAB:
+            self.log("PDF export niet mogelijk: installeer reportlab (pip install reportlab)", "WARNING")
+            return
+        
+        # Alle paragrafen van dit boek moeten op schijf staan voor de export begint
+        if self.write_queue:
+            await self.write_queue.flush()
+        
+        if not self.book_exporter:
+            self.book_exporter = BookExporter(export_format, on_done=self._on_book_exported)
+        book_title = self.status.current_book or self.saver.metadata.get("book_title", "")
+        self.book_exporter.schedule(self.saver.book_export_source(book_title), book_title)
+        self.log(f"{export_format.upper()} export van '{book_title}' gestart", "INFO")
+    
+    def _on_book_exported(self, book_title: str, path: str):
+        """Resultaat van een boek export (draait in de event loop)"""
+        if path:
+            self.log(f"Boek '{book_title}' geëxporteerd naar {Path(path).name}", "SUCCESS")
+        else:
+            self.log(f"Export van boek '{book_title}' mislukt", "ERROR")
+            
+    @traced("chapter", book="self.status.current_book", chapter="chapter_index")
     async def process_chapter(self, chapter_element, chapter_index: int):
         """Verwerk een hoofdstuk"""
+        frontier = self._get_frontier()
+        chapter_key = self._frontier_key(chapter_index)
+        frontier.start(chapter_key)
         try:
             # Klik hoofdstuk
             self.log(f"Bezig met openen van hoofdstuk {chapter_index}...", "INFO")
-            await chapter_element.click()
-            await self.page.wait_for_load_state("networkidle")
+            with self.metrics.stage("navigation"):
+                await chapter_element.click()
+            await self._wait_ready(
+                self.page,
+                self.config.ui_structure.chapter_ready,
+                default_selector=self.config.ui_structure.chapter_paragraphs_container_selector,
+                label=f"hoofdstuk {chapter_index}"
+            )
             
             # Wacht op paragrafen container
             await self.page.wait_for_selector(
@@ -1813,46 +2140,48 @@ class BookScrapeRunner(QObject):
             self.metrics.set_total_items(current_total + len(paragraph_elements))
             
             self.log(f"Hoofdstuk {chapter_index} geopend: {self.status.total_paragraphs} paragra(a)f(en) gevonden", "INFO")
+            frontier.discover([self._frontier_key(chapter_index, idx) for idx in range(1, len(paragraph_elements) + 1)])
             
             # Loop door paragrafen
             if self.config.browser.parallel_mode:
-                self.log(f"Parallel scrapen ingeschakeld (max 3 tegelijk)", "INFO")
-                semaphore = asyncio.Semaphore(3)
+                pool = await self._get_page_pool()
+                self.log(f"Parallel scrapen ingeschakeld ({pool.size} worker pagina's)", "INFO")
+                await pool.warm_up(self.page.url)
                 tasks = []
                 
-                async def parallel_wrapper(p_idx, p_el_index):
-                    async with semaphore:
+                async def parallel_wrapper(p_idx):
+                    if not self.is_running: return
+                    
+                    # Leen een warme pagina die al op de boekweergave staat
+                    async with pool.acquire() as worker_page:
                         if not self.is_running: return
                         
-                        # Maak een nieuwe pagina voor dit item om navigatie-conflicten te voorkomen
-                        new_page = await self.context.new_page()
-                        try:
-                            # Navigeer naar de huidige URL (het boek)
-                            await new_page.goto(self.page.url)
-                            await new_page.wait_for_load_state("networkidle")
-                            
-                            # Zoek het paragraaf element opnieuw op de nieuwe pagina
-                            p_elements = await new_page.query_selector_all(
+                        # Zoek het paragraaf element op de worker pagina
+                        p_elements = await worker_page.query_selector_all(
+                            self.config.ui_structure.paragraph_button_selector
+                        )
+                        if p_idx - 1 >= len(p_elements):
+                            # Pagina is van de boekweergave af geraakt, herlaad de shell
+                            await pool.reset_page(worker_page)
+                            p_elements = await worker_page.query_selector_all(
                                 self.config.ui_structure.paragraph_button_selector
                             )
-                            if p_idx - 1 < len(p_elements):
-                                p_el = p_elements[p_idx - 1]
-                                
-                                # Signaal voor UI
-                                para_title = f"Paragraaf {p_idx}"
-                                try:
-                                    para_title = await p_el.inner_text()
-                                    para_title = para_title.split('\n')[0].strip()
-                                except: pass
-                                self.paragraph_started.emit(para_title, p_idx)
-                                
-                                await self.process_paragraph(p_el, chapter_index, p_idx, page=new_page)
-                                self.item_completed.emit("paragraph", "✅", "Voltooid")
-                        finally:
-                            await new_page.close()
+                        if p_idx - 1 < len(p_elements):
+                            p_el = p_elements[p_idx - 1]
+                            
+                            # Signaal voor UI
+                            para_title = f"Paragraaf {p_idx}"
+                            try:
+                                para_title = await p_el.inner_text()
+                                para_title = para_title.split('\n')[0].strip()
+                            except: pass
+                            self.paragraph_started.emit(para_title, p_idx)
+                            
+                            await self.process_paragraph(p_el, chapter_index, p_idx, page=worker_page)
+                            self.item_completed.emit("paragraph", "✅", "Voltooid")
 
                 for para_idx, _ in enumerate(paragraph_elements, start=1):
-                    tasks.append(parallel_wrapper(para_idx, para_idx - 1))
+                    tasks.append(parallel_wrapper(para_idx))
                 
                 await asyncio.gather(*tasks)
             else:
@@ -1872,24 +2201,60 @@ class BookScrapeRunner(QObject):
                     
                     await self.process_paragraph(para_el, chapter_index, para_idx)
                     self.item_completed.emit("paragraph", "✅", "Voltooid")
+            
+            # Het hoofdstuk is pas klaar als alle paragrafen echt op schijf staan
+            if self.write_queue:
+                await self.write_queue.flush()
+            failed = sum(
+                1 for idx in range(1, len(paragraph_elements) + 1)
+                if not frontier.is_done(self._frontier_key(chapter_index, idx))
+            )
+            if failed == 0:
+                frontier.complete(chapter_key)
+            elif self.is_running:
+                frontier.fail(chapter_key, f"{failed} paragra(a)f(en) niet voltooid")
                 
         except Exception as e:
             self.log(f"Fout bij verwerken van hoofdstuk {chapter_index}: {str(e)}", "ERROR")
+            frontier.fail(chapter_key, str(e))
             # Ga door met volgend hoofdstuk
             
-    async def process_paragraph(self, paragraph_element, chapter_index: int, paragraph_index: int, page: Optional[Page] = None):
-        """Verwerk een paragraaf"""
+    async def _get_page_pool(self) -> PagePool:
+        """Haal de pool met worker pagina's op (of maak deze aan) voor de huidige context"""
+        if self.page_pool is None or self.page_pool.context is not self.context:
+            if self.page_pool:
+                await self.page_pool.close()
+            self.page_pool = PagePool(
+                self.context,
+                size=self.config.browser.parallel_workers,
+                navigation_timeout=self.config.timeouts.navigation,
+                selector_timeout=self.config.timeouts.selector
+            )
+        return self.page_pool
+
+    @traced("paragraph", chapter="chapter_index", paragraph="paragraph_index")
+    async def process_paragraph(self, paragraph_element, chapter_index: int, paragraph_index: int, page: Optional[Page] = None) -> bool:
+        """Verwerk een paragraaf. Retourneert of de paragraaf (nu of eerder) geëxporteerd is."""
         if page is None:
             page = self.page
+        
+        frontier = self._get_frontier()
+        paragraph_key = self._frontier_key(chapter_index, paragraph_index)
             
         try:
-            # Check of dit item al is geëxporteerd (Resume functionaliteit)
-            if self.saver.is_completed(chapter_index, paragraph_index):
+            # Check of dit item al is geëxporteerd (Resume functionaliteit).
+            # In incrementele modus bezoeken we geëxporteerde paragrafen opnieuw en vergelijken de digest.
+            already_exported = (not self.config.output.incremental
+                                and self.saver.is_completed(chapter_index, paragraph_index))
+            if already_exported or frontier.is_done(paragraph_key):
                 self.log(f"Overslaan: Paragraaf {chapter_index}.{paragraph_index} is al geëxporteerd.", "INFO")
+                frontier.complete(paragraph_key)
                 self.status.items_processed += 1
                 self.metrics.item_completed(success=True) # Ook meetellen voor progress
                 self.metrics_updated.emit(self.metrics.get_summary())
-                return
+                return True
+            
+            frontier.start(paragraph_key)
 
             self.status_update.emit(
                 f"Paragraaf {chapter_index}.{paragraph_index} verwerken..."
@@ -1904,72 +2269,33 @@ class BookScrapeRunner(QObject):
             except:
                 pass
                 
-            await paragraph_element.scroll_into_view_if_needed()
-            await paragraph_element.click()
+            with self.metrics.stage("navigation"):
+                await paragraph_element.scroll_into_view_if_needed()
+                await paragraph_element.click()
             
             # Wacht op content laden
             self.log(f"Wachten op laden van content voor paragraaf {chapter_index}.{paragraph_index}...", "INFO")
-            await page.wait_for_load_state("networkidle")
-            await asyncio.sleep(1)  # Korte pauze voor dynamic content
+            await self._wait_ready(
+                page,
+                self.config.ui_structure.paragraph_ready,
+                default_selector=self.config.ui_structure.lesson_content_selector,
+                label=f"paragraaf {chapter_index}.{paragraph_index}"
+            )
             
-            # Haal leerdoelen op
-            objectives_text = ""
-            if self.config.ui_structure.learning_objectives_selector:
-                self.log(f"Extraheren van leerdoelen uit {page.url}...", "DEBUG")
-                try:
-                    objectives_el = await page.wait_for_selector(
-                        self.config.ui_structure.learning_objectives_selector,
-                        timeout=self.config.timeouts.selector
-                    )
-                    if objectives_el:
-                        objectives_text = await objectives_el.inner_text()
-                except:
-                    self.log(f"Geen leerdoelen gevonden voor paragraaf {chapter_index}.{paragraph_index}", "WARNING")
-                    
-            # Haal leerstof op
-            lesson_text = ""
-            if self.config.ui_structure.lesson_content_selector:
-                self.log(f"Extraheren van leerstof uit {page.url}...", "DEBUG")
-                try:
-                    lesson_el = await page.wait_for_selector(
-                        self.config.ui_structure.lesson_content_selector,
-                        timeout=self.config.timeouts.selector
-                    )
-                    if lesson_el:
-                        lesson_text = await lesson_el.inner_text()
-                except:
-                    self.log(f"Geen leerstof gevonden voor paragraaf {chapter_index}.{paragraph_index}", "WARNING")
-                    
-            # Haal custom velden op (Point-and-Click Engine)
-            custom_data = {}
-            for field in self.config.custom_fields:
-                try:
-                    # Highlight het veld in de browser
-                    await page.evaluate(f"window.__logOverlay.highlight({json.dumps(field.selector)})")
-                    
-                    el = await page.query_selector(field.selector)
-                    if el:
-                        if field.action == "Tekst":
-                            custom_data[field.name] = await el.inner_text()
-                        elif field.action == "HTML":
-                            custom_data[field.name] = await el.inner_html()
-                        elif field.action == "Link (href)":
-                            custom_data[field.name] = await el.get_attribute("href")
-                        elif field.action == "Afbeelding (src)":
-                            custom_data[field.name] = await el.get_attribute("src")
-                        else:
-                            custom_data[field.name] = await el.inner_text()
-                    else:
-                        custom_data[field.name] = ""
-                except Exception as fe:
-                    self.log(f"Fout bij extraheren van custom veld '{field.name}': {str(fe)}", "DEBUG")
-                    custom_data[field.name] = ""
+            # Haal leerdoelen, leerstof, custom velden en afbeeldingen op
+            want_images = bool(self.config.output.save_images and self.config.ui_structure.image_selector)
+            with self.metrics.stage("extraction"):
+                extracted = await self._extract_content(page, chapter_index, paragraph_index, want_images)
+            
+            objectives_text = extracted["objectives"]
+            lesson_text = extracted["lesson"]
+            custom_data = extracted["custom_data"]
 
-            # Haal afbeeldingen op indien ingeschakeld
+            # Download afbeeldingen indien ingeschakeld
             images = []
-            if self.config.output.save_images and self.config.ui_structure.image_selector:
+            if want_images:
                 self.log(f"Zoeken naar afbeeldingen in paragraaf {chapter_index}.{paragraph_index}...", "DEBUG")
-                images = await self.extract_images(page)
+                images = await self.extract_images(chapter_index, paragraph_index, page, srcs=extracted.get("images"))
                 
             # Sla data op
             data = {
@@ -1979,6 +2305,7 @@ class BookScrapeRunner(QObject):
                 "objectives": objectives_text,
                 "lesson": lesson_text,
                 "custom_data": custom_data,
+                "tables": extracted.get("tables") or {},
                 "images": images,
                 "url": page.url,
                 "timestamp": datetime.now().isoformat()
@@ -1987,54 +2314,186 @@ class BookScrapeRunner(QObject):
             # Signaleer live data naar de GUI
             self.data_collected.emit(data)
             
-            self.log(f"Exporteren van data voor paragraaf {chapter_index}.{paragraph_index} naar bestand...", "INFO")
-            filepath = await self.saver.save_data(data)
-            
-            if filepath:
+            if self.config.output.incremental and self.saver.is_unchanged(data):
+                self.log(f"Ongewijzigd: Paragraaf {chapter_index}.{paragraph_index}, niets herschreven", "INFO")
+                frontier.complete(paragraph_key)
                 self.status.items_processed += 1
-                self.metrics.paragraph_completed()
+                self.metrics.item_completed(success=True)
                 self.metrics_updated.emit(self.metrics.get_summary())
-                
-                # Update progress signal voor hoofd voortgangsbalk
-                progress = self.metrics.get_progress_percentage()
-                self.progress_update.emit(int(progress), 100)
-                
-                self.log(f"Paragraaf {chapter_index}.{paragraph_index} succesvol geëxporteerd naar {Path(filepath).name}", "SUCCESS")
-            else:
-                self.log(f"Fout bij opslaan van data voor paragraaf {chapter_index}.{paragraph_index}", "ERROR")
-                self.metrics.item_completed(success=False)
+                return True
+            
+            # Wegschrijven gebeurt op de achtergrond (zie _on_record_written);
+            # alleen bij een volle queue wachten we hier op de schijf
+            self.log(f"Exporteren van data voor paragraaf {chapter_index}.{paragraph_index} naar bestand...", "INFO")
+            await self.write_queue.submit(data)
+            return True
             
         except Exception as e:
             self.log(f"Fout bij verwerken van paragraaf {chapter_index}.{paragraph_index}: {str(e)}", "ERROR")
+            frontier.fail(paragraph_key, str(e))
+            return False
             
-    async def extract_images(self, page: Optional[Page] = None) -> List[Dict[str, Any]]:
-        """Extraheer afbeeldingen uit huidige pagina"""
+    def _on_record_written(self, kind: str, payload: Dict[str, Any], filepath: str):
+        """Verwerk het resultaat van de write queue (draait in de event loop)"""
+        if kind == "text":
+            if filepath:
+                self.log(f"Tekst opgeslagen in: {Path(filepath).name}", "SUCCESS")
+            else:
+                self.log(f"Tekst opslaan mislukt: {payload.get('path')}", "ERROR")
+            return
+        
+        chapter_index = payload.get("chapter_index", 0)
+        paragraph_index = payload.get("paragraph_index", 0)
+        paragraph_key = (payload.get("book") or "", chapter_index, paragraph_index)
+        
+        if filepath:
+            self.status.items_processed += 1
+            self.metrics.paragraph_completed()
+            self.metrics_updated.emit(self.metrics.get_summary())
+            
+            # Update progress signal voor hoofd voortgangsbalk
+            progress = self.metrics.get_progress_percentage()
+            self.progress_update.emit(int(progress), 100)
+            
+            self.log(f"Paragraaf {chapter_index}.{paragraph_index} succesvol geëxporteerd naar {Path(filepath).name}", "SUCCESS")
+            self._get_frontier().complete(paragraph_key)
+        else:
+            self.log(f"Fout bij opslaan van data voor paragraaf {chapter_index}.{paragraph_index}", "ERROR")
+            self.metrics.item_completed(success=False)
+            self._get_frontier().fail(paragraph_key, "Opslaan mislukt")
+
+    async def _extract_content(self, page: Page, chapter_index: int, paragraph_index: int,
+                               want_images: bool) -> Dict[str, Any]:
+        """Extraheer paragraaf content in één evaluate, met terugval op extractie per veld"""
+        if self.config.extraction_mode == ExtractionMode.BATCH:
+            self.log(f"Extraheren van paragraaf {chapter_index}.{paragraph_index} uit {page.url} (batch)...", "DEBUG")
+            try:
+                extracted = await extract_paragraph(page, build_extraction_spec(self.config, include_images=want_images))
+                for section in extracted["missing"]:
+                    label = "leerdoelen" if section == "objectives" else "leerstof"
+                    self.log(f"Geen {label} gevonden voor paragraaf {chapter_index}.{paragraph_index}", "WARNING")
+                return extracted
+            except Exception as be:
+                self.log(f"Batch extractie mislukt, terugval op extractie per veld: {str(be)}", "DEBUG")
+        
+        return await self._extract_per_field(page, chapter_index, paragraph_index)
+
+    async def _extract_per_field(self, page: Page, chapter_index: int, paragraph_index: int) -> Dict[str, Any]:
+        """Extraheer paragraaf content met één Playwright call per veld"""
+        # Haal leerdoelen op
+        objectives_text = ""
+        if self.config.ui_structure.learning_objectives_selector:
+            self.log(f"Extraheren van leerdoelen uit {page.url}...", "DEBUG")
+            try:
+                objectives_el = await page.wait_for_selector(
+                    self.config.ui_structure.learning_objectives_selector,
+                    timeout=self.config.timeouts.selector
+                )
+                if objectives_el:
+                    objectives_text = await objectives_el.inner_text()
+            except:
+                self.log(f"Geen leerdoelen gevonden voor paragraaf {chapter_index}.{paragraph_index}", "WARNING")
+                
+        # Haal leerstof op
+        lesson_text = ""
+        if self.config.ui_structure.lesson_content_selector:
+            self.log(f"Extraheren van leerstof uit {page.url}...", "DEBUG")
+            try:
+                lesson_el = await page.wait_for_selector(
+                    self.config.ui_structure.lesson_content_selector,
+                    timeout=self.config.timeouts.selector
+                )
+                if lesson_el:
+                    lesson_text = await lesson_el.inner_text()
+            except:
+                self.log(f"Geen leerstof gevonden voor paragraaf {chapter_index}.{paragraph_index}", "WARNING")
+                
+        # Haal custom velden op (Point-and-Click Engine)
+        custom_data = {}
+        tables = {}
+        for field in self.config.custom_fields:
+            if field.action == TABLE_ACTION:
+                # Ook per veld: de hele tabel in één evaluate
+                try:
+                    table = await extract_table(page, field.selector)
+                    if table:
+                        tables[field.name] = table
+                except Exception as te:
+                    self.log(f"Fout bij extraheren van tabel '{field.name}': {str(te)}", "DEBUG")
+                continue
+            try:
+                # Highlight het veld in de browser (zonder overlay geen highlight, wel een waarde)
+                await page.evaluate(f"window.__logOverlay.highlight({json.dumps(field.selector)})")
+            except:
+                pass
+            try:
+                el = await page.query_selector(field.selector)
+                if el:
+                    if field.action == "Tekst":
+                        custom_data[field.name] = await el.inner_text()
+                    elif field.action == "HTML":
+                        custom_data[field.name] = await el.inner_html()
+                    elif field.action == "Link (href)":
+                        custom_data[field.name] = await el.get_attribute("href")
+                    elif field.action == "Afbeelding (src)":
+                        custom_data[field.name] = await el.get_attribute("src")
+                    else:
+                        custom_data[field.name] = await el.inner_text()
+                else:
+                    custom_data[field.name] = ""
+            except Exception as fe:
+                self.log(f"Fout bij extraheren van custom veld '{field.name}': {str(fe)}", "DEBUG")
+                custom_data[field.name] = ""
+
+        return {
+            "objectives": objectives_text,
+            "lesson": lesson_text,
+            "custom_data": custom_data,
+            "tables": tables,
+            "images": None  # extract_images zoekt de afbeeldingen zelf op
+        }
+
+    @traced("images", chapter="chapter_index", paragraph="paragraph_index")
+    async def extract_images(self, chapter_index: int, paragraph_index: int, page: Optional[Page] = None,
+                             srcs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Extraheer afbeeldingen uit huidige pagina, of uit reeds verzamelde src URLs.
+        Hoofdstuk en paragraaf komen van de aanroeper: in parallel mode lopen
+        meerdere paragrafen tegelijk en zegt self.status niets over deze pagina.
+        """
         if page is None:
             page = self.page
             
         images = []
         
         try:
-            image_elements = await page.query_selector_all(
-                self.config.ui_structure.image_selector
-            )
+            if srcs is None:
+                srcs = []
+                image_elements = await page.query_selector_all(
+                    self.config.ui_structure.image_selector
+                )
+                for img_el in image_elements:
+                    # Haal src attribuut op
+                    srcs.append(await img_el.get_attribute("src"))
             
-            for idx, img_el in enumerate(image_elements, start=1):
+            for idx, src in enumerate(srcs, start=1):
                 if not self.is_running:
                     break
                     
-                # Haal src attribuut op
-                src = await img_el.get_attribute("src")
                 if not src:
                     continue
                     
-                # Download afbeelding
-                image_path = await self.saver.save_image(
-                    src, 
-                    self.status.current_chapter,
-                    self.status.current_paragraph,
-                    idx
-                )
+                # Relatieve src naar de URL die de browser werkelijk geladen heeft
+                image_url = src if src.startswith("data:") else urljoin(page.url, src)
+                
+                # Haal afbeelding op (uit de browser cache of via download)
+                with self.metrics.stage("images"):
+                    image_path = await self.saver.save_image(
+                        image_url, 
+                        chapter_index,
+                        paragraph_index,
+                        idx
+                    )
                 
                 if image_path:
                     images.append({
@@ -2051,6 +2510,9 @@ class BookScrapeRunner(QObject):
     def resume_after_captcha(self):
         """Hervat run na CAPTCHA oplossing"""
         self.captcha_paused = False
+        # Maak check_status wakker als die op de CAPTCHA wacht
+        if hasattr(self, 'loop') and self.loop:
+            self.loop.call_soon_threadsafe(self.control_event.set)
         self.log("Run hervat na CAPTCHA", "INFO")
         self.status_update.emit("Run hervat...")
         
@@ -2062,9 +2524,17 @@ class BookScrapeRunner(QObject):
         # Trigger config update om uit de wacht-loop te breken
         if hasattr(self, 'loop') and self.loop:
             self.loop.call_soon_threadsafe(self.config_updated_event.set)
+            # Maak een eventuele pauze in check_status wakker
+            self.loop.call_soon_threadsafe(self.control_event.set)
         
-    async def cleanup(self):
-        """Cleanup browser en resources"""
+    async def cleanup(self, final: bool = True):
+        """
+        Cleanup browser en resources.
+
+        Args:
+            final: False bij herstel na een kritieke fout; de trace en de
+                LogBus lopen dan door voor de volgende poging
+        """
         self.status_update.emit("Afronden...")
         
         try:
@@ -2072,20 +2542,75 @@ class BookScrapeRunner(QObject):
             # Dan overslaan we het sluiten van de browser
             keep_open = (self.config.browser.keep_open_on_error or self.config.browser.attach_to_existing) and not getattr(self, 'intentional_stop', False)
             
+            # Media downloads afronden zolang de browser (cookies) er nog is
+            if self.media_scheduler and (self.media_scheduler.active or self.media_scheduler.queued):
+                self.status_update.emit("Media downloads afronden...")
+                drained = await self.media_scheduler.drain(timeout=self.config.download.media_drain_timeout)
+                if not drained:
+                    self.log("Niet alle media downloads zijn klaar; ze worden bij een volgende run hervat", "WARNING")
+            
+            # Worker pagina's zijn altijd van ons, die sluiten we sowieso
+            if self.page_pool:
+                await self.page_pool.close()
+                self.page_pool = None
+            
             if not keep_open:
                 self.log("Browser wordt gesloten...", "INFO")
+                # Laatste regels nog in de overlay tonen voordat de pagina sluit
+                await self.log_bus.flush()
                 if self.page:
                     await self.page.close()
                 if self.context:
                     await self.context.close()
                 if self.browser:
                     await self.browser.close()
+                if self.playwright:
+                    await self.playwright.stop()
+                    self.playwright = None
             else:
                 self.log("Browser blijft open zoals geconfigureerd", "INFO")
                 
-            # Sla manifest op
+            # Schrijf openstaande paragrafen weg en sla manifest op
+            if self.write_queue:
+                await self.write_queue.close()
+            if self.book_exporter:
+                self.status_update.emit("Boek exports afronden...")
+                await self.book_exporter.close()
+                self.book_exporter = None
+            if self.image_capture:
+                self.log(
+                    f"Afbeeldingen uit de browser: {self.image_capture.hits}, "
+                    f"gedownload: {self.image_capture.misses}", "INFO"
+                )
+                self.image_capture.clear()
+            if self.metrics_task:
+                self.metrics_task.cancel()
+                self.metrics_task = None
+                if self.saver:
+                    # Eindstand, ook als de laatste periode nog niet om was
+                    await asyncio.to_thread(self.metrics.write_files, self.saver.run_dir)
             if self.saver:
                 await self.saver.save_manifest()
+                await self.saver.close()
+            if final and self.tracer.enabled:
+                self.tracer.close()
+                self.log(f"Trace opgeslagen: {self.tracer.path}", "INFO")
                 
         except Exception as e:
-            self.log(f"Cleanup fout: {str(e)}", "WARNING")
\ No newline at end of file
+            self.log(f"Cleanup fout: {str(e)}", "WARNING")
+        
+        if final:
+            # Rest van de buffer afleveren; daarna gaan GUI logs weer direct
+            await self.log_bus.close()
+
+
+if HAS_QT:
+    # Qt adapter over ScrapeRunner voor de GUI: dezelfde signalen, maar als
+    # pyqtSignal zodat ze veilig over threads gaan. De pyqtSignals worden uit de
+    # Signal descriptors van ScrapeRunner gegenereerd, zodat de lijsten niet uit
+    # elkaar kunnen lopen (PyQt pikt ze alleen op bij het aanmaken van de klasse).
+    BookScrapeRunner = type(QObject)("BookScrapeRunner", (ScrapeRunner, QObject), {
+        "__module__": __name__,
+        "__doc__": "Qt adapter over ScrapeRunner voor de GUI, met pyqtSignals i.p.v. Signals.",
+        **{name: pyqtSignal(*types) for name, types in signal_types(ScrapeRunner).items()}
+    })
@@ -0,0 +1,75 @@
+# runner/ready.py
+import asyncio
+import time
+from typing import Optional, Tuple
+
+from playwright.async_api import Page
+
+from config.config_manager import ReadyConfig, ReadyStrategy
+
+# Resolvet zodra er `quiet` ms lang geen DOM mutaties meer zijn geweest,
+# of na `timeout` ms. Retourneert of de pagina echt stabiel werd.
+DOM_SETTLE_JS = """
+(opts) => new Promise(resolve => {
+    let quietTimer = null;
+    const finish = (settled) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), opts.quiet);
+    });
+    const hardTimer = setTimeout(() => finish(false), opts.timeout);
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(() => finish(true), opts.quiet);
+})
+"""
+
+
+async def wait_until_ready(page: Page, ready: ReadyConfig, default_selector: Optional[str] = None,
+                           default_timeout: int = 15000) -> Tuple[str, float]:
+    """
+    Wacht tot de pagina klaar is volgens de gekozen strategie.
+
+    Args:
+        page: Playwright Page object
+        ready: Gekozen wacht strategie en parameters
+        default_selector: Doel-element als de strategie 'selector' is en er geen eigen selector is
+        default_timeout: Timeout in ms als de strategie er zelf geen heeft
+
+    Returns:
+        Tuple van (gebruikte strategie, gemeten wachttijd in ms)
+    """
+    started = time.perf_counter()
+    timeout = ready.timeout_ms or default_timeout
+    strategy = ready.strategy
+
+    if strategy == ReadyStrategy.SELECTOR:
+        selector = ready.selector or default_selector
+        if selector:
+            await page.wait_for_selector(selector, timeout=timeout)
+        else:
+            # Zonder doel-element is DOM stabiliteit het beste alternatief
+            strategy = ReadyStrategy.DOM_SETTLE
+
+    if strategy == ReadyStrategy.DOM_SETTLE:
+        opts = {"quiet": ready.quiet_ms, "timeout": timeout}
+        try:
+            await page.evaluate(DOM_SETTLE_JS, opts)
+        except Exception:
+            # De klik veroorzaakte een echte navigatie; wacht op het nieuwe document
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+            await page.evaluate(DOM_SETTLE_JS, opts)
+
+    elif strategy == ReadyStrategy.NETWORKIDLE:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+        if ready.settle_ms > 0:
+            await asyncio.sleep(ready.settle_ms / 1000)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return strategy.value, elapsed_ms
@@ -0,0 +1,108 @@
+# runner/resource_policy.py
+import re
+from typing import List, Optional, Union, Pattern
+
+from playwright.async_api import BrowserContext, Route, Request
+
+from config.config_manager import ResourcePolicyConfig
+
+CAPTCHA_INDICATORS = ("captcha", "recaptcha", "hcaptcha", "cloudflare")
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".m4v", ".mov")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Vertaal een Playwright URL glob naar een (JS en Python compatibele) regex.
+    '**' matcht alles, '*' alles behalve '/', '?' één karakter.
+    """
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            if pattern[i:i + 2] == "**":
+                regex.append(".*")
+                i += 2
+                continue
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append(".")
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+
+def _union(patterns: List[str]) -> Optional[str]:
+    if not patterns:
+        return None
+    return "(?:" + "|".join(glob_to_regex(p) for p in patterns) + ")"
+
+
+class ResourcePolicy:
+    """
+    Declaratief request beleid voor de browser context.
+
+    Alleen requests die daadwerkelijk een beslissing nodig hebben worden naar
+    Python gerouteerd: zonder blokkeerregels wordt er helemaal geen route
+    geregistreerd, en pass-through patronen worden al in de browser uitgefilterd.
+    """
+
+    def __init__(self, config: ResourcePolicyConfig):
+        self.config = config
+        self.blocked_types = {t.lower() for t in config.blocked_resource_types}
+        self._blocked_re = _union(config.blocked_url_patterns)
+        self._passthrough_re = _union(config.passthrough_url_patterns)
+        self._blocked_compiled = re.compile(f"^{self._blocked_re}$") if self._blocked_re else None
+
+    @property
+    def needs_route(self) -> bool:
+        """Of er überhaupt requests naar Python gerouteerd moeten worden"""
+        return bool(self.blocked_types or self._blocked_re)
+
+    def route_matcher(self) -> Union[str, Pattern]:
+        """
+        Bepaal het URL patroon voor context.route. Playwright evalueert glob en
+        regex patronen in de browser driver, dus niet-matchende requests
+        bereiken Python nooit.
+        """
+        exclude = f"(?!{self._passthrough_re}$)" if self._passthrough_re else ""
+        if self.blocked_types:
+            # Resource type is alleen per request te bepalen: alles behalve pass-through
+            if not exclude:
+                return "**/*"
+            return re.compile(f"^{exclude}.*$")
+        # Alleen URL regels: route uitsluitend de te blokkeren URLs
+        return re.compile(f"^{exclude}{self._blocked_re}$")
+
+    async def install(self, context: BrowserContext):
+        """Registreer de route handler op de context (alleen indien nodig)"""
+        if self.needs_route:
+            await context.route(self.route_matcher(), self.handle_route)
+
+    def should_block(self, request: Request) -> bool:
+        """Check of een request volgens het beleid geblokkeerd moet worden"""
+        if request.resource_type in self.blocked_types:
+            return True
+        if self._blocked_compiled and self._blocked_compiled.match(request.url):
+            return True
+        return False
+
+    async def handle_route(self, route: Route, request: Request):
+        """Route handler: blokkeer of laat door"""
+        if self.should_block(request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @staticmethod
+    def is_captcha_url(url: str) -> bool:
+        """Check of een URL op een CAPTCHA pagina of challenge wijst"""
+        url = url.lower()
+        return any(indicator in url for indicator in CAPTCHA_INDICATORS)
+
+    @staticmethod
+    def is_video(url: str, resource_type: str) -> bool:
+        """Check of een response een video is"""
+        url = url.lower()
+        return resource_type == "media" or any(ext in url for ext in VIDEO_EXTENSIONS)
@@ -8,5 +8,7 @@ __version__ = "1.0.0"
 __author__ = "Noordhoff Scraper Team"
 
 from .saver import DataSaver
+from .progress_index import ProgressIndex
+from .search_index import SearchIndex
 
-__all__ = ['DataSaver']
\ No newline at end of file
+__all__ = ['DataSaver', 'ProgressIndex', 'SearchIndex']
\ No newline at end of file
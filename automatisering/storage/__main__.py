@@ -0,0 +1,70 @@
+# storage/__main__.py
+"""
+Command line toegang tot de zoekindex en de batch nabewerking.
+
+Gebruik:
+    python -m storage --output ~/Documents/boek-extracts search "fotosynthese"
+    python -m storage --output ~/Documents/boek-extracts search "cel*" --book "Biologie 1"
+    python -m storage --output ~/Documents/boek-extracts rebuild
+    python -m storage --output ~/Documents/boek-extracts postprocess --workers 4
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from storage.postprocess import DEFAULT_BATCH_SIZE, postprocess_output
+from storage.search_index import SearchIndex
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m storage",
+        description="Doorzoek geëxporteerde boeken"
+    )
+    parser.add_argument("--output", required=True, help="Output map van de scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Zoek in leerdoelen, leerstof en custom velden")
+    search.add_argument("query", help="Zoekterm(en), FTS5 syntax toegestaan (bijv. 'cel*', 'cel NEAR kern')")
+    search.add_argument("--book", help="Alleen binnen dit boek zoeken (exacte titel)")
+    search.add_argument("--limit", type=int, default=20, help="Maximaal aantal resultaten")
+
+    commands.add_parser("rebuild", help="Bouw de index opnieuw op uit bestaande exports")
+
+    postprocess = commands.add_parser("postprocess", help="Verwerk alle exports tot één JSONL dataset")
+    postprocess.add_argument("--book", help="Alleen dit boek verwerken (exacte titel)")
+    postprocess.add_argument("--target", help="Doelbestand (standaard <output>/dataset.jsonl)")
+    postprocess.add_argument("--workers", type=int, default=0, help="Aantal processen (0 = aantal CPU's)")
+    postprocess.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                             help="Aantal paragrafen per worker taak")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "postprocess":
+        count = postprocess_output(args.output, book=args.book, target=args.target,
+                                   max_workers=args.workers, batch_size=args.batch_size)
+        print(f"{count} paragraaf/paragrafen verwerkt")
+        return 0
+
+    index = SearchIndex.for_output_dir(args.output)
+    try:
+        if args.command == "rebuild":
+            count = index.rebuild(args.output)
+            print(f"{count} paragraaf/paragrafen geïndexeerd")
+            return 0
+
+        hits = index.search(args.query, book=args.book, limit=args.limit)
+        for hit in hits:
+            print(f"{hit.book} {hit.chapter_index}.{hit.paragraph_index}  {hit.path}")
+            print(f"    {' '.join(hit.snippet.split())}")
+        if not hits:
+            print("Geen resultaten")
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+# storage/archive.py
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.helpers import sanitize_filename
+
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ArchiveEntry:
+    """Metadata van één bestand in een boek archief (zonder de inhoud)"""
+    chapter_index: int
+    paragraph_index: int
+    name: str  # Relatief binnen de paragraaf, bijv. "boek_1_2.txt" of "images/img1.png"
+    kind: str  # text, source, image of media
+    size: int
+    created_at: str
+
+
+class BookArchive:
+    """
+    Eén SQLite bestand per boek in plaats van duizenden losse bestanden.
+
+    Alles wat normaal in exports/<boek>/Chapter X/Paragraph Y/ terechtkomt
+    (tekst, afbeeldingen, media) staat hier als rij, geïndexeerd op
+    (hoofdstuk, paragraaf, naam). Dat scheelt veel bestandssysteem overhead
+    bij schrijven, kopiëren en backuppen, en geeft random access per paragraaf.
+
+    Kleine bestanden staan direct in entries.data. Grote bestanden (put_file)
+    staan als reeks rijen in chunks, zodat ze zonder blobopen (Python 3.11+)
+    toch in stukken erin en eruit kunnen.
+    """
+
+    EXTENSION = ".sqlite"
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Pad naar het archief (wordt aangemaakt als het niet bestaat)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                chapter_index INTEGER NOT NULL,
+                paragraph_index INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TEXT,
+                data BLOB,
+                UNIQUE (chapter_index, paragraph_index, name)
+            )
+        """)
+        # entry_id = rowid in entries; data van die entry is dan NULL
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                entry_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (entry_id, seq)
+            )
+        """)
+        self._conn.commit()
+
+    @classmethod
+    def for_book(cls, output_dir, book_title: str) -> "BookArchive":
+        """Open het archief van een boek: exports/<boek>.sqlite"""
+        slug = sanitize_filename(book_title or "unknown_book")
+        return cls(Path(output_dir) / "exports" / f"{slug}{cls.EXTENSION}")
+
+    def virtual_path(self, chapter_index: int, paragraph_index: int, name: str) -> Path:
+        """Pad zoals het in manifest en logs verschijnt (bestaat niet op schijf)"""
+        return self.path / f"Chapter {chapter_index}" / f"Paragraph {paragraph_index}" / name
+
+    def _remove(self, chapter_index: int, paragraph_index: int, name: str):
+        """Verwijder een entry met zijn chunks (aanroeper houdt lock en transactie vast)"""
+        self._conn.execute(
+            "DELETE FROM chunks WHERE entry_id IN (SELECT rowid FROM entries "
+            "WHERE chapter_index = ? AND paragraph_index = ? AND name = ?)",
+            (chapter_index, paragraph_index, name)
+        )
+        self._conn.execute(
+            "DELETE FROM entries WHERE chapter_index = ? AND paragraph_index = ? AND name = ?",
+            (chapter_index, paragraph_index, name)
+        )
+
+    def put(self, chapter_index: int, paragraph_index: int, name: str,
+            data: bytes, kind: str = "text") -> Path:
+        """Bewaar (of vervang) een bestand in het archief"""
+        with self._lock, self._conn:
+            self._remove(chapter_index, paragraph_index, name)
+            self._conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (chapter_index, paragraph_index, name, kind, len(data),
+                 datetime.now().isoformat(), sqlite3.Binary(data))
+            )
+        return self.virtual_path(chapter_index, paragraph_index, name)
+
+    def put_file(self, chapter_index: int, paragraph_index: int, name: str,
+                 source: Path, kind: str = "media", chunk_size: int = ARCHIVE_CHUNK_SIZE) -> Path:
+        """
+        Kopieer een (groot) bestand in chunks het archief in, zonder het
+        volledig in het geheugen te laden.
+        """
+        source = Path(source)
+        size = source.stat().st_size
+        with self._lock, self._conn:
+            self._remove(chapter_index, paragraph_index, name)
+            cursor = self._conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (chapter_index, paragraph_index, name, kind, size, datetime.now().isoformat())
+            )
+            entry_id = cursor.lastrowid
+            with open(source, "rb") as f:
+                seq = 0
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    self._conn.execute("INSERT INTO chunks VALUES (?, ?, ?)", (entry_id, seq, sqlite3.Binary(chunk)))
+                    seq += 1
+        return self.virtual_path(chapter_index, paragraph_index, name)
+
+    def has(self, chapter_index: int, paragraph_index: int, name: str) -> bool:
+        """Check of een bestand al in het archief staat"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE chapter_index = ? AND paragraph_index = ? AND name = ?",
+                (chapter_index, paragraph_index, name)
+            ).fetchone()
+        return row is not None
+
+    def _split_path(self, path) -> Optional[Tuple[int, int, str]]:
+        """Virtueel pad (zie virtual_path) → (hoofdstuk, paragraaf, naam)"""
+        try:
+            parts = Path(path).relative_to(self.path).parts
+            return int(parts[0].rsplit(" ", 1)[1]), int(parts[1].rsplit(" ", 1)[1]), "/".join(parts[2:])
+        except (ValueError, IndexError):
+            return None
+
+    def has_path(self, path) -> bool:
+        """Check of een virtueel pad in dit archief bestaat"""
+        key = self._split_path(path)
+        return key is not None and self.has(*key)
+
+    def read_path(self, path) -> Optional[bytes]:
+        """Lees een bestand via zijn virtuele pad (None als het niet bestaat)"""
+        key = self._split_path(path)
+        return self.read(*key) if key else None
+
+    def _iter_chunks(self, entry_id: int, data) -> Iterator[bytes]:
+        """Inhoud van een entry in stukken (aanroeper houdt de lock vast)"""
+        if data is not None:
+            yield bytes(data)  # Klein bestand, of een archief van vóór de chunks tabel
+            return
+        cursor = self._conn.execute("SELECT data FROM chunks WHERE entry_id = ? ORDER BY seq", (entry_id,))
+        for (chunk,) in cursor:
+            yield bytes(chunk)
+
+    def read(self, chapter_index: int, paragraph_index: int, name: str) -> Optional[bytes]:
+        """Lees één bestand terug (None als het niet bestaat)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rowid, data FROM entries WHERE chapter_index = ? AND paragraph_index = ? AND name = ?",
+                (chapter_index, paragraph_index, name)
+            ).fetchone()
+            return b"".join(self._iter_chunks(*row)) if row else None
+
+    def read_paragraph(self, chapter_index: int, paragraph_index: int,
+                       kind: Optional[str] = None) -> Dict[str, bytes]:
+        """Alle bestanden van één paragraaf (optioneel van één soort): naam → inhoud"""
+        query = "SELECT name, rowid, data FROM entries WHERE chapter_index = ? AND paragraph_index = ?"
+        params = [chapter_index, paragraph_index]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at, name", params).fetchall()
+            return {name: b"".join(self._iter_chunks(rowid, data)) for name, rowid, data in rows}
+
+    def entries(self, chapter_index: Optional[int] = None,
+                paragraph_index: Optional[int] = None) -> List[ArchiveEntry]:
+        """Inhoudsopgave, gesorteerd op hoofdstuk, paragraaf en naam"""
+        query = "SELECT chapter_index, paragraph_index, name, kind, size, created_at FROM entries"
+        conditions, params = [], []
+        if chapter_index is not None:
+            conditions.append("chapter_index = ?")
+            params.append(chapter_index)
+        if paragraph_index is not None:
+            conditions.append("paragraph_index = ?")
+            params.append(paragraph_index)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._conn.execute(
+                query + " ORDER BY chapter_index, paragraph_index, name", params
+            ).fetchall()
+        return [ArchiveEntry(*row) for row in rows]
+
+    def extract(self, target_dir: Path) -> int:
+        """
+        Pak het archief uit naar de gewone mappenstructuur
+        (Chapter X/Paragraph Y/...). Handig voor handmatige inspectie.
+
+        Returns:
+            Aantal uitgepakte bestanden
+        """
+        target_dir = Path(target_dir)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, chapter_index, paragraph_index, name FROM entries"
+            ).fetchall()
+
+        for rowid, chapter_index, paragraph_index, name in rows:
+            dest = target_dir / f"Chapter {chapter_index}" / f"Paragraph {paragraph_index}" / name
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            # In chunks, zodat grote media niet volledig in het geheugen komen
+            with self._lock, open(dest, "wb") as f:
+                data = self._conn.execute("SELECT data FROM entries WHERE rowid = ?", (rowid,)).fetchone()[0]
+                for chunk in self._iter_chunks(rowid, data):
+                    f.write(chunk)
+        return len(rows)
+
+    def close(self):
+        """Sluit het archief"""
+        with self._lock:
+            self._conn.close()
+
+
+def read_virtual_path(output_dir, path, archives: Dict[Path, BookArchive]) -> Optional[bytes]:
+    """
+    Lees een virtueel archief pad (exports/<boek>.sqlite/Chapter X/...), zoals
+    het in voortgangsindex en manifest staat.
+
+    Args:
+        output_dir: Output map waar het pad relatief aan is
+        path: Virtueel pad (relatief of absoluut)
+        archives: Cache van geopende archieven; de aanroeper sluit ze na afloop
+
+    Returns:
+        De inhoud, of None als het pad niet in een (bestaand) archief ligt
+    """
+    full_path = Path(output_dir) / path
+    for parent in full_path.parents:
+        if parent.suffix == BookArchive.EXTENSION and parent.is_file():
+            if parent not in archives:
+                archives[parent] = BookArchive(parent)
+            return archives[parent].read_path(full_path)
+    return None
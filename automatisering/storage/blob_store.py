@@ -0,0 +1,101 @@
+# storage/blob_store.py
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class BlobRef:
+    """Verwijzing naar een opgeslagen blob"""
+    digest: str  # sha256 van de inhoud
+    path: Path  # Absoluut pad naar het blob bestand
+    size: int
+
+
+class BlobStore:
+    """
+    Content-addressed opslag (hash → bestand) per output directory.
+
+    Identieke afbeeldingen worden één keer bewaard, ongeacht in hoeveel
+    paragrafen of runs ze voorkomen. Een URL → hash index zorgt dat een
+    eerder gezien URL niet opnieuw gedownload hoeft te worden.
+    """
+
+    DIRNAME = "blobs"
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Directory waarin blobs en de index bewaard worden
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                first_seen TEXT
+            )
+        """)
+        self._conn.commit()
+
+    @classmethod
+    def for_output_dir(cls, output_dir) -> "BlobStore":
+        """Open de blob store die bij een output directory hoort"""
+        return cls(Path(output_dir) / cls.DIRNAME)
+
+    def path_for(self, digest: str, ext: str = "") -> Path:
+        """Pad van een blob: blobs/ab/abcdef....ext (twee niveaus houdt mappen klein)"""
+        return self.root / digest[:2] / f"{digest}{ext}"
+
+    def lookup_url(self, url: str) -> Optional[BlobRef]:
+        """Zoek een eerder opgeslagen URL op (None als onbekend of het bestand weg is)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, ext, size FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        path = self.path_for(row[0], row[1])
+        if not path.exists():
+            return None
+        return BlobRef(digest=row[0], path=path, size=row[2])
+
+    def put(self, data: bytes, ext: str = "", url: Optional[str] = None) -> BlobRef:
+        """
+        Bewaar inhoud (indien nog niet aanwezig) en registreer optioneel de URL.
+
+        Args:
+            data: Bestandsinhoud
+            ext: Extensie inclusief punt, bijv. ".png"
+            url: Bron URL voor de lookup index (data URIs niet meegeven)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, ext)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(path.name + ".tmp")
+            temp_path.write_bytes(data)
+            temp_path.replace(path)  # Atomic Save
+
+        if url:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)",
+                    (url, digest, ext, len(data), datetime.now().isoformat())
+                )
+        return BlobRef(digest=digest, path=path, size=len(data))
+
+    def close(self):
+        """Sluit de index"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,381 @@
+# storage/book_export.py
+"""
+Echte PDF en EPUB export op boekniveau.
+
+Bij export_format pdf/epub schrijft DataSaver per paragraaf een JSON bron
+(als bestand, of als rij in het BookArchive van het boek). Als een boek klaar is, bouwt export_book daaruit één PDF of EPUB
+met alle hoofdstukken, paragrafen en afbeeldingen. De functie is bedoeld om
+in een ProcessPoolExecutor te draaien (zie ScrapeRunner._schedule_book_export)
+en leest de hoofdstukken één voor één in, zodat het geheugen begrensd blijft.
+"""
+import asyncio
+import html
+import io
+import json
+import multiprocessing
+import re
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from storage.archive import BookArchive
+
+# reportlab is optioneel: zonder reportlab is alleen EPUB export beschikbaar
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
+    HAS_REPORTLAB = True
+except ImportError:
+    HAS_REPORTLAB = False
+
+# Export formaten die op boekniveau gebouwd worden
+BOOK_EXPORT_FORMATS = ("pdf", "epub")
+
+_NUMBER_RE = re.compile(r"(\d+)$")
+
+
+def _index_of(path: Path) -> int:
+    """Volgnummer uit een map naam als 'Chapter 12' of 'Paragraph 3'"""
+    match = _NUMBER_RE.search(path.name)
+    return int(match.group(1)) if match else 0
+
+
+def iter_chapters(book_dir: Path) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Loop hoofdstuk voor hoofdstuk door de paragraaf bronnen van een boek.
+    Per paragraaf wordt de nieuwste JSON bron gebruikt.
+
+    Args:
+        book_dir: exports/<boek> map, of het BookArchive bestand van het boek
+
+    Yields:
+        (hoofdstuk index, lijst van paragraaf records op volgorde)
+    """
+    if Path(book_dir).is_file():
+        yield from _iter_archive_chapters(Path(book_dir))
+        return
+
+    chapter_dirs = sorted((d for d in Path(book_dir).glob("Chapter *") if d.is_dir()), key=_index_of)
+    for chapter_dir in chapter_dirs:
+        paragraphs = []
+        paragraph_dirs = sorted((d for d in chapter_dir.glob("Paragraph *") if d.is_dir()), key=_index_of)
+        for paragraph_dir in paragraph_dirs:
+            sources = sorted(paragraph_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            if not sources:
+                continue
+            try:
+                paragraphs.append(json.loads(sources[-1].read_text(encoding="utf-8")))
+            except Exception as e:
+                print(f"Waarschuwing: Kon paragraaf bron {sources[-1]} niet lezen: {str(e)}")
+        if paragraphs:
+            yield _index_of(chapter_dir), paragraphs
+
+
+def _iter_archive_chapters(archive_path: Path) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """iter_chapters voor een BookArchive; afbeeldingen uit het archief gaan als bytes mee"""
+    archive = BookArchive(archive_path)
+    try:
+        paragraph_keys: Dict[int, List[int]] = {}
+        for entry in archive.entries():
+            if entry.kind == "source":
+                keys = paragraph_keys.setdefault(entry.chapter_index, [])
+                if entry.paragraph_index not in keys:
+                    keys.append(entry.paragraph_index)
+
+        for chapter_index in sorted(paragraph_keys):
+            paragraphs = []
+            for paragraph_index in sorted(paragraph_keys[chapter_index]):
+                sources = archive.read_paragraph(chapter_index, paragraph_index, kind="source")
+                try:
+                    record = json.loads(list(sources.values())[-1].decode("utf-8"))
+                except Exception as e:
+                    print(f"Waarschuwing: Kon paragraaf bron {chapter_index}.{paragraph_index} niet lezen: {str(e)}")
+                    continue
+                record["_archive_images"] = archive.read_paragraph(chapter_index, paragraph_index, kind="image")
+                paragraphs.append(record)
+            if paragraphs:
+                yield chapter_index, paragraphs
+    finally:
+        archive.close()
+
+
+def _record_images(record: Dict[str, Any]) -> List[Tuple[str, str, Callable[[], bytes]]]:
+    """
+    Afbeeldingen van een paragraaf als (sleutel, extensie, lader).
+    Bestanden op schijf (losse bestanden of blob store) en afbeeldingen uit
+    het archief worden op dezelfde manier aangeboden.
+    """
+    images = []
+    for image in record.get("images") or []:
+        local_path = image.get("local_path") if isinstance(image, dict) else None
+        if local_path and Path(local_path).exists():
+            path = Path(local_path)
+            images.append((str(path), path.suffix.lower(), path.read_bytes))
+    for name, data in (record.get("_archive_images") or {}).items():
+        images.append((f"archive:{name}", Path(name).suffix.lower(), lambda data=data: data))
+    return images
+
+
+def export_book(book_dir: str, book_title: str, export_format: str) -> str:
+    """
+    Bouw de boek export (draait in een worker proces).
+
+    Args:
+        book_dir: exports/<boek> map of BookArchive bestand met de paragraaf bronnen
+        book_title: Titel voor de metadata en de voorpagina
+        export_format: "pdf" of "epub"
+
+    Returns:
+        Pad naar het gemaakte bestand, of "" als er niets gemaakt kon worden
+    """
+    book_dir = Path(book_dir)
+    if book_dir.is_file():
+        # BookArchive: de export komt naast het archief
+        target = book_dir.with_suffix(f".{export_format}")
+    else:
+        target = book_dir / f"{book_dir.name}.{export_format}"
+    temp_target = target.with_name(target.name + ".tmp")
+
+    if export_format == "epub":
+        _write_epub(book_dir, book_title, temp_target)
+    elif export_format == "pdf":
+        if not HAS_REPORTLAB:
+            print("PDF export overgeslagen: reportlab is niet geïnstalleerd")
+            return ""
+        _write_pdf(book_dir, book_title, temp_target)
+    else:
+        return ""
+
+    temp_target.replace(target)  # Atomic Save
+    return str(target)
+
+
+class BookExporter:
+    """
+    Plant boek exports in een eigen proces pool.
+
+    schedule() wacht niet op het resultaat: de scraper gaat direct door met
+    het volgende boek terwijl de layout in een ander proces gebeurt.
+    wait() wacht (bij het afsluiten van de run) tot alle exports klaar zijn.
+    """
+
+    def __init__(self, export_format: str, max_workers: int = 1,
+                 on_done: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            export_format: "pdf" of "epub"
+            max_workers: Aantal export processen
+            on_done: Optionele callback (boektitel, pad of "" bij een fout)
+        """
+        self.export_format = export_format
+        self.max_workers = max(1, max_workers)
+        self.on_done = on_done
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: List[asyncio.Future] = []
+
+    def schedule(self, book_dir: Path, book_title: str):
+        """Start de export van een boek op de achtergrond"""
+        if self._pool is None:
+            # spawn: het worker proces erft geen browser- of event loop state
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, export_book, str(book_dir), book_title, self.export_format
+        )
+        future.add_done_callback(lambda f: self._finished(f, book_title))
+        self._pending.append(future)
+
+    def _finished(self, future: asyncio.Future, book_title: str):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error:
+            print(f"Fout bij {self.export_format.upper()} export van {book_title}: {str(error)}")
+        if self.on_done:
+            self.on_done(book_title, "" if error else future.result())
+
+    async def wait(self):
+        """Wacht tot alle geplande exports klaar zijn"""
+        pending, self._pending = self._pending, []
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def close(self):
+        """Wacht op lopende exports en stop de proces pool"""
+        await self.wait()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+# ---------------------------------------------------------------- EPUB
+
+def _xhtml_paragraphs(text: str) -> str:
+    return "\n".join(f"<p>{html.escape(line)}</p>" for line in text.splitlines() if line.strip())
+
+
+def _write_epub(book_dir: Path, book_title: str, target: Path):
+    """Schrijf een EPUB 3 bestand; elk hoofdstuk wordt direct in de zip gestreamd"""
+    book_id = f"urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, str(book_dir.resolve()))}"
+    chapters: List[Tuple[str, str]] = []  # (bestand, titel) voor navigatie en spine
+    images: List[Tuple[str, str]] = []  # (bestand, media type)
+    image_names: Dict[str, str] = {}
+
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as epub:
+        # mimetype moet als eerste en ongecomprimeerd
+        epub.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        epub.writestr("META-INF/container.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+            '</rootfiles></container>'
+        ))
+
+        for chapter_index, paragraphs in iter_chapters(book_dir):
+            body = [f"<h1>Hoofdstuk {chapter_index}</h1>"]
+            for record in paragraphs:
+                body.append(f"<h2>Paragraaf {chapter_index}.{record.get('paragraph_index', 0)}</h2>")
+                if record.get("objectives"):
+                    body.append("<h3>Leerdoelen</h3>")
+                    body.append(_xhtml_paragraphs(record["objectives"]))
+                if record.get("lesson"):
+                    body.append("<h3>Leerstof</h3>")
+                    body.append(_xhtml_paragraphs(record["lesson"]))
+                for key, suffix, load in _record_images(record):
+                    if key not in image_names:
+                        name = f"images/img{len(image_names) + 1}{suffix}"
+                        image_names[key] = name
+                        epub.writestr(f"OEBPS/{name}", load())
+                        images.append((name, _image_media_type(suffix)))
+                    body.append(f'<p><img src="{image_names[key]}" alt=""/></p>')
+
+            filename = f"chapter{chapter_index}.xhtml"
+            title = f"Hoofdstuk {chapter_index}"
+            epub.writestr(f"OEBPS/{filename}", _xhtml_document(title, "\n".join(body)))
+            chapters.append((filename, title))
+
+        nav_items = "\n".join(
+            f'<li><a href="{filename}">{html.escape(title)}</a></li>' for filename, title in chapters
+        )
+        epub.writestr("OEBPS/nav.xhtml", _xhtml_document(
+            "Inhoud",
+            f'<nav epub:type="toc" id="toc"><h1>Inhoud</h1><ol>{nav_items}</ol></nav>'
+        ))
+
+        manifest = ['<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>']
+        manifest += [
+            f'<item id="ch{i}" href="{filename}" media-type="application/xhtml+xml"/>'
+            for i, (filename, _) in enumerate(chapters, start=1)
+        ]
+        manifest += [
+            f'<item id="img{i}" href="{name}" media-type="{media_type}"/>'
+            for i, (name, media_type) in enumerate(images, start=1)
+        ]
+        spine = "".join(f'<itemref idref="ch{i}"/>' for i in range(1, len(chapters) + 1))
+        modified = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        epub.writestr("OEBPS/content.opf", (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<dc:identifier id="book-id">{book_id}</dc:identifier>'
+            f'<dc:title>{html.escape(book_title)}</dc:title>'
+            '<dc:language>nl</dc:language>'
+            f'<meta property="dcterms:modified">{modified}</meta>'
+            '</metadata>'
+            f'<manifest>{"".join(manifest)}</manifest>'
+            f'<spine>{spine}</spine>'
+            '</package>'
+        ))
+
+
+def _xhtml_document(title: str, body: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="nl">'
+        f'<head><title>{html.escape(title)}</title></head>'
+        f'<body>\n{body}\n</body></html>'
+    )
+
+
+def _image_media_type(suffix: str) -> str:
+    return {
+        ".png": "image/png",
+        ".gif": "image/gif",
+        ".svg": "image/svg+xml",
+        ".webp": "image/webp"
+    }.get(suffix, "image/jpeg")
+
+
+# ---------------------------------------------------------------- PDF
+
+class _ChapterFlowables(list):
+    """
+    Flowable lijst die zichzelf hoofdstuk voor hoofdstuk bijvult.
+
+    reportlab's build() werkt de lijst van voren af en vraagt telkens len();
+    door pas bij te vullen als de lijst leeg is, staat er nooit meer dan één
+    hoofdstuk aan flowables in het geheugen.
+    """
+
+    def __init__(self, chapters: Iterator[List[Any]]):
+        super().__init__()
+        self._chapters = chapters
+
+    def __len__(self):
+        while not list.__len__(self):
+            chapter = next(self._chapters, None)
+            if chapter is None:
+                break
+            self.extend(chapter)
+        return list.__len__(self)
+
+
+def _pdf_paragraphs(text: str, style) -> List[Any]:
+    return [Paragraph(html.escape(line), style) for line in text.splitlines() if line.strip()]
+
+
+def _write_pdf(book_dir: Path, book_title: str, target: Path):
+    """Schrijf een PDF met reportlab; hoofdstukken worden één voor één opgebouwd"""
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(str(target), pagesize=A4, title=book_title,
+                            leftMargin=2 * cm, rightMargin=2 * cm, topMargin=2 * cm, bottomMargin=2 * cm)
+    max_width = doc.width
+    max_height = doc.height * 0.6
+
+    def image_flowable(data: bytes):
+        width, height = ImageReader(io.BytesIO(data)).getSize()
+        scale = min(1.0, max_width / width, max_height / height)
+        return Image(io.BytesIO(data), width=width * scale, height=height * scale)
+
+    def chapters() -> Iterator[List[Any]]:
+        yield [Paragraph(html.escape(book_title), styles["Title"]), PageBreak()]
+        for chapter_index, paragraphs in iter_chapters(book_dir):
+            flowables: List[Any] = [Paragraph(f"Hoofdstuk {chapter_index}", styles["Heading1"])]
+            for record in paragraphs:
+                flowables.append(Paragraph(
+                    f"Paragraaf {chapter_index}.{record.get('paragraph_index', 0)}", styles["Heading2"]
+                ))
+                if record.get("objectives"):
+                    flowables.append(Paragraph("Leerdoelen", styles["Heading3"]))
+                    flowables += _pdf_paragraphs(record["objectives"], styles["BodyText"])
+                if record.get("lesson"):
+                    flowables.append(Paragraph("Leerstof", styles["Heading3"]))
+                    flowables += _pdf_paragraphs(record["lesson"], styles["BodyText"])
+                for key, _, load in _record_images(record):
+                    try:
+                        flowables.append(image_flowable(load()))
+                    except Exception as e:
+                        print(f"Waarschuwing: Afbeelding {key} overgeslagen: {str(e)}")
+                flowables.append(Spacer(1, 0.5 * cm))
+            flowables.append(PageBreak())
+            yield flowables
+
+    doc.build(_ChapterFlowables(chapters()))
@@ -0,0 +1,146 @@
+# storage/frontier.py
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# Item sleutel: (boek titel, hoofdstuk, paragraaf). Indices zijn 1-based;
+# 0 betekent "het hele item", dus (boek, 3, 0) is hoofdstuk 3 als geheel.
+FrontierKey = Tuple[str, int, int]
+
+DISCOVERED = "discovered"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlFrontier:
+    """
+    Duurzame crawl frontier voor hervatten na een crash.
+
+    Elk boek, hoofdstuk en paragraaf doorloopt discovered → in_flight →
+    done/failed, en elke overgang is één SQLite transactie. Items die bij
+    een crash nog in_flight waren worden bij het openen teruggezet, zodat
+    een herstart direct bij het eerste openstaande item verder kan.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Pad naar het SQLite bestand (wordt aangemaakt indien nodig)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                book TEXT NOT NULL,
+                chapter INTEGER NOT NULL,
+                paragraph INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (book, chapter, paragraph)
+            )
+        """)
+        self._conn.commit()
+        self.requeue_in_flight()
+
+    @classmethod
+    def for_config(cls, config) -> "CrawlFrontier":
+        """
+        Open de frontier die bij een configuratie hoort. Een andere start URL,
+        andere stappen of andere doelen krijgen een eigen frontier.
+        """
+        scope = {
+            "start_url": config.start_url,
+            "steps": [step.model_dump(mode="json") for step in config.login.login_steps],
+            "target": config.target.model_dump(mode="json"),
+            "ui_structure": config.ui_structure.model_dump(mode="json")
+        }
+        digest = hashlib.sha256(json.dumps(scope, sort_keys=True).encode()).hexdigest()[:16]
+        return cls(Path(config.output.output_dir) / "frontier" / f"{digest}.db")
+
+    def _set_state(self, key: FrontierKey, state: str, error: Optional[str] = None, attempt: bool = False):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO items (book, chapter, paragraph, state, attempts, last_error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (book, chapter, paragraph) DO UPDATE SET
+                    state = excluded.state,
+                    attempts = attempts + ?,
+                    last_error = COALESCE(excluded.last_error, last_error),
+                    updated_at = excluded.updated_at
+                """,
+                (*key, state, 1 if attempt else 0, error, datetime.now().isoformat(), 1 if attempt else 0)
+            )
+
+    def discover(self, keys: Iterable[FrontierKey]):
+        """Registreer nieuw gevonden items (bestaande items blijven ongewijzigd)"""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (book, chapter, paragraph, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(*key, DISCOVERED, now) for key in keys]
+            )
+
+    def start(self, key: FrontierKey):
+        """Markeer een item als in behandeling (telt als poging)"""
+        self._set_state(key, IN_FLIGHT, attempt=True)
+
+    def complete(self, key: FrontierKey):
+        """Markeer een item als voltooid"""
+        self._set_state(key, DONE)
+
+    def fail(self, key: FrontierKey, error: str):
+        """Markeer een item als mislukt met de laatste fout"""
+        self._set_state(key, FAILED, error=error)
+
+    def state(self, key: FrontierKey) -> Optional[str]:
+        """Huidige status van een item, of None als het onbekend is"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM items WHERE book = ? AND chapter = ? AND paragraph = ?", key
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_done(self, key: FrontierKey) -> bool:
+        """Check of een item al voltooid is"""
+        return self.state(key) == DONE
+
+    def pending(self, book: Optional[str] = None) -> List[FrontierKey]:
+        """Alle nog niet voltooide items, in crawl volgorde"""
+        query = "SELECT book, chapter, paragraph FROM items WHERE state != ?"
+        params: list = [DONE]
+        if book is not None:
+            query += " AND book = ?"
+            params.append(book)
+        query += " ORDER BY book, chapter, paragraph"
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(query, params).fetchall()]
+
+    def requeue_in_flight(self) -> int:
+        """Zet items die nog in behandeling waren terug naar discovered (na een crash)"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE items SET state = ?, updated_at = ? WHERE state = ?",
+                (DISCOVERED, datetime.now().isoformat(), IN_FLIGHT)
+            )
+        return cursor.rowcount
+
+    def reset(self):
+        """Vergeet alle voortgang (voor een volledig nieuwe crawl)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items")
+
+    def close(self):
+        """Sluit de database verbinding"""
+        with self._lock:
+            self._conn.close()
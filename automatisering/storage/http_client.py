@@ -0,0 +1,261 @@
+# storage/http_client.py
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+import aiofiles
+
+from config.config_manager import DownloadConfig
+
+# Geeft de browser cookies die voor een URL gelden (zoals BrowserContext.cookies)
+CookieProvider = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+# Levert een afbeelding die de browser al geladen heeft (None = zelf downloaden)
+CaptureProvider = Callable[[str], Awaitable[Optional["FetchResult"]]]
+
+# Voortgang van een download: (nieuwe bytes, totaal gedownload, verwachte grootte of None)
+ProgressCallback = Callable[[int, int, Optional[int]], None]
+
+# Statussen waarbij opnieuw proberen zinloos is
+NO_RETRY_STATUSES = (400, 401, 403, 404, 410)
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class FetchResult:
+    """Resultaat van een (conditionele) download"""
+    status: int
+    body: Optional[bytes]  # None bij 304 Not Modified
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def _expected_size(response: aiohttp.ClientResponse, offset: int) -> Optional[int]:
+    """Totale bestandsgrootte uit Content-Range (206) of Content-Length (200)"""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    if response.content_length is not None:
+        return offset + response.content_length
+    return None
+
+
+class HttpClient:
+    """
+    Eén gedeelde aiohttp sessie voor alle downloads van een run.
+
+    Verbindingen worden hergebruikt (keep-alive) en begrensd, in totaal en
+    per host. Via de cookie provider gaan de cookies van de ingelogde
+    browser context mee, zodat beveiligde afbeeldingen en video's werken.
+    """
+
+    def __init__(self, config: Optional[DownloadConfig] = None,
+                 cookie_provider: Optional[CookieProvider] = None):
+        """
+        Args:
+            config: Verbindingslimieten, timeouts en retry beleid
+            cookie_provider: Optionele async functie die de cookies voor een URL levert
+        """
+        self.config = config or DownloadConfig()
+        self.cookie_provider = cookie_provider
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Maak de sessie lazy aan binnen de draaiende event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                limit_per_host=self.config.max_connections_per_host,
+                keepalive_timeout=self.config.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.config.timeout,
+                                              sock_read=self.config.timeout),
+                # Cookies komen uit de browser, niet uit eerdere responses
+                cookie_jar=aiohttp.DummyCookieJar()
+            )
+        return self._session
+
+    async def _headers(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Bouw request headers, inclusief de browser cookies voor deze URL"""
+        result = dict(headers or {})
+        if self.cookie_provider and self.config.use_browser_cookies:
+            try:
+                cookies = await self.cookie_provider(url)
+                if cookies:
+                    result["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+            except Exception as e:
+                print(f"Waarschuwing: Kon browser cookies niet ophalen voor {url}: {str(e)}")
+        return result
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        Open een response zonder de body te lezen (één poging, zonder retry).
+        De verbinding gaat na afloop terug naar de pool.
+        """
+        session = self._get_session()
+        async with session.get(url, headers=await self._headers(url, headers)) as response:
+            yield response
+
+    async def get_bytes(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[bytes]:
+        """
+        Download een (kleine) resource volledig in het geheugen, met retry en
+        exponentiële backoff.
+
+        Returns:
+            De response body, of None als de download definitief mislukt is
+        """
+        result = await self.fetch(url, headers)
+        return result.body if result else None
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[FetchResult]:
+        """
+        Zoals get_bytes, maar met de validators van de response. Met etag
+        en/of last_modified wordt het een conditionele request: een 304 komt
+        terug als FetchResult zonder body.
+
+        Returns:
+            FetchResult, of None als de download definitief mislukt is
+        """
+        headers = dict(headers or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        retry_delay = self.config.retry_backoff
+        for attempt in range(self.config.max_retries):
+            try:
+                async with self.stream(url, headers) as response:
+                    if response.status in (200, 304):
+                        return FetchResult(
+                            status=response.status,
+                            body=await response.read() if response.status == 200 else None,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified")
+                        )
+                    if response.status in NO_RETRY_STATUSES:
+                        print(f"Download fout: Status {response.status} voor {url} (geen retry)")
+                        return None
+                    print(f"Download poging {attempt + 1} mislukt: Status {response.status} voor {url}")
+            except Exception as e:
+                print(f"Download poging {attempt + 1} fout voor {url}: {str(e)}")
+
+            if attempt < self.config.max_retries - 1:
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # Exponentiële backoff
+
+        print(f"Download definitief mislukt voor {url} na {self.config.max_retries} pogingen")
+        return None
+
+    async def download_to_file(self, url: str, dest: Path,
+                               on_progress: Optional[ProgressCallback] = None,
+                               chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> bool:
+        """
+        Stream een (grote) resource in chunks naar schijf, zonder de body in
+        het geheugen te houden.
+
+        Er wordt naar `<dest>.part` geschreven. Een bestaand part bestand
+        (van een afgebroken poging of run) wordt met een HTTP Range request
+        hervat; met If-Range valt de server terug op een volledige download
+        als het bestand intussen veranderd is. Pas als alles binnen is wordt
+        het part bestand atomair hernoemd naar `dest`.
+
+        Returns:
+            True als `dest` compleet is weggeschreven
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path = dest.with_name(dest.name + ".part")
+        meta_path = dest.with_name(dest.name + ".part.json")
+
+        retry_delay = self.config.retry_backoff
+        for attempt in range(self.config.max_retries):
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            meta = self._read_part_meta(meta_path) if offset else {}
+            headers = {}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                validator = meta.get("etag") or meta.get("last_modified")
+                if validator:
+                    headers["If-Range"] = validator
+
+            try:
+                async with self.stream(url, headers) as response:
+                    if response.status == 416 and offset:
+                        # Range voorbij het einde: het part bestand is al compleet (of ongeldig)
+                        if meta.get("total") != offset:
+                            part_path.unlink(missing_ok=True)
+                            continue
+                    elif response.status in NO_RETRY_STATUSES:
+                        print(f"Download fout: Status {response.status} voor {url} (geen retry)")
+                        return False
+                    elif response.status in (200, 206):
+                        resumed = response.status == 206
+                        downloaded = offset if resumed else 0
+                        total = _expected_size(response, downloaded)
+                        self._write_part_meta(meta_path, {
+                            "url": url,
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                            "total": total
+                        })
+
+                        # 200 op een Range request: server hervat niet, opnieuw beginnen
+                        async with aiofiles.open(part_path, "ab" if resumed else "wb") as f:
+                            async for chunk in response.content.iter_chunked(chunk_size):
+                                await f.write(chunk)
+                                downloaded += len(chunk)
+                                if on_progress:
+                                    on_progress(len(chunk), downloaded, total)
+
+                        if total is not None and downloaded < total:
+                            raise IOError(f"Onvolledige download ({downloaded}/{total} bytes)")
+                    else:
+                        raise IOError(f"Status {response.status}")
+
+                part_path.replace(dest)  # Atomic Save
+                meta_path.unlink(missing_ok=True)
+                return True
+
+            except Exception as e:
+                print(f"Download poging {attempt + 1} fout voor {url}: {str(e)}")
+
+            if attempt < self.config.max_retries - 1:
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # Exponentiële backoff
+
+        # Part bestand blijft staan zodat een volgende run kan hervatten
+        print(f"Download definitief mislukt voor {url} na {self.config.max_retries} pogingen")
+        return False
+
+    @staticmethod
+    def _read_part_meta(meta_path: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _write_part_meta(meta_path: Path, meta: Dict[str, Any]):
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    async def close(self):
+        """Sluit de sessie en alle open verbindingen"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
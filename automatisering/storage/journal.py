@@ -0,0 +1,84 @@
+# storage/journal.py
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal van alles wat een run opslaat.
+
+    Elke opgeslagen paragraaf of afbeelding is één regel; er wordt nooit
+    iets herschreven. Het manifest en de samenvatting worden er achteraf
+    uit opgebouwd (zie DataSaver.save_manifest), zodat geheugengebruik en
+    kosten per opslag constant blijven, ook bij duizenden paragrafen.
+    """
+
+    FILENAME = "journal.jsonl"
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Pad naar het journal bestand (wordt aangemaakt of aangevuld)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = None
+        self.counts: Dict[str, int] = {}
+
+        # Bij hervatten van een bestaande run tellen we verder waar we waren
+        for record in self.iter_records():
+            kind = record.get("kind", "")
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+        # Half geschreven laatste regel (crash): nieuwe records op een eigen regel beginnen
+        self._needs_newline = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as f:
+                f.seek(-1, 2)
+                self._needs_newline = f.read(1) != b"\n"
+
+    def append(self, kind: str, record: Dict[str, Any]):
+        """Voeg één record toe en flush direct (overleeft een crash)"""
+        line = json.dumps({"kind": kind, **record}, ensure_ascii=False)
+        with self._lock:
+            if self._file is None or self._file.closed:
+                self._file = open(self.path, "a", encoding="utf-8")
+            if self._needs_newline:
+                line = "\n" + line
+                self._needs_newline = False
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def count(self, kind: str) -> int:
+        """Aantal records van een soort"""
+        return self.counts.get(kind, 0)
+
+    def iter_records(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lees de records regel voor regel terug (zonder alles in het geheugen te laden).
+        Een half geschreven laatste regel na een crash wordt overgeslagen.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if kind is None or record.get("kind") == kind:
+                    yield record
+
+    def close(self):
+        """Sluit het journal bestand"""
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._file.close()
+            self._file = None
@@ -0,0 +1,158 @@
+# storage/media_scheduler.py
+import asyncio
+import heapq
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from storage.saver import DataSaver
+from utils.metrics import MetricsTracker
+
+# Query parameters waarmee players een byte range van hetzelfde bestand opvragen
+RANGE_QUERY_PARAMS = {"range", "bytes", "byterange"}
+
+PRIORITY_MEDIA = 0  # Echte media responses (video/audio element)
+PRIORITY_GUESSED = 1  # Herkend aan de extensie of URL
+
+
+def media_key(url: str) -> str:
+    """
+    Dedup sleutel voor een media URL: zonder fragment en zonder range
+    parameters, zodat losse range requests van één video één download zijn.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in RANGE_QUERY_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+@dataclass(order=True)
+class _MediaJob:
+    priority: int
+    seq: int
+    url: str = field(compare=False)
+    host: str = field(compare=False)
+    chapter_index: int = field(compare=False)
+    paragraph_index: int = field(compare=False)
+
+
+class MediaScheduler:
+    """
+    Begrensde planner voor media downloads (video's).
+
+    Elke URL wordt één keer gedownload, ook als de browser hem tientallen
+    keren (in ranges) opvraagt. Er lopen nooit meer dan max_concurrent
+    downloads tegelijk en niet meer dan max_per_host naar dezelfde host;
+    wachtende downloads gaan op prioriteit en daarna op volgorde van
+    aanmelding. drain() wacht bij het afsluiten tot alles klaar is.
+    """
+
+    def __init__(self, saver: DataSaver, metrics: Optional[MetricsTracker] = None,
+                 max_concurrent: int = 3, max_per_host: int = 2):
+        """
+        Args:
+            saver: DataSaver die de downloads uitvoert (save_media)
+            metrics: Optionele MetricsTracker voor wachtrij en doorvoer
+            max_concurrent: Maximaal aantal gelijktijdige downloads
+            max_per_host: Maximaal aantal gelijktijdige downloads per host
+        """
+        self.saver = saver
+        self.metrics = metrics
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_host = max(1, max_per_host)
+        self._queue: list = []
+        self._seen: Set[str] = set()
+        self._active: Dict[asyncio.Task, _MediaJob] = {}
+        self._host_active: Dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self._idle: Optional[asyncio.Event] = None
+
+    @property
+    def queued(self) -> int:
+        """Aantal downloads dat op een vrije plek wacht"""
+        return len(self._queue)
+
+    @property
+    def active(self) -> int:
+        """Aantal lopende downloads"""
+        return len(self._active)
+
+    def submit(self, url: str, chapter_index: int, paragraph_index: int,
+               priority: int = PRIORITY_GUESSED) -> bool:
+        """
+        Meld een media URL aan (vanuit de event loop).
+
+        Returns:
+            False als deze URL al eerder aangemeld is
+        """
+        key = media_key(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        self._idle.clear()
+
+        heapq.heappush(self._queue, _MediaJob(
+            priority, next(self._seq), url, urlsplit(url).netloc.lower(), chapter_index, paragraph_index
+        ))
+        self._pump()
+        return True
+
+    def _pump(self):
+        """Start wachtende downloads zolang er plek is (globaal en per host)"""
+        waiting = []
+        while self._queue and len(self._active) < self.max_concurrent:
+            job = heapq.heappop(self._queue)
+            if self._host_active[job.host] >= self.max_per_host:
+                waiting.append(job)
+                continue
+            self._start(job)
+        for job in waiting:
+            heapq.heappush(self._queue, job)
+
+        if self.metrics:
+            self.metrics.media_queue_changed(len(self._queue))
+        if not self._queue and not self._active and self._idle is not None:
+            self._idle.set()
+
+    def _start(self, job: _MediaJob):
+        self._host_active[job.host] += 1
+        task = asyncio.create_task(self.saver.save_media(
+            job.url, job.chapter_index, job.paragraph_index, metrics=self.metrics
+        ))
+        self._active[task] = job
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        job = self._active.pop(task)
+        self._host_active[job.host] -= 1
+        if not task.cancelled() and task.exception():
+            print(f"Fout bij media download {job.url}: {str(task.exception())}")
+        self._pump()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wacht tot alle aangemelde downloads klaar zijn.
+
+        Returns:
+            False als de timeout verstreek; openstaande downloads worden dan geannuleerd
+            (part bestanden blijven staan en worden een volgende keer hervat)
+        """
+        if self._idle is None or (not self._queue and not self._active):
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._queue.clear()
+            for task in list(self._active):
+                task.cancel()
+            if self._active:
+                await asyncio.gather(*self._active, return_exceptions=True)
+            if self.metrics:
+                self.metrics.media_queue_changed(0)
+            return False
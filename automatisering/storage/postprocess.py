@@ -0,0 +1,183 @@
+# storage/postprocess.py
+"""
+Batch nabewerking van geëxporteerde boeken tot één gestructureerde dataset.
+
+Welke paragrafen er zijn komt uit de voortgangsindex (alle export formaten
+en het archief backend); de tekst wordt in batches naar een proces pool
+gestuurd die normaliseert, structureert en statistieken berekent met de
+voorgecompileerde patronen van Extractor. Het resultaat is één JSONL
+bestand met een regel per paragraaf (zie ook `python -m storage postprocess`).
+"""
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from runner.extractor import Extractor
+from storage.archive import BookArchive, read_virtual_path
+from storage.progress_index import ProgressIndex
+from storage.search_index import parse_export
+
+DATASET_FILENAME = "dataset.jsonl"
+
+# Paragrafen per worker taak: groot genoeg om pickle/IPC overhead te
+# verdelen, klein genoeg om het geheugen per taak begrensd te houden
+DEFAULT_BATCH_SIZE = 64
+
+
+def iter_export_records(output_dir, book: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lees alle geëxporteerde paragrafen als records (boek, hoofdstuk, paragraaf,
+    pad, leerdoelen, leerstof, custom) in volgorde van de voortgangsindex.
+
+    Args:
+        output_dir: Output map van de scraper
+        book: Optioneel alleen dit boek (exacte titel)
+    """
+    output_dir = Path(output_dir)
+    progress = ProgressIndex.for_output_dir(output_dir)
+    archives: Dict[Path, BookArchive] = {}
+    try:
+        for book_title, chapter_index, paragraph_index, path in progress.iter_completed():
+            if not path or (book is not None and book_title != book):
+                continue
+            full_path = output_dir / path
+            try:
+                if full_path.exists():
+                    raw = full_path.read_bytes()
+                else:
+                    raw = read_virtual_path(output_dir, path, archives)
+                if raw is None:
+                    continue
+                objectives, lesson, custom = parse_export(raw.decode("utf-8"), full_path.suffix.lower())
+            except Exception as e:
+                print(f"Waarschuwing: Kon {path} niet inlezen: {str(e)}")
+                continue
+            yield {
+                "book": book_title,
+                "chapter_index": chapter_index,
+                "paragraph_index": paragraph_index,
+                "path": path,
+                "objectives": objectives,
+                "lesson": lesson,
+                "custom": custom,
+            }
+    finally:
+        progress.close()
+        for archive in archives.values():
+            archive.close()
+
+
+def process_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Nabewerking van één paragraaf record"""
+    lesson_raw = (record.get("lesson") or "").replace("\r\n", "\n").replace("\r", "\n")
+    objectives = Extractor.clean_text(record.get("objectives") or "")
+    lesson = Extractor.clean_text(lesson_raw)
+    return {
+        "book": record.get("book", ""),
+        "chapter_index": record.get("chapter_index", 0),
+        "paragraph_index": record.get("paragraph_index", 0),
+        "path": record.get("path", ""),
+        "content_type": Extractor.detect_content_type(lesson),
+        "objectives": objectives,
+        "lesson": lesson,
+        "custom": record.get("custom") or "",
+        # Structuur op de ruwe regels: clean_text voegt alles samen tot één regel
+        "structure": Extractor.extract_structured_content(lesson_raw),
+        "statistics": Extractor.calculate_statistics(lesson_raw),
+        "links": [link["url"] for link in Extractor.extract_links(lesson_raw)],
+    }
+
+
+def process_batch(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Verwerk een batch records (draait in een worker proces).
+
+    Returns:
+        JSONL regels, al geserialiseerd zodat het hoofdproces alleen schrijft
+    """
+    return [json.dumps(process_record(record), ensure_ascii=False) for record in records]
+
+
+def _batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def postprocess_records(records: Iterable[Dict[str, Any]], target: Path,
+                        max_workers: int = 0, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Verwerk een stroom records tot één JSONL dataset.
+
+    Er staan hooguit twee batches per worker tegelijk uit, zodat ook een
+    heel archief met begrensd geheugen verwerkt wordt; de volgorde van de
+    invoer blijft behouden.
+
+    Args:
+        records: Paragraaf records (zie iter_export_records)
+        target: Pad van het JSONL bestand (wordt atomair vervangen)
+        max_workers: Aantal processen; 0 = aantal CPU's, 1 = in dit proces
+        batch_size: Aantal records per worker taak
+
+    Returns:
+        Aantal geschreven paragrafen
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_target = target.with_name(target.name + ".tmp")
+    workers = max_workers or multiprocessing.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    count = 0
+
+    with open(temp_target, "w", encoding="utf-8") as f:
+        def write(lines: List[str]):
+            nonlocal count
+            for line in lines:
+                f.write(line + "\n")
+            count += len(lines)
+
+        if workers == 1:
+            for batch in _batches(records, batch_size):
+                write(process_batch(batch))
+        else:
+            # spawn: de workers erven geen browser- of event loop state
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                in_flight: Deque[Future] = deque()
+                for batch in _batches(records, batch_size):
+                    in_flight.append(pool.submit(process_batch, batch))
+                    if len(in_flight) >= workers * 2:
+                        write(in_flight.popleft().result())
+                while in_flight:
+                    write(in_flight.popleft().result())
+
+    temp_target.replace(target)  # Atomic Save
+    return count
+
+
+def postprocess_output(output_dir, book: Optional[str] = None, target: Optional[Path] = None,
+                       max_workers: int = 0, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Verwerk alle exports in een output map tot <output_dir>/dataset.jsonl.
+
+    Args:
+        output_dir: Output map van de scraper
+        book: Optioneel alleen dit boek
+        target: Ander doelbestand dan dataset.jsonl
+        max_workers: Aantal processen; 0 = aantal CPU's
+        batch_size: Aantal paragrafen per worker taak
+
+    Returns:
+        Aantal verwerkte paragrafen
+    """
+    target = Path(target) if target else Path(output_dir) / DATASET_FILENAME
+    return postprocess_records(iter_export_records(output_dir, book), target,
+                               max_workers=max_workers, batch_size=batch_size)
@@ -0,0 +1,194 @@
+# storage/progress_index.py
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+
+class ProgressIndex:
+    """
+    Gedeelde index van geëxporteerde paragrafen per boek.
+
+    Eén SQLite bestand in de output directory dat door meerdere runs en
+    worker processen tegelijk gebruikt kan worden (WAL mode), zodat een
+    verdeelde run dezelfde voortgang kent als een run in één proces.
+    """
+
+    FILENAME = "progress.db"
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Pad naar het SQLite bestand (wordt aangemaakt indien nodig)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS completed (
+                book_title TEXT NOT NULL,
+                chapter_index INTEGER NOT NULL,
+                paragraph_index INTEGER NOT NULL,
+                run_id TEXT,
+                path TEXT,
+                completed_at TEXT,
+                PRIMARY KEY (book_title, chapter_index, paragraph_index)
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        # Validators van eerder opgeslagen afbeeldingen (incrementele runs)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS image_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                path TEXT NOT NULL,
+                updated_at TEXT
+            )
+        """)
+        # Indexen van vóór de incrementele modus hebben nog geen digest kolom
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(completed)")]
+        if "digest" not in columns:
+            self._conn.execute("ALTER TABLE completed ADD COLUMN digest TEXT")
+        self._conn.commit()
+
+    @classmethod
+    def for_output_dir(cls, output_dir) -> "ProgressIndex":
+        """Open de index die bij een output directory hoort"""
+        return cls(Path(output_dir) / cls.FILENAME)
+
+    def mark_completed(self, book_title: str, chapter_index: int, paragraph_index: int,
+                       run_id: str = "", path: str = "", digest: Optional[str] = None):
+        """Registreer een geëxporteerde paragraaf (idempotent), optioneel met content digest"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completed "
+                "(book_title, chapter_index, paragraph_index, run_id, path, completed_at, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (book_title, chapter_index, paragraph_index, run_id, path, datetime.now().isoformat(), digest)
+            )
+
+    def get_digest(self, book_title: str, chapter_index: int, paragraph_index: int) -> Optional[str]:
+        """Content digest van de laatst geëxporteerde versie (None als onbekend)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM completed WHERE book_title = ? AND chapter_index = ? AND paragraph_index = ?",
+                (book_title, chapter_index, paragraph_index)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_image_validator(self, url: str) -> Optional[Dict[str, Any]]:
+        """ETag/Last-Modified en pad van een eerder opgeslagen afbeelding"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, path FROM image_validators WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "path": row[2]}
+
+    def set_image_validator(self, url: str, path: str, etag: Optional[str] = None,
+                            last_modified: Optional[str] = None):
+        """Registreer waar een afbeelding staat en met welke validators"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_validators VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, path, datetime.now().isoformat())
+            )
+
+    def is_completed(self, book_title: str, chapter_index: int, paragraph_index: int) -> bool:
+        """Check of een paragraaf al geëxporteerd is"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM completed WHERE book_title = ? AND chapter_index = ? AND paragraph_index = ?",
+                (book_title, chapter_index, paragraph_index)
+            ).fetchone()
+        return row is not None
+
+    def completed_items(self, book_title: str) -> Set[Tuple[int, int]]:
+        """Alle (chapter, paragraph) paren die voor een boek al geëxporteerd zijn"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chapter_index, paragraph_index FROM completed WHERE book_title = ?",
+                (book_title,)
+            ).fetchall()
+        return {(row[0], row[1]) for row in rows}
+
+    def iter_completed(self) -> Iterator[Tuple[str, int, int, str]]:
+        """Alle geëxporteerde paragrafen als (boek, hoofdstuk, paragraaf, pad)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT book_title, chapter_index, paragraph_index, path FROM completed "
+                "ORDER BY book_title, chapter_index, paragraph_index"
+            ).fetchall()
+        yield from rows
+
+    def count(self, book_title: Optional[str] = None) -> int:
+        """Aantal geëxporteerde paragrafen, optioneel voor één boek"""
+        with self._lock:
+            if book_title is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM completed").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM completed WHERE book_title = ?", (book_title,)
+                ).fetchone()
+        return row[0]
+
+    def import_manifests(self, runs_dir: Path) -> int:
+        """
+        Eenmalige import van manifesten uit runs van vóór de index.
+        Latere aanroepen doen niets, nieuwe exports komen via mark_completed binnen.
+
+        Returns:
+            Aantal geïmporteerde paragrafen (0 als de import al gedaan was)
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'manifests_imported'"
+            ).fetchone()
+        if done:
+            return 0
+
+        rows = []
+        runs_dir = Path(runs_dir)
+        manifest_files = runs_dir.glob("**/manifest.json") if runs_dir.exists() else []
+        for manifest_path in manifest_files:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                metadata = data.get("metadata", {})
+                book_title = metadata.get("book_title")
+                if not book_title:
+                    continue
+                for file_info in data.get("files", []):
+                    ch = file_info.get("chapter_index")
+                    pa = file_info.get("paragraph_index")
+                    if ch is not None and pa is not None:
+                        rows.append((file_info.get("book") or book_title, ch, pa, metadata.get("run_id", ""),
+                                     file_info.get("path", ""), file_info.get("timestamp", "")))
+            except Exception as e:
+                print(f"Waarschuwing: Kon manifest {manifest_path} niet importeren: {str(e)}")
+
+        with self._lock, self._conn:
+            # Bestaande (nieuwere) registraties niet overschrijven
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO completed "
+                "(book_title, chapter_index, paragraph_index, run_id, path, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('manifests_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+        return len(rows)
+
+    def close(self):
+        """Sluit de database verbinding"""
+        with self._lock:
+            self._conn.close()
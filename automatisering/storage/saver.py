@@ -1,8 +1,8 @@
 # storage/saver.py
+import csv
+import io
 import json
 import asyncio
-import aiohttp
-import httpx
 import aiofiles
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple, Set
@@ -12,27 +12,54 @@ import hashlib
 import glob
 from urllib.parse import urljoin, urlparse, urlsplit
 import mimetypes
+import threading
+import sqlite3
 
-from utils.helpers import sanitize_filename, generate_run_id, truncate_text
-from config.config_manager import OutputConfig
+from utils.helpers import sanitize_filename, generate_run_id, truncate_text, format_filename, content_digest
+from config.config_manager import OutputConfig, DownloadConfig, OutputBackend, TableFormat
+from storage.progress_index import ProgressIndex
+from storage.http_client import HttpClient, CookieProvider, CaptureProvider, FetchResult
+from storage.blob_store import BlobStore
+from storage.journal import RunJournal
+from storage.archive import BookArchive
+from storage.search_index import CUSTOM_SECTION, SearchIndex, custom_text
+from storage.book_export import BOOK_EXPORT_FORMATS
+from utils.metrics import MetricsTracker
+from utils.tracing import Tracer, traced
 
 class DataSaver:
     """Klasse voor het opslaan van gescrapede data en afbeeldingen"""
     
-    def __init__(self, output_config: OutputConfig, run_id: Optional[str] = None):
+    def __init__(self, output_config: OutputConfig, run_id: Optional[str] = None,
+                 download_config: Optional[DownloadConfig] = None,
+                 cookie_provider: Optional[CookieProvider] = None,
+                 capture_provider: Optional[CaptureProvider] = None,
+                 tracer: Optional[Tracer] = None):
         """
         Initialiseer DataSaver met output configuratie.
         
         Args:
             output_config: Configuratie voor output (output_dir, filename_template, etc.)
             run_id: Optionele run ID, anders wordt er een gegenereerd
+            download_config: Verbindingslimieten en retry beleid voor downloads
+            cookie_provider: Optionele async functie die browser cookies voor een URL levert
+            capture_provider: Optionele async functie die door de browser geladen afbeeldingen levert
+            tracer: Optionele Tracer voor spans rond het wegschrijven en downloaden
         """
         self.output_config = output_config
         self.run_id = run_id or generate_run_id()
         
-        # Data tracking voor manifest
-        self.files_data: List[Dict[str, Any]] = []
-        self.images_data: List[Dict[str, Any]] = []
+        # Eén archief per boek i.p.v. losse bestanden (zie BookArchive)
+        self.use_archive = output_config.output_backend == OutputBackend.SQLITE
+        self.archives: Dict[str, BookArchive] = {}
+        self._archives_lock = threading.Lock()
+        
+        # Eén gedeelde HTTP client voor alle afbeeldingen en media van deze run
+        self.http = HttpClient(download_config, cookie_provider)
+        self.capture_provider = capture_provider
+        self.tracer = tracer or Tracer()
+        
+        # Data tracking voor manifest (zie RunJournal, niets in het geheugen)
         self.completed_items: Set[Tuple[int, int]] = set() # (chapter, paragraph)
         self.metadata: Dict[str, Any] = {
             "run_id": self.run_id,
@@ -43,38 +70,69 @@ class DataSaver:
         # Setup directory structuur
         self.setup_directories()
         
+        # Append-only journal; manifest en samenvatting worden hieruit gecompacteerd
+        self.journal = RunJournal(self.run_dir / RunJournal.FILENAME)
+        
+        # SQLite indexen (zie de properties): close() sluit ze, het eerste gebruik
+        # daarna opent ze opnieuw zodat de saver bruikbaar blijft
+        self._indexes_lock = threading.Lock()
+        self._progress_index: Optional[ProgressIndex] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._search_index_unavailable = False
+        self._blob_store: Optional[BlobStore] = None
+        self._open_indexes()
+        
+    def _open_indexes(self):
+        """Open de SQLite indexen die nog niet (of na close() niet meer) open zijn"""
+        with self._indexes_lock:
+            # Gedeelde voortgangsindex (ook gebruikt door parallelle worker processen)
+            if self._progress_index is None:
+                self._progress_index = ProgressIndex.for_output_dir(self.output_dir)
+            
+            # Full-text zoekindex over alle boeken in deze output directory
+            if self._search_index is None and self.output_config.search_index and not self._search_index_unavailable:
+                try:
+                    self._search_index = SearchIndex.for_output_dir(self.output_dir)
+                except sqlite3.OperationalError as e:
+                    self._search_index_unavailable = True
+                    print(f"Waarschuwing: Zoekindex niet beschikbaar (SQLite zonder FTS5?): {str(e)}")
+            
+            # Content-addressed afbeeldingen, gedeeld door alle paragrafen en runs
+            if self._blob_store is None and self.output_config.dedupe_images:
+                self._blob_store = BlobStore.for_output_dir(self.output_dir)
+
+    @property
+    def progress_index(self) -> ProgressIndex:
+        if self._progress_index is None:
+            self._open_indexes()
+        return self._progress_index
+
+    @property
+    def search_index(self) -> Optional[SearchIndex]:
+        if self._search_index is None:
+            self._open_indexes()
+        return self._search_index
+
+    @property
+    def blob_store(self) -> Optional[BlobStore]:
+        if self._blob_store is None:
+            self._open_indexes()
+        return self._blob_store
+
     def load_existing_progress(self, book_title: str):
         """
-        Zoek naar bestaande manifesten voor dit boek en laad wat al is gedaan.
+        Laad wat er voor dit boek al geëxporteerd is uit de voortgangsindex.
         Dit zorgt ervoor dat we kunnen hervatten waar we gebleven waren.
+        Manifesten van oudere runs worden de eerste keer eenmalig geïmporteerd.
         """
-        self.completed_items.clear()
+        imported = self.progress_index.import_manifests(Path(self.output_config.output_dir) / "runs")
+        if imported:
+            print(f"Voortgangsindex: {imported} items uit bestaande manifesten geïmporteerd")
         
-        # Zoek alle manifest bestanden in de runs directory
-        runs_dir = Path(self.output_config.output_dir) / "runs"
-        if not runs_dir.exists():
-            return
-
-        manifest_files = list(runs_dir.glob("**/manifest.json"))
+        self.completed_items = self.progress_index.completed_items(book_title)
         
-        found_count = 0
-        for manifest_path in manifest_files:
-            try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Check of dit manifest voor hetzelfde boek is
-                    if data.get("metadata", {}).get("book_title") == book_title:
-                        for file_info in data.get("files", []):
-                            ch = file_info.get("chapter_index")
-                            pa = file_info.get("paragraph_index")
-                            if ch is not None and pa is not None:
-                                self.completed_items.add((ch, pa))
-                                found_count += 1
-            except Exception as e:
-                print(f"Waarschuwing: Kon manifest {manifest_path} niet laden voor resume: {str(e)}")
-        
-        if found_count > 0:
-            print(f"Hervatten: {found_count} reeds geëxporteerde items gevonden voor '{book_title}'")
+        if self.completed_items:
+            print(f"Hervatten: {len(self.completed_items)} reeds geëxporteerde items gevonden voor '{book_title}'")
 
     def is_completed(self, chapter_index: int, paragraph_index: int) -> bool:
         """Check of een item al is geëxporteerd"""
@@ -88,7 +146,8 @@ class DataSaver:
         
         # Georganiseerde export directory
         self.export_dir = self.output_dir / "exports" / sanitize_filename(book_title)
-        self.export_dir.mkdir(parents=True, exist_ok=True)
+        if not self.use_archive:
+            self.export_dir.mkdir(parents=True, exist_ok=True)
         
         # Run directory (voor metadata en screenshots)
         self.run_dir = self.output_dir / "runs" / self.run_id
@@ -105,6 +164,43 @@ class DataSaver:
         # Sla ook de boektitel op in metadata voor latere herkenning
         self.metadata["book_title"] = book_title
         
+    def book_dir(self, book_title: str) -> Path:
+        """Export directory van een boek: exports/<boek>/"""
+        return self.output_dir / "exports" / sanitize_filename(book_title or "unknown_book")
+
+    def archive_for(self, book_title: str) -> BookArchive:
+        """Open (eenmalig) het archief van een boek"""
+        key = book_title or "unknown_book"
+        with self._archives_lock:
+            if key not in self.archives:
+                self.archives[key] = BookArchive.for_book(self.output_dir, key)
+            return self.archives[key]
+
+    def _stored_file_exists(self, path: str) -> bool:
+        """Bestaat een eerder opgeslagen bestand nog (op schijf of in een archief)"""
+        if Path(path).exists():
+            return True
+        if self.use_archive:
+            return self.archive_for(self.metadata.get("book_title", "")).has_path(path)
+        return False
+
+    def is_unchanged(self, data: Dict[str, Any]) -> bool:
+        """
+        Incrementele modus: is de inhoud van deze paragraaf gelijk aan de
+        laatst geëxporteerde versie? Dan hoeft er niets herschreven te worden.
+        """
+        book_title = data.get("book") or self.metadata.get("book_title", "")
+        stored = self.progress_index.get_digest(
+            book_title, data.get("chapter_index", 0), data.get("paragraph_index", 0)
+        )
+        return stored is not None and stored == content_digest(data)
+
+    def book_export_source(self, book_title: str) -> Path:
+        """Waar de boek export zijn paragrafen vandaan haalt: archief of map"""
+        if self.use_archive:
+            return self.archive_for(book_title).path
+        return self.book_dir(book_title)
+
     def _compute_config_hash(self, config) -> str:
         """Bereken hash van configuratie voor tracking"""
         if hasattr(config, 'model_dump'):
@@ -131,45 +227,83 @@ class DataSaver:
     async def save_data(self, data: Dict[str, Any]) -> str:
         """
         Sla tekstdata op voor een paragraaf in een georganiseerde mappenstructuur.
+        Het schrijven gebeurt in een worker thread (zie write_data).
+        """
+        return await asyncio.to_thread(self.write_data, data)
+    
+    @traced("write_data", "storage", chapter="data.chapter_index", paragraph="data.paragraph_index")
+    def write_data(self, data: Dict[str, Any]) -> str:
+        """
+        Synchrone variant van save_data, voor de write-behind queue.
+        Het boek komt uit de data zelf, zodat records die nog in de wachtrij
+        staan bij het juiste boek terechtkomen als er intussen een nieuw boek
+        geselecteerd is.
         """
         try:
+            book_title = data.get("book") or self.metadata.get("book_title", "")
+            export_dir = self.book_dir(book_title)
+            
             # Bepaal mappenstructuur: exports/BookTitle/Chapter X/Paragraph Y/
             chapter_name = f"Chapter {data.get('chapter_index', 0)}"
             paragraph_name = f"Paragraph {data.get('paragraph_index', 0)}"
             
-            para_dir = self.export_dir / chapter_name / paragraph_name
-            para_dir.mkdir(parents=True, exist_ok=True)
+            para_dir = export_dir / chapter_name / paragraph_name
+            if not self.use_archive:
+                para_dir.mkdir(parents=True, exist_ok=True)
             
             # Bestandsnaam voor de tekst
+            # Bij pdf/epub is dit een JSON bron; het boek zelf wordt achteraf
+            # in één keer opgebouwd (zie storage/book_export.py)
             ext = ".txt"
             if self.output_config.export_format == "md":
                 ext = ".md"
-            elif self.output_config.export_format == "pdf":
-                ext = ".pdf"
-            elif self.output_config.export_format == "epub":
-                ext = ".epub"
+            elif self.output_config.export_format in BOOK_EXPORT_FORMATS:
+                ext = ".json"
                 
-            filename = self.output_config.filename_template.format(
+            filename = format_filename(
+                self.output_config.filename_template,
+                book=book_title,
+                chapter_index=data.get('chapter_index', 0),
+                paragraph_index=data.get('paragraph_index', 0),
                 chapter=data.get('chapter_index', 0),
                 paragraph=data.get('paragraph_index', 0),
+                label=data.get('label', ""),
+                run_id=self.run_id,
                 timestamp=datetime.now().strftime("%H%M%S")
-            ) + ext
-            
-            filepath = para_dir / filename
-            temp_filepath = filepath.with_suffix(".tmp")
+            )
+            # Het template mag zelf een extensie bevatten; het export formaat bepaalt de echte
+            if Path(filename).suffix.lower() in (".txt", ".md", ".json", ".pdf", ".epub"):
+                filename = filename[:-len(Path(filename).suffix)]
+            filename += ext
             
             # Formatteer inhoud volgens blueprint
             content = self._format_content(data)
             
-            # Gebruik aiofiles voor asynchrone write naar temp bestand
-            async with aiofiles.open(temp_filepath, 'w', encoding='utf-8') as f:
-                await f.write(content)
+            if self.use_archive:
+                filepath = self.archive_for(book_title).put(
+                    data.get('chapter_index', 0),
+                    data.get('paragraph_index', 0),
+                    filename,
+                    content.encode('utf-8'),
+                    kind="source" if ext == ".json" else "text"
+                )
+            else:
+                filepath = para_dir / filename
+                temp_filepath = filepath.with_suffix(".tmp")
+                
+                # Schrijf naar temp bestand
+                with open(temp_filepath, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                
+                # Rename temp bestand naar definitief bestand (Atomic Save)
+                temp_filepath.replace(filepath)
             
-            # Rename temp bestand naar definitief bestand (Atomic Save)
-            temp_filepath.replace(filepath)
+            # Tabellen uit 'Tabel' velden naast de paragraaf export
+            table_paths = self._write_tables(book_title, data, para_dir, Path(filename).stem)
             
             # Track voor manifest (beperk geheugengebruik bij HEEL VEEL data)
             file_info = {
+                "book": book_title,
                 "path": str(filepath.relative_to(self.output_dir)),
                 "chapter_index": data.get('chapter_index', 0),
                 "paragraph_index": data.get('paragraph_index', 0),
@@ -179,11 +313,27 @@ class DataSaver:
                 "url": data.get("url", ""),
                 "filename": filename
             }
-            self.files_data.append(file_info)
-            
-            # Periodiek manifest opslaan om geheugen te sparen en data veilig te stellen
-            if len(self.files_data) % 50 == 0:
-                await self.save_manifest()
+            if table_paths:
+                file_info["tables"] = table_paths
+            self.journal.append("file", file_info)
+            self.progress_index.mark_completed(
+                book_title,
+                file_info["chapter_index"],
+                file_info["paragraph_index"],
+                run_id=self.run_id,
+                path=file_info["path"],
+                digest=content_digest(data)
+            )
+            if self.search_index:
+                self.search_index.add(
+                    book_title,
+                    file_info["chapter_index"],
+                    file_info["paragraph_index"],
+                    data.get("objectives", ""),
+                    data.get("lesson", ""),
+                    data.get("custom_data"),
+                    path=file_info["path"]
+                )
             
             return str(filepath)
             
@@ -191,22 +341,94 @@ class DataSaver:
             print(f"Fout bij opslaan data: {str(e)}")
             return ""
 
+    def _write_tables(self, book_title: str, data: Dict[str, Any], para_dir: Path, stem: str) -> List[str]:
+        """
+        Schrijf de tabellen van een paragraaf als CSV of JSONL, één bestand per veld
+        (<export naam>_<veld>.csv) naast de paragraaf export.
+
+        Returns:
+            Paden van de geschreven tabellen, relatief aan de output directory
+        """
+        paths = []
+        table_format = TableFormat(self.output_config.table_format).value
+        for name, table in (data.get("tables") or {}).items():
+            rows = (table or {}).get("rows") or []
+            if not rows:
+                continue
+            filename = f"{stem}_{sanitize_filename(name)}.{table_format}"
+            content = self._format_table(rows, bool(table.get("header")), table_format)
+            try:
+                if self.use_archive:
+                    filepath = self.archive_for(book_title).put(
+                        data.get('chapter_index', 0),
+                        data.get('paragraph_index', 0),
+                        filename,
+                        content.encode('utf-8'),
+                        kind="table"
+                    )
+                else:
+                    filepath = para_dir / filename
+                    temp_filepath = filepath.with_suffix(".tmp")
+                    with open(temp_filepath, 'w', encoding='utf-8', newline='') as f:
+                        f.write(content)
+                    temp_filepath.replace(filepath)
+                paths.append(str(filepath.relative_to(self.output_dir)))
+            except Exception as e:
+                print(f"Fout bij opslaan tabel '{name}': {str(e)}")
+        return paths
+
+    def _format_table(self, rows: List[List[str]], header: bool, table_format: str) -> str:
+        """
+        Formatteer een tabel grid. JSONL krijgt bij een kopregel één object per
+        rij (lege of dubbele kolomnamen worden aangevuld), anders één lijst per rij.
+        """
+        if table_format == TableFormat.JSONL.value:
+            if header and len(rows) > 1:
+                keys = []
+                for idx, key in enumerate(rows[0], start=1):
+                    key = key or f"kolom_{idx}"
+                    while key in keys:
+                        key = f"{key}_{idx}"
+                    keys.append(key)
+                lines = [json.dumps(dict(zip(keys, row)), ensure_ascii=False) for row in rows[1:]]
+            else:
+                lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+            return "\n".join(lines) + "\n"
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
     def _format_content(self, data: Dict[str, Any]) -> str:
         """Formatteer inhoud volgens het gespecificeerde formaat"""
         export_format = self.output_config.export_format
         
         if export_format == "md":
             return self._format_markdown(data)
-        elif export_format == "pdf":
-            # Voor PDF genereren we voorlopig een rijke tekst representatie
-            # Echte PDF conversie vereist reportlab/weasyprint
-            return self._format_text(data)
-        elif export_format == "epub":
-            # Voor ePub genereren we voorlopig een XHTML-achtige structuur
-            return self._format_markdown(data)
+        elif export_format in BOOK_EXPORT_FORMATS:
+            return self._format_source(data)
         else:
             return self._format_text(data)
 
+    def _format_source(self, data: Dict[str, Any]) -> str:
+        """Gestructureerde JSON bron voor de boek export (pdf/epub)"""
+        source = {
+            "book": data.get("book", ""),
+            "chapter_index": data.get("chapter_index", 0),
+            "paragraph_index": data.get("paragraph_index", 0),
+            "label": data.get("label", ""),
+            "objectives": data.get("objectives", ""),
+            "lesson": data.get("lesson", ""),
+            "images": [
+                {"src": img.get("src", ""), "local_path": img.get("local_path", "")}
+                for img in data.get("images") or [] if isinstance(img, dict)
+            ],
+            "url": data.get("url", ""),
+            "timestamp": data.get("timestamp", datetime.now().isoformat()),
+            "run_id": self.run_id
+        }
+        return json.dumps(source, ensure_ascii=False, indent=2)
+
     def _format_text(self, data: Dict[str, Any]) -> str:
         """Formatteer als platte tekst"""
         lines = []
@@ -229,20 +451,35 @@ class DataSaver:
         lines.append(data.get("lesson", "(Geen leerstof gevonden)"))
         lines.append("")
         lines.append("-" * 40)
+        if data.get("custom_data"):
+            # Ook nodig om de zoekindex uit de exports te kunnen herbouwen
+            lines.append(f"{CUSTOM_SECTION}:")
+            lines.append("")
+            lines.append(custom_text(data["custom_data"]))
+            lines.append("")
+            lines.append("-" * 40)
         lines.append(f"Source URL: {data.get('url', '')}")
         lines.append(f"Run ID: {self.run_id}")
         return "\n".join(lines)
 
-    async def save_media(self, url: str, chapter_idx: int, para_idx: int) -> Optional[str]:
+    @traced("save_media", "storage", chapter="chapter_idx", paragraph="para_idx", url="url")
+    async def save_media(self, url: str, chapter_idx: int, para_idx: int,
+                         metrics: Optional[MetricsTracker] = None) -> Optional[str]:
         """
         Download en bewaar media (afbeelding/video) voor een specifieke paragraaf.
+        De download wordt naar schijf gestreamd en hervat een eerder afgebroken poging.
+        
+        Args:
+            url: Media URL
+            chapter_idx: Hoofdstuk index
+            para_idx: Paragraaf index
+            metrics: Optionele MetricsTracker voor voortgang (bytes, actieve downloads)
         """
         try:
             # Bepaal mappenstructuur
             chapter_name = f"Chapter {chapter_idx}"
             paragraph_name = f"Paragraph {para_idx}"
             media_dir = self.export_dir / chapter_name / paragraph_name / "media"
-            media_dir.mkdir(parents=True, exist_ok=True)
             
             # Extraheer bestandsnaam uit URL
             parsed_url = urlsplit(url)
@@ -252,16 +489,42 @@ class DataSaver:
                 ext = ".mp4" if "video" in url.lower() else ".png"
                 filename = f"media_{hashlib.md5(url.encode()).hexdigest()[:8]}{ext}"
             
+            archive = None
+            if self.use_archive:
+                # Eerst naar een staging bestand (hervatbaar), daarna het archief in
+                archive = self.archive_for(self.metadata.get("book_title", ""))
+                if archive.has(chapter_idx, para_idx, f"media/{filename}"):
+                    return str(archive.virtual_path(chapter_idx, para_idx, f"media/{filename}").relative_to(self.output_dir))
+                media_dir = self.run_dir / "media_staging" / chapter_name / paragraph_name
+            media_dir.mkdir(parents=True, exist_ok=True)
+            
             filepath = media_dir / filename
+            if filepath.exists() and archive is None:
+                # Al eerder volledig binnengehaald
+                return str(filepath.relative_to(self.output_dir))
             
-            # Download via httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=30.0)
-                if response.status_code == 200:
-                    async with aiofiles.open(filepath, mode='wb') as f:
-                        await f.write(response.content)
-                    return str(filepath.relative_to(self.output_dir))
-                    
+            # Stream via de gedeelde HTTP client
+            on_progress = None
+            if metrics:
+                metrics.media_started()
+                on_progress = lambda nbytes, downloaded, total: metrics.media_progress(nbytes)
+            
+            success = False
+            try:
+                success = filepath.exists() or await self.http.download_to_file(url, filepath, on_progress=on_progress)
+            finally:
+                # Ook bij annuleren (drain timeout) de actieve teller weer verlagen
+                if metrics:
+                    metrics.media_finished(success)
+            
+            if success and archive is not None:
+                stored = await asyncio.to_thread(
+                    archive.put_file, chapter_idx, para_idx, f"media/{filename}", filepath, "media"
+                )
+                filepath.unlink(missing_ok=True)
+                return str(stored.relative_to(self.output_dir))
+            if success:
+                return str(filepath.relative_to(self.output_dir))
             return None
         except Exception as e:
             print(f"Fout bij downloaden media: {str(e)}")
@@ -289,6 +552,12 @@ class DataSaver:
             lines.append(data.get("lesson", ""))
             lines.append("")
             
+        # Custom velden (Point-and-Click Scraper)
+        if data.get("custom_data"):
+            lines.append(f"### {CUSTOM_SECTION}")
+            lines.append(custom_text(data["custom_data"]))
+            lines.append("")
+            
         # Afbeeldingen referentie
         images = data.get("images", [])
         if images:
@@ -299,6 +568,7 @@ class DataSaver:
             
         return "\n".join(lines)
 
+    @traced("save_image", "storage", chapter="chapter_index", paragraph="paragraph_index", url="image_url")
     async def save_image(self, image_url: str, chapter_index: int, 
                         paragraph_index: int, image_index: int) -> Optional[Path]:
         """
@@ -306,30 +576,64 @@ class DataSaver:
         """
         if not self.output_config.save_images:
             return None
+        
+        if self.blob_store:
+            return await self._save_image_blob(image_url, chapter_index, paragraph_index, image_index)
             
         try:
             # Bepaal map: exports/BookTitle/Chapter X/Paragraph Y/images/
             chapter_name = f"Chapter {chapter_index}"
             paragraph_name = f"Paragraph {paragraph_index}"
             img_dir = self.export_dir / chapter_name / paragraph_name / "images"
-            img_dir.mkdir(parents=True, exist_ok=True)
             
             # Genereer bestandsnaam
             filename = self._generate_image_filename(
                 chapter_index, paragraph_index, image_index, image_url
             )
-            filepath = img_dir / filename
             
-            # Download afbeelding
-            image_data = await self._download_image(image_url)
+            # Haal de afbeelding op: uit de browser, of via een (conditionele) download.
+            # Incrementeel: alleen opnieuw wegschrijven als URL of ETag veranderd is.
+            incremental = self.output_config.incremental and not image_url.startswith('data:')
+            known = self.progress_index.get_image_validator(image_url) if incremental else None
+            if known and not self._stored_file_exists(known["path"]):
+                known = None
+            if known and not (known["etag"] or known["last_modified"]):
+                return Path(known["path"])  # Zelfde URL, geen validators: niet opnieuw ophalen
+            
+            result = await self._captured_image(image_url)
+            if result and known and known["etag"] and result.etag == known["etag"]:
+                return Path(known["path"])
+            if result is None and incremental:
+                result = await self.http.fetch(
+                    image_url,
+                    etag=known["etag"] if known else None,
+                    last_modified=known["last_modified"] if known else None
+                )
+                if result and result.not_modified:
+                    return Path(known["path"])
+            
+            if result is not None:
+                image_data = result.body
+                validators = {"etag": result.etag, "last_modified": result.last_modified}
+            else:
+                image_data = None if incremental else await self._download_image(image_url)
+                validators = {}
             if not image_data:
                 return None
             
-            async with aiofiles.open(filepath, 'wb') as f:
-                await f.write(image_data)
+            if self.use_archive:
+                archive = self.archive_for(self.metadata.get("book_title", ""))
+                filepath = await asyncio.to_thread(
+                    archive.put, chapter_index, paragraph_index, f"images/{filename}", image_data, "image"
+                )
+            else:
+                img_dir.mkdir(parents=True, exist_ok=True)
+                filepath = img_dir / filename
+                async with aiofiles.open(filepath, 'wb') as f:
+                    await f.write(image_data)
                 
             # Track voor manifest
-            self.images_data.append({
+            self.journal.append("image", {
                 "path": str(filepath.relative_to(self.output_dir)),
                 "url": image_url,
                 "chapter_index": chapter_index,
@@ -338,6 +642,8 @@ class DataSaver:
                 "size_bytes": len(image_data),
                 "filename": filename
             })
+            if self.output_config.incremental and not image_url.startswith('data:'):
+                self.progress_index.set_image_validator(image_url, str(filepath), **validators)
             
             return filepath
             
@@ -345,6 +651,52 @@ class DataSaver:
             print(f"Fout bij opslaan afbeelding: {str(e)}")
             return None
     
+    async def _save_image_blob(self, image_url: str, chapter_index: int,
+                               paragraph_index: int, image_index: int) -> Optional[Path]:
+        """
+        Sla een afbeelding op in de blob store. Een eerder geziene URL wordt
+        niet opnieuw gedownload; het manifest verwijst alleen naar de hash.
+        """
+        try:
+            is_data_uri = image_url.startswith('data:')
+            ref = None if is_data_uri else self.blob_store.lookup_url(image_url)
+            reused = ref is not None
+            
+            if ref is None:
+                captured = await self._captured_image(image_url)
+                image_data = captured.body if captured else await self._download_image(image_url)
+                if not image_data:
+                    return None
+                if is_data_uri:
+                    mime_type = image_url[5:].split(';', 1)[0].split(',', 1)[0]
+                    ext = mimetypes.guess_extension(mime_type) or ""
+                else:
+                    ext = Path(urlparse(image_url).path).suffix.lower()
+                if len(ext) > 5:
+                    ext = ""
+                ext = ext or ".jpg"
+                ref = await asyncio.to_thread(
+                    self.blob_store.put, image_data, ext, None if is_data_uri else image_url
+                )
+            
+            # Track voor manifest: alleen een verwijzing naar de blob
+            self.journal.append("image", {
+                "blob": ref.digest,
+                "path": str(ref.path.relative_to(self.output_dir)),
+                "url": image_url if not is_data_uri else "data:",
+                "chapter_index": chapter_index,
+                "paragraph_index": paragraph_index,
+                "image_index": image_index,
+                "size_bytes": ref.size,
+                "reused": reused
+            })
+            
+            return ref.path
+            
+        except Exception as e:
+            print(f"Fout bij opslaan afbeelding in blob store: {str(e)}")
+            return None
+    
     def _generate_image_filename(self, chapter_index: int, paragraph_index: int,
                                 image_index: int, image_url: str) -> str:
         """Genereer bestandsnaam voor afbeelding volgens specificatie"""
@@ -368,6 +720,16 @@ class DataSaver:
         # Sanitize
         return sanitize_filename(filename)
     
+    async def _captured_image(self, url: str) -> Optional[FetchResult]:
+        """Afbeelding die de browser al geladen heeft (None als er geen capture is)"""
+        if not self.capture_provider or url.startswith('data:'):
+            return None
+        try:
+            return await self.capture_provider(url)
+        except Exception as e:
+            print(f"Waarschuwing: Browser capture mislukt voor {url}: {str(e)}")
+            return None
+
     async def _download_image(self, url: str) -> Optional[bytes]:
         """Download afbeelding van URL of data URI met retry logica"""
         try:
@@ -375,35 +737,27 @@ class DataSaver:
             if url.startswith('data:'):
                 return self._extract_data_uri(url)
 
-            # Download van HTTP/HTTPS met retry logica
-            max_retries = 3
-            retry_delay = 2  # seconden
-
-            for attempt in range(max_retries):
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, timeout=10) as response:
-                            if response.status == 200:
-                                return await response.read()
-                            elif response.status in [404, 403]:  # Niet gevonden of geen toegang, stop direct
-                                print(f"Download fout: Status {response.status} voor {url} (geen retry)")
-                                return None
-                            else:
-                                print(f"Download poging {attempt + 1} mislukt: Status {response.status} voor {url}")
-                except Exception as e:
-                    print(f"Download poging {attempt + 1} fout voor {url}: {str(e)}")
-                
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Exponentiële backoff
-
-            print(f"Download definitief mislukt voor {url} na {max_retries} pogingen")
-            return None
+            # Download van HTTP/HTTPS via de gedeelde client (met retry logica)
+            return await self.http.get_bytes(url)
 
         except Exception as e:
             print(f"Download fout voor {url}: {str(e)}")
             return None
     
+    async def close(self):
+        """Sluit open netwerkverbindingen, bestanden en databases (de saver blijft daarna bruikbaar)"""
+        await self.http.close()
+        self.journal.close()
+        with self._archives_lock:
+            for archive in self.archives.values():
+                archive.close()
+            self.archives.clear()
+        with self._indexes_lock:
+            for index in (self._progress_index, self._search_index, self._blob_store):
+                if index:
+                    index.close()
+            self._progress_index = self._search_index = self._blob_store = None
+
     def _extract_data_uri(self, data_uri: str) -> Optional[bytes]:
         """Extraheer data uit data URI"""
         try:
@@ -422,7 +776,9 @@ class DataSaver:
     
     async def save_manifest(self) -> str:
         """
-        Sla manifest.json op met metadata over de run.
+        Compacteer het journal tot manifest.json en run_summary.txt.
+        Wordt aan het einde van de run (of op verzoek) aangeroepen; tijdens
+        de run wordt alleen aan het journal toegevoegd.
         
         Returns:
             Pad naar manifest bestand
@@ -430,49 +786,20 @@ class DataSaver:
         try:
             # Update metadata met eindtijd
             self.metadata["end_time"] = datetime.now().isoformat()
-            self.metadata["total_files"] = len(self.files_data)
-            self.metadata["total_images"] = len(self.images_data)
+            self.metadata["total_files"] = self.journal.count("file")
+            self.metadata["total_images"] = self.journal.count("image")
             self.metadata["updated_at"] = datetime.now().isoformat()
             
-            # Verzamel alle data
-            manifest_data = {
-                "metadata": self.metadata,
-                "files": self.files_data,
-                "images": self.images_data
-            }
-            
-            # Genereer manifest pad
-            manifest_filename = self.output_config.manifest_filename
-            manifest_path = self.run_dir / manifest_filename
-            temp_manifest_path = manifest_path.with_suffix(".tmp")
-            
-            # Schrijf naar temp bestand
-            async with aiofiles.open(temp_manifest_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(manifest_data, indent=2, ensure_ascii=False))
-            
-            # Rename temp naar definitief (Atomic Save)
-            temp_manifest_path.replace(manifest_path)
-            
-            # Ook eenvoudige tekstversie voor debugging
-            summary_path = self.run_dir / "run_summary.txt"
-            temp_summary_path = summary_path.with_suffix(".tmp")
-            summary = self._generate_summary_text(manifest_data)
-            async with aiofiles.open(temp_summary_path, 'w', encoding='utf-8') as f:
-                await f.write(summary)
-            
-            # Rename temp naar definitief
-            temp_summary_path.replace(summary_path)
-            
-            return str(manifest_path)
+            # Streamend schrijven buiten de event loop
+            return await asyncio.to_thread(self._compact_journal)
             
         except Exception as e:
             print(f"Fout bij opslaan manifest: {str(e)}")
             # Val terug op eenvoudige opslag
             error_path = self.run_dir / "manifest_error.txt"
-            # manifest_data is used in the error message, ensure it's defined
             manifest_data_str = "Could not serialize manifest data"
             try:
-                manifest_data_str = json.dumps({"metadata": self.metadata, "files": len(self.files_data)}, indent=2)
+                manifest_data_str = json.dumps({"metadata": self.metadata, "files": self.journal.count("file")}, indent=2)
             except: pass
             
             error_content = f"FOUT bij opslaan manifest: {str(e)}\n\nManifest data (samenvatting):\n{manifest_data_str}"
@@ -484,76 +811,103 @@ class DataSaver:
                 
             return str(error_path)
     
-    def _generate_summary_text(self, manifest_data: Dict[str, Any]) -> str:
-        """Genereer leesbare samenvatting van de run"""
-        metadata = manifest_data["metadata"]
-        files = manifest_data["files"]
-        images = manifest_data["images"]
+    def _compact_journal(self) -> str:
+        """Schrijf manifest en samenvatting record voor record uit het journal"""
+        manifest_path = self.run_dir / self.output_config.manifest_filename
+        temp_manifest_path = manifest_path.with_suffix(".tmp")
         
-        lines = []
-        lines.append("=" * 60)
-        lines.append("NOORDHOFF SCRAPER - RUN SAMENVATTING")
-        lines.append("=" * 60)
-        lines.append("")
+        with open(temp_manifest_path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "metadata": ')
+            f.write(json.dumps(self.metadata, ensure_ascii=False))
+            for key, kind in (("files", "file"), ("images", "image")):
+                f.write(f',\n  "{key}": [')
+                first = True
+                for record in self.journal.iter_records(kind):
+                    record.pop("kind", None)
+                    f.write("\n    " if first else ",\n    ")
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    first = False
+                f.write("\n  ]" if not first else "]")
+            f.write("\n}\n")
+        
+        # Rename temp naar definitief (Atomic Save)
+        temp_manifest_path.replace(manifest_path)
+        
+        # Ook eenvoudige tekstversie voor debugging
+        summary_path = self.run_dir / "run_summary.txt"
+        temp_summary_path = summary_path.with_suffix(".tmp")
+        with open(temp_summary_path, 'w', encoding='utf-8') as f:
+            for line in self._iter_summary_lines():
+                f.write(line + "\n")
+        temp_summary_path.replace(summary_path)
+        
+        return str(manifest_path)
+    
+    def _iter_summary_lines(self):
+        """Genereer leesbare samenvatting van de run, regel voor regel"""
+        metadata = self.metadata
+        
+        yield "=" * 60
+        yield "NOORDHOFF SCRAPER - RUN SAMENVATTING"
+        yield "=" * 60
+        yield ""
         
         # Run informatie
-        lines.append("RUN INFORMATIE:")
-        lines.append(f"  Run ID:         {metadata.get('run_id', 'N/A')}")
-        lines.append(f"  Start tijd:     {metadata.get('start_time', 'N/A')}")
-        lines.append(f"  Eind tijd:      {metadata.get('end_time', 'N/A')}")
-        lines.append(f"  Config hash:    {metadata.get('config_hash', 'N/A')}")
-        lines.append("")
+        yield "RUN INFORMATIE:"
+        yield f"  Run ID:         {metadata.get('run_id', 'N/A')}"
+        yield f"  Start tijd:     {metadata.get('start_time', 'N/A')}"
+        yield f"  Eind tijd:      {metadata.get('end_time', 'N/A')}"
+        yield f"  Config hash:    {metadata.get('config_hash', 'N/A')}"
+        yield ""
         
         # Statestieken
-        lines.append("STATISTIEKEN:")
-        lines.append(f"  Bestanden:      {len(files)} tekstbestanden")
-        lines.append(f"  Afbeeldingen:   {len(images)} afbeeldingen")
-        lines.append("")
+        yield "STATISTIEKEN:"
+        yield f"  Bestanden:      {self.journal.count('file')} tekstbestanden"
+        yield f"  Afbeeldingen:   {self.journal.count('image')} afbeeldingen"
+        yield ""
         
         # Bestanden lijst
-        lines.append("TEXT BESTANDEN:")
-        for file in files:
-            lines.append(f"  - {file.get('filename', 'unknown')}")
-            lines.append(f"    Hoofdstuk: {file.get('chapter_index', '?')}, "
-                        f"Paragraaf: {file.get('paragraph_index', '?')}, "
-                        f"Grootte: {file.get('objectives_length', 0) + file.get('lesson_length', 0)} karakters")
+        yield "TEXT BESTANDEN:"
+        for file in self.journal.iter_records("file"):
+            yield f"  - {file.get('filename', 'unknown')}"
+            yield (f"    Hoofdstuk: {file.get('chapter_index', '?')}, "
+                   f"Paragraaf: {file.get('paragraph_index', '?')}, "
+                   f"Grootte: {file.get('objectives_length', 0) + file.get('lesson_length', 0)} karakters")
             if "error" in file:
-                lines.append(f"    FOUT: {file['error']}")
-        lines.append("")
+                yield f"    FOUT: {file['error']}"
+        yield ""
         
         # Afbeeldingen lijst
-        if images:
-            lines.append("AFBEELDINGEN:")
-            for img in images:
-                lines.append(f"  - {img.get('filename', 'unknown')}")
-                lines.append(f"    Hoofdstuk: {img.get('chapter_index', '?')}, "
-                            f"Paragraaf: {img.get('paragraph_index', '?')}, "
-                            f"Index: {img.get('image_index', '?')}")
-                lines.append(f"    Grootte: {img.get('size_bytes', 0)} bytes")
+        if self.journal.count("image"):
+            yield "AFBEELDINGEN:"
+            for img in self.journal.iter_records("image"):
+                yield f"  - {img.get('filename', img.get('blob', 'unknown'))}"
+                yield (f"    Hoofdstuk: {img.get('chapter_index', '?')}, "
+                       f"Paragraaf: {img.get('paragraph_index', '?')}, "
+                       f"Index: {img.get('image_index', '?')}")
+                yield f"    Grootte: {img.get('size_bytes', 0)} bytes"
         else:
-            lines.append("AFBEELDINGEN: Geen afbeeldingen opgeslagen")
-        lines.append("")
+            yield "AFBEELDINGEN: Geen afbeeldingen opgeslagen"
+        yield ""
         
         # Directory informatie
-        lines.append("DIRECTORY STRUCTUUR:")
-        lines.append(f"  Output root:    {self.output_dir}")
-        lines.append(f"  Run directory:  {self.run_dir}")
-        lines.append(f"  Export root:    {self.export_dir}")
-        lines.append("")
-        
-        lines.append("=" * 60)
-        lines.append("EINDE SAMENVATTING")
-        lines.append("=" * 60)
+        yield "DIRECTORY STRUCTUUR:"
+        yield f"  Output root:    {self.output_dir}"
+        yield f"  Run directory:  {self.run_dir}"
+        yield f"  Export root:    {self.export_dir}"
+        yield ""
         
-        return "\n".join(lines)
+        yield "=" * 60
+        yield "EINDE SAMENVATTING"
+        yield "=" * 60
     
     def get_file_list(self) -> List[Dict[str, Any]]:
-        """Retourneer lijst van opgeslagen bestanden"""
-        return self.files_data.copy()
+        """Retourneer lijst van opgeslagen bestanden (gelezen uit het journal)"""
+        return list(self.journal.iter_records("file"))
     
     def get_image_list(self) -> List[Dict[str, Any]]:
-        """Retourneer lijst van opgeslagen afbeeldingen"""
-        return self.images_data.copy()
+        """Retourneer lijst van opgeslagen afbeeldingen (gelezen uit het journal)"""
+        return list(self.journal.iter_records("image"))
     
     def get_run_info(self) -> Dict[str, Any]:
         """Retourneer run informatie"""
@@ -562,6 +916,6 @@ class DataSaver:
             "run_dir": str(self.run_dir),
             "output_dir": str(self.output_dir),
             "start_time": self.metadata["start_time"],
-            "total_files": len(self.files_data),
-            "total_images": len(self.images_data)
+            "total_files": self.journal.count("file"),
+            "total_images": self.journal.count("image")
         }
\ No newline at end of file
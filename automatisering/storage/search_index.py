@@ -0,0 +1,284 @@
+# storage/search_index.py
+"""
+Full-text zoekindex (SQLite FTS5) over alle geëxporteerde paragrafen.
+
+DataSaver werkt de index bij elke opgeslagen paragraaf bij. Voor exports
+van vóór de index is er een rebuild (zie ook `python -m storage`).
+"""
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.archive import BookArchive, read_virtual_path
+from storage.progress_index import ProgressIndex
+
+_SECTION_RULE = "-" * 40
+_MISSING_TEXT = ("(Geen leerdoelen gevonden)", "(Geen leerstof gevonden)")
+# Kop van de custom velden sectie in txt ("Extra velden:") en md ("### Extra velden")
+CUSTOM_SECTION = "Extra velden"
+
+
+@dataclass
+class SearchHit:
+    """Eén zoekresultaat"""
+    book: str
+    chapter_index: int
+    paragraph_index: int
+    path: str
+    snippet: str
+    rank: float
+
+
+def custom_text(custom_data: Any) -> str:
+    """Custom velden als doorzoekbare tekst ("naam: waarde" per regel)"""
+    if not custom_data:
+        return ""
+    if isinstance(custom_data, dict):
+        lines = []
+        for key, value in custom_data.items():
+            if not isinstance(value, str):
+                value = json.dumps(value, ensure_ascii=False)
+            lines.append(f"{key}: {value}")
+        return "\n".join(lines)
+    return str(custom_data)
+
+
+def _to_fts_query(query: str) -> str:
+    """Maak van vrije invoer een veilige FTS5 query: elk woord letterlijk, prefix met *"""
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def parse_export(text: str, suffix: str) -> Tuple[str, str, str]:
+    """
+    Haal leerdoelen, leerstof en custom velden terug uit een geëxporteerd
+    bestand (txt, md of de JSON bron van pdf/epub). Gebruikt bij rebuild.
+    """
+    if suffix == ".json":
+        try:
+            data = json.loads(text)
+            return data.get("objectives", ""), data.get("lesson", ""), custom_text(data.get("custom_data"))
+        except json.JSONDecodeError:
+            return "", text, ""
+
+    if suffix == ".md":
+        sections = re.split(r"^### (.+)$", text, flags=re.MULTILINE)
+        found = {sections[i].strip(): sections[i + 1].strip() for i in range(1, len(sections) - 1, 2)}
+        return found.get("Leerdoelen", ""), found.get("Leerstof", ""), found.get(CUSTOM_SECTION, "")
+
+    # Platte tekst: secties tussen streepjeslijnen (zie DataSaver._format_text)
+    objectives = lesson = custom = ""
+    for block in text.split(_SECTION_RULE):
+        block = block.strip()
+        if block.startswith("Leerdoelen:"):
+            objectives = block[len("Leerdoelen:"):].strip()
+        elif block.startswith("Leerstof:"):
+            lesson = block[len("Leerstof:"):].strip()
+        elif block.startswith(f"{CUSTOM_SECTION}:"):
+            custom = block[len(CUSTOM_SECTION) + 1:].strip()
+    if not objectives and not lesson:
+        lesson = text
+    return ("" if objectives in _MISSING_TEXT else objectives,
+            "" if lesson in _MISSING_TEXT else lesson, custom)
+
+
+class SearchIndex:
+    """
+    Incrementele full-text index per output directory.
+
+    Eén rij per (boek, hoofdstuk, paragraaf); een nieuwe versie van een
+    paragraaf vervangt de oude. Zoeken gebruikt FTS5 met bm25 ranking.
+    """
+
+    FILENAME = "search.db"
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Pad naar het SQLite bestand (wordt aangemaakt indien nodig)
+
+        Raises:
+            sqlite3.OperationalError: als deze SQLite build geen FTS5 heeft
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                book TEXT NOT NULL,
+                chapter_index INTEGER NOT NULL,
+                paragraph_index INTEGER NOT NULL,
+                path TEXT,
+                updated_at TEXT,
+                UNIQUE (book, chapter_index, paragraph_index)
+            )
+        """)
+        self._conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+                objectives, lesson, custom,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        self._conn.commit()
+
+    @classmethod
+    def for_output_dir(cls, output_dir) -> "SearchIndex":
+        """Open de index die bij een output directory hoort"""
+        return cls(Path(output_dir) / cls.FILENAME)
+
+    def add(self, book: str, chapter_index: int, paragraph_index: int,
+            objectives: str = "", lesson: str = "", custom_data: Any = None, path: str = ""):
+        """Voeg een paragraaf toe of vervang de vorige versie"""
+        custom = custom_data if isinstance(custom_data, str) else custom_text(custom_data)
+        with self._lock, self._conn:
+            self._add(book, chapter_index, paragraph_index, objectives, lesson, custom, path)
+
+    def _add(self, book: str, chapter_index: int, paragraph_index: int,
+             objectives: str, lesson: str, custom: str, path: str):
+        """Schrijf één paragraaf binnen de lopende transactie (lock moet vastgehouden worden)"""
+        row = self._conn.execute(
+            "SELECT id FROM docs WHERE book = ? AND chapter_index = ? AND paragraph_index = ?",
+            (book, chapter_index, paragraph_index)
+        ).fetchone()
+        if row:
+            doc_id = row[0]
+            self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+            self._conn.execute(
+                "UPDATE docs SET path = ?, updated_at = ? WHERE id = ?",
+                (path, datetime.now().isoformat(), doc_id)
+            )
+        else:
+            doc_id = self._conn.execute(
+                "INSERT INTO docs (book, chapter_index, paragraph_index, path, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (book, chapter_index, paragraph_index, path, datetime.now().isoformat())
+            ).lastrowid
+        self._conn.execute(
+            "INSERT INTO docs_fts (rowid, objectives, lesson, custom) VALUES (?, ?, ?, ?)",
+            (doc_id, objectives or "", lesson or "", custom or "")
+        )
+
+    def search(self, query: str, book: Optional[str] = None, limit: int = 20) -> List[SearchHit]:
+        """
+        Zoek paragrafen, beste resultaten eerst.
+
+        Args:
+            query: FTS5 query (bijv. 'cel NEAR kern', 'foto*'); ongeldige syntax
+                   wordt als losse woorden gezocht
+            book: Optioneel alleen binnen één boek zoeken
+            limit: Maximaal aantal resultaten
+        """
+        sql = (
+            "SELECT d.book, d.chapter_index, d.paragraph_index, d.path, "
+            "snippet(docs_fts, -1, '[', ']', '…', 12), bm25(docs_fts) AS rank "
+            "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+            "WHERE docs_fts MATCH ?"
+        )
+        if book is not None:
+            sql += " AND d.book = ?"
+        sql += " ORDER BY rank LIMIT ?"
+
+        for fts_query in (query, _to_fts_query(query)):
+            params = [fts_query] + ([book] if book is not None else []) + [limit]
+            try:
+                with self._lock:
+                    rows = self._conn.execute(sql, params).fetchall()
+                return [SearchHit(*row) for row in rows]
+            except sqlite3.OperationalError:
+                continue  # Syntaxfout in de query: probeer letterlijk
+        return []
+
+    def count(self, book: Optional[str] = None) -> int:
+        """Aantal geïndexeerde paragrafen, optioneel voor één boek"""
+        with self._lock:
+            if book is None:
+                return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM docs WHERE book = ?", (book,)).fetchone()[0]
+
+    def clear(self):
+        """Leeg de hele index"""
+        with self._lock, self._conn:
+            self._clear()
+
+    def _clear(self):
+        """Leeg de tabellen binnen de lopende transactie (lock moet vastgehouden worden)"""
+        self._conn.execute("DELETE FROM docs_fts")
+        self._conn.execute("DELETE FROM docs")
+
+    def _custom_texts(self) -> Dict[Tuple[str, int, int], str]:
+        """Custom tekst die nu in de index staat, per (boek, hoofdstuk, paragraaf)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.book, d.chapter_index, d.paragraph_index, f.custom "
+                "FROM docs d JOIN docs_fts f ON f.rowid = d.id WHERE f.custom != ''"
+            ).fetchall()
+        return {(book, chapter, paragraph): custom for book, chapter, paragraph, custom in rows}
+
+    def rebuild(self, output_dir) -> int:
+        """
+        Bouw de index opnieuw op uit bestaande exports. Welke paragrafen er
+        zijn en waar ze staan komt uit de voortgangsindex; de bestanden (of
+        archief rijen) worden één voor één ingelezen.
+
+        Exports van vóór de "Extra velden" sectie bevatten geen custom velden;
+        voor die paragrafen blijft de custom tekst uit de huidige index staan.
+
+        Eerst worden alle exports ingelezen; daarna wordt de index in één
+        transactie vervangen. Mislukt de rebuild, dan blijft de oude index
+        ongewijzigd staan.
+
+        Returns:
+            Aantal geïndexeerde paragrafen
+        """
+        output_dir = Path(output_dir)
+        progress = ProgressIndex.for_output_dir(output_dir)
+        archives: Dict[Path, BookArchive] = {}
+        previous_custom = self._custom_texts()
+        docs = []
+        try:
+            for book, chapter_index, paragraph_index, path in progress.iter_completed():
+                if not path:
+                    continue
+                full_path = output_dir / path
+                try:
+                    if full_path.exists():
+                        raw = full_path.read_bytes()
+                    else:
+                        raw = read_virtual_path(output_dir, path, archives)
+                    if raw is None:
+                        continue
+                    objectives, lesson, custom = parse_export(raw.decode("utf-8"), full_path.suffix.lower())
+                except Exception as e:
+                    print(f"Waarschuwing: Kon {path} niet indexeren: {str(e)}")
+                    continue
+                if not custom:
+                    custom = previous_custom.get((book, chapter_index, paragraph_index), "")
+                docs.append((book, chapter_index, paragraph_index, objectives, lesson, custom, path))
+        finally:
+            progress.close()
+            for archive in archives.values():
+                archive.close()
+
+        with self._lock, self._conn:
+            self._clear()
+            for doc in docs:
+                self._add(*doc)
+        return len(docs)
+
+    def close(self):
+        """Sluit de database verbinding"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,126 @@
+# storage/write_queue.py
+import asyncio
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from storage.saver import DataSaver
+from utils.metrics import MetricsTracker
+
+# Aangeroepen (in de event loop) nadat een record weggeschreven is:
+# (soort, payload, resultaat pad of "" bij een fout)
+WrittenCallback = Callable[[str, Dict[str, Any], str], None]
+
+
+class WriteQueue:
+    """
+    Begrensde write-behind queue tussen de scraper en de schijf.
+
+    De scraper zet records in de queue en navigeert direct door; één writer
+    task haalt ze in batches op en schrijft ze in een worker thread weg.
+    Als de schijf achterloopt en de queue vol raakt, wacht submit() tot er
+    weer plek is (backpressure) in plaats van onbeperkt geheugen te gebruiken.
+    """
+
+    def __init__(self, saver: DataSaver, maxsize: int = 64, batch_size: int = 16,
+                 on_written: Optional[WrittenCallback] = None,
+                 metrics: Optional[MetricsTracker] = None):
+        """
+        Args:
+            saver: DataSaver die paragrafen formatteert en wegschrijft
+            maxsize: Maximaal aantal wachtende records
+            batch_size: Maximaal aantal records per schrijfronde
+            on_written: Optionele callback per weggeschreven record
+            metrics: Optionele MetricsTracker; elke paragraaf telt als "save" fase
+        """
+        self.saver = saver
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self.batch_size = max(1, batch_size)
+        self.on_written = on_written
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _ensure_writer(self):
+        """Start de writer task (opnieuw) in de huidige event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run_writer())
+
+    @property
+    def pending(self) -> int:
+        """Aantal records dat nog op schrijven wacht"""
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, data: Dict[str, Any]):
+        """Zet een paragraaf record in de queue (wacht alleen als de queue vol is)"""
+        self._ensure_writer()
+        await self._queue.put(("paragraph", data))
+
+    async def submit_text(self, path: Path, text: str):
+        """Zet een los tekstbestand in de queue"""
+        self._ensure_writer()
+        await self._queue.put(("text", {"path": str(path), "text": text}))
+
+    async def flush(self):
+        """Wacht tot alles wat nu in de queue staat op schijf staat"""
+        if self._queue is not None and self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def close(self):
+        """Flush en stop de writer task"""
+        await self.flush()
+        if self._writer and not self._writer.done():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+        self._queue = None
+
+    async def _run_writer(self):
+        """Haal batches uit de queue en schrijf ze buiten de event loop weg"""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                results = await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                print(f"Fout in write queue: {str(e)}")
+                results = [""] * len(batch)
+
+            for (kind, payload), result in zip(batch, results):
+                if self.on_written:
+                    try:
+                        self.on_written(kind, payload, result)
+                    except Exception as e:
+                        print(f"Fout in write callback: {str(e)}")
+                queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Schrijf een batch records weg (draait in een worker thread)"""
+        results = []
+        for kind, payload in batch:
+            if kind == "paragraph":
+                if self.metrics:
+                    with self.metrics.stage("save"):
+                        results.append(self.saver.write_data(payload))
+                else:
+                    results.append(self.saver.write_data(payload))
+            else:
+                try:
+                    path = Path(payload["path"])
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(payload["text"], encoding="utf-8")
+                    results.append(str(path))
+                except Exception as e:
+                    print(f"Fout bij schrijven van {payload.get('path')}: {str(e)}")
+                    results.append("")
+        return results
@@ -2,8 +2,24 @@
 import asyncio
 from aiohttp import web
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+
+@asynccontextmanager
+async def serve(app: web.Application):
+    """Start een aiohttp app op een vrije poort (voor tests) en geef de basis URL"""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
 class MockNoordhoffServer:
     """Mock server voor het testen van de scraper"""
     
@@ -0,0 +1,64 @@
+# tests/test_archive.py
+"""
+Unit tests voor BookArchive.
+"""
+import tempfile
+from pathlib import Path
+
+from storage.archive import BookArchive
+
+
+class TestBookArchive:
+    """Test cases voor BookArchive"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive = BookArchive.for_book(self.temp_dir, "Mijn Boek")
+
+    def teardown_method(self):
+        self.archive.close()
+
+    def test_random_access_per_paragraph(self):
+        """Test dat bestanden per (hoofdstuk, paragraaf) terug te lezen zijn"""
+        self.archive.put(1, 1, "tekst.txt", b"een")
+        self.archive.put(1, 2, "tekst.txt", b"twee")
+        self.archive.put(1, 2, "images/a.png", b"png", kind="image")
+
+        assert self.archive.read(1, 1, "tekst.txt") == b"een"
+        assert self.archive.read(3, 1, "tekst.txt") is None
+        assert self.archive.read_paragraph(1, 2) == {"tekst.txt": b"twee", "images/a.png": b"png"}
+        assert self.archive.read_paragraph(1, 2, kind="image") == {"images/a.png": b"png"}
+        assert [e.paragraph_index for e in self.archive.entries(chapter_index=1)] == [1, 2, 2]
+
+    def test_put_replaces(self):
+        """Test dat opnieuw opslaan de oude inhoud vervangt"""
+        self.archive.put(1, 1, "tekst.txt", b"oud")
+        self.archive.put(1, 1, "tekst.txt", b"nieuw")
+
+        assert self.archive.read(1, 1, "tekst.txt") == b"nieuw"
+        assert len(self.archive.entries()) == 1
+
+    def test_put_file_and_extract(self):
+        """Test dat grote bestanden in chunks erin en eruit gaan"""
+        source = Path(self.temp_dir) / "video.mp4"
+        source.write_bytes(b"x" * 2500)
+        self.archive.put_file(2, 3, "media/video.mp4", source, chunk_size=1000)
+
+        target = Path(self.temp_dir) / "uitgepakt"
+        assert self.archive.extract(target) == 1
+        assert (target / "Chapter 2" / "Paragraph 3" / "media" / "video.mp4").read_bytes() == b"x" * 2500
+
+    def test_chunked_file_replace_leaves_no_chunks(self):
+        """Test dat grote bestanden als chunks terug te lezen zijn en vervangen geen losse chunks achterlaat"""
+        source = Path(self.temp_dir) / "video.mp4"
+        source.write_bytes(bytes(range(256)) * 10)
+        self.archive.put_file(2, 3, "media/video.mp4", source, chunk_size=1000)
+
+        assert self.archive.read(2, 3, "media/video.mp4") == bytes(range(256)) * 10
+        assert self.archive.entries()[0].size == 2560
+        assert self.archive._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 3
+
+        self.archive.put(2, 3, "media/video.mp4", b"klein", kind="media")
+        assert self.archive.read_paragraph(2, 3) == {"media/video.mp4": b"klein"}
+        assert self.archive._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 0
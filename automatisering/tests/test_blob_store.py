@@ -0,0 +1,46 @@
+# tests/test_blob_store.py
+"""
+Unit tests voor BlobStore.
+"""
+import tempfile
+
+from storage.blob_store import BlobStore
+
+
+class TestBlobStore:
+    """Test cases voor BlobStore"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = BlobStore.for_output_dir(self.temp_dir)
+
+    def teardown_method(self):
+        self.store.close()
+
+    def test_identical_content_stored_once(self):
+        """Test dat identieke inhoud maar één bestand oplevert"""
+        first = self.store.put(b"logo", ".png", url="https://cdn.example.com/a/logo.png")
+        second = self.store.put(b"logo", ".png", url="https://cdn.example.com/b/logo.png")
+
+        assert first.digest == second.digest
+        assert first.path == second.path
+        assert first.path.read_bytes() == b"logo"
+        assert len([p for p in first.path.parent.iterdir() if p.is_file()]) == 1
+
+    def test_lookup_url(self):
+        """Test dat een eerder geziene URL zonder download teruggevonden wordt"""
+        assert self.store.lookup_url("https://cdn.example.com/x.png") is None
+
+        ref = self.store.put(b"diagram", ".png", url="https://cdn.example.com/x.png")
+        found = self.store.lookup_url("https://cdn.example.com/x.png")
+
+        assert found is not None
+        assert found.digest == ref.digest
+        assert found.size == len(b"diagram")
+
+    def test_lookup_ignores_missing_file(self):
+        """Test dat een verwijderd blob bestand als onbekend geldt"""
+        ref = self.store.put(b"weg", ".png", url="https://cdn.example.com/weg.png")
+        ref.path.unlink()
+        assert self.store.lookup_url("https://cdn.example.com/weg.png") is None
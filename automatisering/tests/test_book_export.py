@@ -0,0 +1,91 @@
+# tests/test_book_export.py
+"""
+Unit tests voor de boek export.
+"""
+import base64
+import json
+import re
+import tempfile
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+from storage.book_export import HAS_REPORTLAB, export_book, iter_chapters
+
+
+def _pdf_text(data: bytes) -> str:
+    """Tekst operatoren van alle content streams, in volgorde (reportlab: ASCII85 + Flate)"""
+    texts = []
+    for stream in re.findall(rb"stream\r?\n(.*?)endstream", data, re.DOTALL):
+        try:
+            content = zlib.decompress(base64.a85decode(stream.strip().removesuffix(b"~>")))
+        except (ValueError, zlib.error):
+            continue  # Geen tekst stream (bijv. een font)
+        texts += re.findall(rb"\((.*?)\) Tj", content)
+    return "\n".join(text.decode("latin-1") for text in texts)
+
+
+class TestBookExport:
+    """Test cases voor export_book"""
+
+    def setup_method(self):
+        """Setup voor elke test: een boek met paragraaf bronnen"""
+        self.book_dir = Path(tempfile.mkdtemp()) / "mijn_boek"
+        for chapter in (2, 1, 10):
+            for paragraph in (1, 2):
+                para_dir = self.book_dir / f"Chapter {chapter}" / f"Paragraph {paragraph}"
+                para_dir.mkdir(parents=True)
+                (para_dir / "bron.json").write_text(json.dumps({
+                    "chapter_index": chapter,
+                    "paragraph_index": paragraph,
+                    "objectives": "Doel <1>",
+                    "lesson": "Regel een\nRegel twee & drie",
+                    "images": []
+                }), encoding="utf-8")
+
+    def test_chapters_in_numeric_order(self):
+        """Test dat hoofdstukken numeriek (niet alfabetisch) gesorteerd worden"""
+        chapters = [index for index, _ in iter_chapters(self.book_dir)]
+        assert chapters == [1, 2, 10]
+
+    def test_epub_structure(self):
+        """Test dat de EPUB geldig opgebouwd is en escaped tekst bevat"""
+        path = Path(export_book(str(self.book_dir), "Mijn Boek", "epub"))
+        assert path.name == "mijn_boek.epub"
+
+        with zipfile.ZipFile(path) as epub:
+            first = epub.infolist()[0]
+            assert first.filename == "mimetype"
+            assert first.compress_type == zipfile.ZIP_STORED
+            assert epub.read("mimetype") == b"application/epub+zip"
+
+            opf = epub.read("OEBPS/content.opf").decode("utf-8")
+            assert re.findall(r'idref="(ch\d+)"', opf) == ["ch1", "ch2", "ch3"]
+            assert "<dc:title>Mijn Boek</dc:title>" in opf
+
+            chapter = epub.read("OEBPS/chapter1.xhtml").decode("utf-8")
+            assert "<p>Doel &lt;1&gt;</p>" in chapter
+            assert "<p>Regel twee &amp; drie</p>" in chapter
+
+    def test_pdf_output(self):
+        """Test dat de PDF een geldig bestand is met de hoofdstukken numeriek op volgorde"""
+        if not HAS_REPORTLAB:
+            pytest.skip("reportlab niet geïnstalleerd")
+        path = Path(export_book(str(self.book_dir), "Mijn Boek", "pdf"))
+        assert path.name == "mijn_boek.pdf" and path.exists()
+        assert not path.with_name(path.name + ".tmp").exists()
+
+        data = path.read_bytes()
+        assert data.startswith(b"%PDF")
+        text = _pdf_text(data)
+        assert re.findall(r"Hoofdstuk \d+", text) == ["Hoofdstuk 1", "Hoofdstuk 2", "Hoofdstuk 10"]
+        assert re.findall(r"Paragraaf [\d.]+", text)[:2] == ["Paragraaf 1.1", "Paragraaf 1.2"]
+        assert text.index("Mijn Boek") < text.index("Hoofdstuk 1")
+        # Voorpagina plus één of meer pagina's per hoofdstuk
+        assert len(re.findall(rb"/Type /Page\b", data)) >= 4
+
+    def test_unknown_format(self):
+        """Test dat een niet-boek formaat niets oplevert"""
+        assert export_book(str(self.book_dir), "Mijn Boek", "txt") == ""
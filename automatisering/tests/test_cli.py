@@ -0,0 +1,72 @@
+# tests/test_cli.py
+"""
+Unit tests voor de headless command line runner.
+"""
+import asyncio
+
+import runner.__main__ as cli
+
+
+class FakeRunner:
+    """Runner stub die bijhoudt of stop en cleanup (in een nog open loop) aangeroepen zijn"""
+
+    def __init__(self):
+        self.stopped = False
+        self.cleaned_in_open_loop = False
+
+    def stop(self):
+        self.stopped = True
+
+    async def cleanup(self):
+        await asyncio.sleep(0)
+        self.cleaned_in_open_loop = not asyncio.get_running_loop().is_closed()
+
+
+def _raise_interrupt():
+    raise KeyboardInterrupt
+
+
+class TestCli:
+    """Test cases voor runner.__main__"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.runner = FakeRunner()
+        self.cancelled = False
+
+    def test_ctrl_c_while_waiting_cancels_and_cleans_up(self, monkeypatch):
+        """Test dat Ctrl-C tijdens een await de run annuleert en de runner in dezelfde loop opruimt"""
+        async def run_cli(args, runners):
+            runners.append(self.runner)
+            asyncio.get_running_loop().call_soon(_raise_interrupt)  # Zoals SIGINT tussen twee stappen
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            return 0
+
+        monkeypatch.setattr(cli, "run_cli", run_cli)
+        assert cli.main(["--config", "config.json"]) == 130
+        assert self.cancelled
+        assert self.runner.stopped and self.runner.cleaned_in_open_loop
+
+    def test_ctrl_c_inside_run_cleans_up(self, monkeypatch):
+        """Test dat een KeyboardInterrupt die in de run zelf opkomt ook tot cleanup en exit code 130 leidt"""
+        async def run_cli(args, runners):
+            runners.append(self.runner)
+            await asyncio.sleep(0)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(cli, "run_cli", run_cli)
+        assert cli.main(["--config", "config.json"]) == 130
+        assert self.runner.stopped and self.runner.cleaned_in_open_loop
+
+    def test_normal_exit_code(self, monkeypatch):
+        """Test dat de exit code van run_cli doorgegeven wordt"""
+        async def run_cli(args, runners):
+            return 1 if args.fresh else 0
+
+        monkeypatch.setattr(cli, "run_cli", run_cli)
+        assert cli.main(["--config", "config.json"]) == 0
+        assert cli.main(["--config", "config.json", "--fresh"]) == 1
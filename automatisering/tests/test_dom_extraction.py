@@ -0,0 +1,204 @@
+# tests/test_dom_extraction.py
+"""
+Unit tests voor de paragraaf extractie in één evaluate en de terugval per veld.
+"""
+import asyncio
+
+import pytest
+
+from config.config_manager import ScrapeField, ScraperConfig, TimeoutsConfig, UIStructureConfig
+from runner.dom_extraction import (EXTRACT_PARAGRAPH_JS, EXTRACT_TABLE_JS, TABLE_ACTION,
+                                   build_extraction_spec, extract_paragraph)
+from runner.playwright_runner import ScrapeRunner
+from tests.mock_server import MockNoordhoffServer, serve
+
+BEGRIPPEN = {"rows": [["Begrip", "Uitleg"], ["Kern", "Bevat het DNA"]], "header": True}
+
+
+def _config(**ui) -> ScraperConfig:
+    """Configuratie met een veld per actie voor mock_site/paragraph.html"""
+    return ScraperConfig(
+        start_url="https://example.com",
+        ui_structure=UIStructureConfig(**ui),
+        custom_fields=[
+            ScrapeField(name="Samenvatting", selector="#samenvatting"),
+            ScrapeField(name="Opmerking", selector="#opmerking", action="HTML"),
+            ScrapeField(name="Bron", selector="#bron", action="Link (href)"),
+            ScrapeField(name="Omslag", selector="#omslag", action="Afbeelding (src)"),
+            ScrapeField(name="Begrippen", selector="#begrippen", action=TABLE_ACTION),
+            ScrapeField(name="Ontbreekt", selector="#bestaat-niet"),
+        ],
+        timeouts=TimeoutsConfig(selector=300)
+    )
+
+
+class BrokenBatchPage:
+    """Page wrapper waarop het batch script faalt, zodat de runner per veld moet extraheren"""
+
+    def __init__(self, page):
+        self._page = page
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+    async def evaluate(self, script, arg=None):
+        if script == EXTRACT_PARAGRAPH_JS:
+            raise RuntimeError("Execution context was destroyed")
+        return await self._page.evaluate(script, arg)
+
+
+class FakeElement:
+    def __init__(self, text="", html="", attributes=None):
+        self.text = text
+        self.html = html
+        self.attributes = attributes or {}
+
+    async def inner_text(self):
+        return self.text
+
+    async def inner_html(self):
+        return self.html
+
+    async def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakePage:
+    """Page stub zonder browser: batch evaluate faalt, elementen komen uit een dict"""
+
+    url = "https://example.com/boek/1"
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    async def evaluate(self, script, arg=None):
+        if script == EXTRACT_PARAGRAPH_JS:
+            raise RuntimeError("Execution context was destroyed")
+        if script == EXTRACT_TABLE_JS:
+            return BEGRIPPEN if arg == "#begrippen" else None
+        raise RuntimeError("window.__logOverlay is undefined")  # Highlight zonder overlay
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if selector not in self.elements:
+            raise TimeoutError(f"Timeout {timeout}ms bij wachten op {selector}")
+        return self.elements[selector]
+
+    async def query_selector(self, selector):
+        return self.elements.get(selector)
+
+
+class TestDomExtraction:
+    """Test cases voor extract_paragraph en ScrapeRunner._extract_content"""
+
+    def _in_browser(self, scenario):
+        """Draai scenario(page) op mock_site/paragraph.html, of sla over zonder browser"""
+        from playwright.async_api import async_playwright
+
+        async def wrapper():
+            async with async_playwright() as p, serve(MockNoordhoffServer().app) as base:
+                try:
+                    browser = await p.chromium.launch()
+                except Exception as e:
+                    pytest.skip(f"Geen Playwright browser beschikbaar: {e}")
+                try:
+                    page = await browser.new_page()
+                    await page.goto(f"{base}/static/paragraph.html")
+                    return await scenario(page)
+                finally:
+                    await browser.close()
+
+        return asyncio.run(wrapper())
+
+    def test_batch_reads_every_field_in_one_evaluate(self):
+        """Test leerdoelen, leerstof, custom velden per actie, tabellen en afbeelding srcs"""
+        config = _config()
+        result = self._in_browser(lambda page: extract_paragraph(page, build_extraction_spec(config)))
+
+        assert result["objectives"].startswith("Leerdoelen")
+        assert "Je kunt de delen van een cel benoemen" in result["objectives"]
+        assert result["lesson"].startswith("De cel") and "Een cel heeft een kern." in result["lesson"]
+        assert result["custom_data"] == {
+            "Samenvatting": "Alle organismen zijn opgebouwd uit cellen.",
+            "Opmerking": "<i>Let op</i> de celwand",
+            "Bron": "/bronnen/cel",
+            "Omslag": "omslag.jpg",
+            "Ontbreekt": "",
+        }
+        assert result["tables"] == {"Begrippen": BEGRIPPEN}
+        assert result["images"] == ["/static/cel.png", "https://cdn.example.com/mitochondrion.png"]
+        assert result["missing"] == []
+
+    def test_hidden_or_missing_sections_are_reported(self):
+        """Test dat verborgen of ontbrekende leerdoelen/leerstof na de timeout als missing terugkomen"""
+        hidden = _config(learning_objectives_selector=".verborgen-doelen",
+                         lesson_content_selector=".onzichtbare-leerstof")
+        absent = _config(lesson_content_selector=".bestaat-niet")
+
+        async def scenario(page):
+            return (await extract_paragraph(page, build_extraction_spec(hidden)),
+                    await extract_paragraph(page, build_extraction_spec(absent, include_images=False)))
+
+        hidden_result, absent_result = self._in_browser(scenario)
+        assert (hidden_result["objectives"], hidden_result["lesson"]) == ("", "")
+        assert hidden_result["missing"] == ["objectives", "lesson"]
+        assert absent_result["objectives"] and absent_result["lesson"] == ""
+        assert absent_result["missing"] == ["lesson"]
+        assert absent_result["images"] == []
+
+    def test_fallback_matches_batch_in_browser(self):
+        """Test dat de terugval per veld na een mislukte batch evaluate dezelfde content oplevert"""
+        runner = ScrapeRunner(_config(), None)
+
+        async def scenario(page):
+            batch = await runner._extract_content(page, 1, 1, want_images=True)
+            fallback = await runner._extract_content(BrokenBatchPage(page), 1, 1, want_images=True)
+            return batch, fallback
+
+        batch, fallback = self._in_browser(scenario)
+        assert fallback["images"] is None  # extract_images zoekt ze daarna zelf op
+        for key in ("objectives", "lesson", "custom_data", "tables"):
+            assert fallback[key] == batch[key]
+
+    def test_fallback_per_field_without_browser(self):
+        """Test de terugval per veld als de batch evaluate faalt, ook zonder overlay en met ontbrekende elementen"""
+        runner = ScrapeRunner(_config(), None)
+        logs = []
+        runner.log_batch.connect(lambda entries: logs.extend(entries))
+        page = FakePage({
+            ".lesson-content": FakeElement(text="De cel"),
+            "#samenvatting": FakeElement(text="Alle organismen zijn opgebouwd uit cellen."),
+            "#opmerking": FakeElement(html="<i>Let op</i> de celwand"),
+            "#bron": FakeElement(attributes={"href": "/bronnen/cel"}),
+            "#omslag": FakeElement(attributes={"src": "omslag.jpg"}),
+        })
+
+        result = asyncio.run(runner._extract_content(page, 2, 3, want_images=True))
+        assert result == {
+            "objectives": "",
+            "lesson": "De cel",
+            "custom_data": {
+                "Samenvatting": "Alle organismen zijn opgebouwd uit cellen.",
+                "Opmerking": "<i>Let op</i> de celwand",
+                "Bron": "/bronnen/cel",
+                "Omslag": "omslag.jpg",
+                "Ontbreekt": "",
+            },
+            "tables": {"Begrippen": BEGRIPPEN},
+            "images": None
+        }
+        messages = [(message, level) for message, level, _ in logs]
+        assert any(level == "DEBUG" and message.startswith("Batch extractie mislukt") for message, level in messages)
+        assert ("Geen leerdoelen gevonden voor paragraaf 2.3", "WARNING") in messages
+
+    def test_extract_paragraph_normalizes_result(self):
+        """Test dat null waarden uit de pagina lege strings worden en ontbrekende secties in missing komen"""
+        class RawPage:
+            async def evaluate(self, script, spec):
+                return {"objectives": None, "lesson": "Les", "custom_data": {"Bron": None},
+                        "tables": None, "images": None}
+
+        spec = build_extraction_spec(_config(), include_images=False)
+        result = asyncio.run(extract_paragraph(RawPage(), spec))
+        assert result == {"objectives": "", "lesson": "Les", "custom_data": {"Bron": ""},
+                          "tables": {}, "images": [], "missing": ["objectives"]}
+        assert spec["images"] is None and len(spec["fields"]) == 6
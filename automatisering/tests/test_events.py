@@ -0,0 +1,120 @@
+# tests/test_events.py
+"""
+Unit tests voor de Qt-vrije signalen en de event stream van de runner.
+"""
+import asyncio
+
+import pytest
+
+from config.config_manager import ScraperConfig
+from runner.events import EventStreamMixin, Signal, signal_types
+from runner.playwright_runner import HAS_QT, ScrapeRunner
+
+
+class Emitter(EventStreamMixin):
+    """Minimale klasse met Qt-vrije signalen"""
+    started = Signal(str)
+    finished = Signal()
+
+
+class TestEvents:
+    """Test cases voor Signal, BoundSignal en EventStreamMixin"""
+
+    def test_connect_emit_disconnect(self):
+        """Test dat slots per instance gekoppeld worden en disconnect één of alle slots verwijdert"""
+        first, second = Emitter(), Emitter()
+        calls = []
+        a = lambda title: calls.append(("a", title))
+        b = lambda title: calls.append(("b", title))
+        first.started.connect(a)
+        first.started.connect(b)
+
+        first.started.emit("boek")
+        second.started.emit("ander boek")  # Eigen BoundSignal per instance
+        assert calls == [("a", "boek"), ("b", "boek")]
+        assert first.started is first.started and first.started is not second.started
+        assert Emitter.started.types == (str,) and Emitter.started.name == "started"
+
+        first.started.disconnect(a)
+        first.started.disconnect(a)  # Niet (meer) gekoppeld: geen fout
+        first.started.emit("twee")
+        first.started.disconnect()
+        first.started.emit("drie")
+        assert calls[2:] == [("b", "twee")]
+
+    def test_failing_slot_does_not_stop_others(self, capsys):
+        """Test dat een exception in een slot gemeld wordt en de volgende slots toch aangeroepen worden"""
+        emitter = Emitter()
+        calls = []
+
+        def broken(title):
+            raise ValueError("kapot")
+
+        emitter.started.connect(broken)
+        emitter.started.connect(calls.append)
+        emitter.started.emit("boek")
+
+        assert calls == ["boek"]
+        assert "Fout in callback voor signaal 'started': kapot" in capsys.readouterr().out
+
+    def test_runner_events_stream(self):
+        """Test de async event stream van een headless ScrapeRunner, inclusief afmelden en een volle queue"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+
+        async def scenario():
+            received = []
+
+            async def consume():
+                async for name, args in runner.events():
+                    received.append((name, args))
+                    if name == "finished":
+                        break
+
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0)  # Consumer staat nu ingeschreven
+            runner.book_started.emit("Biologie")
+            runner.progress_update.emit(1, 3)
+            runner.finished.emit()
+            await asyncio.wait_for(consumer, timeout=5)
+
+            # Na de break is de queue afgemeld: nieuwe events gaan nergens heen
+            runner.status_update.emit("na afloop")
+            subscribed_after = len(runner.__dict__["_event_queues"])
+
+            # Een trage consumer laat events vallen in plaats van de runner te blokkeren
+            stream = runner.events(maxsize=2)
+            pending = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            for i in range(5):
+                runner.progress_update.emit(i, 5)
+            first = await pending
+            second = await stream.__anext__()
+            queued_after = runner.__dict__["_event_queues"][0].qsize()
+            await stream.aclose()
+            return received, subscribed_after, (first, second, queued_after)
+
+        received, subscribed_after, slow = asyncio.run(scenario())
+        assert received == [("book_started", ("Biologie",)), ("progress_update", (1, 3)), ("finished", ())]
+        assert subscribed_after == 0
+        assert slow == (("progress_update", (0, 5)), ("progress_update", (1, 5)), 0)
+
+    def test_qt_adapter_has_every_runner_signal(self):
+        """Test dat BookScrapeRunner voor elk Signal van ScrapeRunner een pyqtSignal met dezelfde types heeft"""
+        if not HAS_QT:
+            pytest.skip("PyQt6 niet geïnstalleerd")
+        from PyQt6.QtCore import QCoreApplication, pyqtSignal
+        from runner.playwright_runner import BookScrapeRunner
+
+        signals = signal_types(ScrapeRunner)
+        assert "progress_update" in signals and "log_batch" in signals
+        for name in signals:
+            assert isinstance(getattr(BookScrapeRunner, name), pyqtSignal), name
+        assert not [name for name, attr in vars(ScrapeRunner).items()
+                    if isinstance(attr, Signal) and name not in signals]
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        runner = BookScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+        received = []
+        runner.chapter_started.connect(lambda title, index: received.append((title, index)))
+        runner.chapter_started.emit("Hoofdstuk 2", 2)
+        assert received == [("Hoofdstuk 2", 2)] and app is not None
@@ -0,0 +1,137 @@
+# tests/test_frontier.py
+"""
+Unit tests voor CrawlFrontier.
+"""
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from config.config_manager import ScraperConfig
+from runner.playwright_runner import ScrapeRunner
+from storage.frontier import CrawlFrontier, DISCOVERED, IN_FLIGHT, DONE, FAILED
+
+
+def _batch_runner(output_dir: Path, fail: bool = False) -> ScrapeRunner:
+    """Batch runner zonder browser die één doorloop 'scrapet' via de frontier"""
+    config = ScraperConfig.model_validate({
+        "start_url": "https://example.com",
+        "auto_scrape": True,
+        "target": {"books": [1]},
+        "browser": {"resume_mode": True},
+        "output": {"output_dir": str(output_dir), "metrics_interval": 0, "search_index": False}
+    })
+    runner = ScrapeRunner(config, None)
+    runner.live_mode = False
+
+    async def setup_browser():
+        pass
+
+    async def scrape_books(books):
+        frontier = runner._get_frontier()
+        frontier.discover([("Boek", 1, 0), ("Boek", 2, 0)])
+        frontier.complete(("Boek", 1, 0))
+        if fail:
+            raise RuntimeError("pagina weg")
+        frontier.complete(("Boek", 2, 0))
+
+    runner.setup_browser = setup_browser
+    runner.scrape_books = scrape_books
+    return runner
+
+
+class TestCrawlFrontier:
+    """Test cases voor CrawlFrontier"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.db_path = Path(tempfile.mkdtemp()) / "frontier.db"
+        self.frontier = CrawlFrontier(self.db_path)
+
+    def teardown_method(self):
+        self.frontier.close()
+
+    def test_state_transitions(self):
+        """Test discovered → in_flight → done/failed"""
+        self.frontier.discover([("Boek", 1, 1), ("Boek", 1, 2)])
+        assert self.frontier.state(("Boek", 1, 1)) == DISCOVERED
+
+        self.frontier.start(("Boek", 1, 1))
+        assert self.frontier.state(("Boek", 1, 1)) == IN_FLIGHT
+
+        self.frontier.complete(("Boek", 1, 1))
+        self.frontier.start(("Boek", 1, 2))
+        self.frontier.fail(("Boek", 1, 2), "timeout")
+
+        assert self.frontier.is_done(("Boek", 1, 1))
+        assert self.frontier.state(("Boek", 1, 2)) == FAILED
+        assert self.frontier.pending("Boek") == [("Boek", 1, 2)]
+
+    def test_discover_keeps_existing_state(self):
+        """Test dat opnieuw ontdekken voltooide items niet reset"""
+        self.frontier.start(("Boek", 2, 0))
+        self.frontier.complete(("Boek", 2, 0))
+        self.frontier.discover([("Boek", 2, 0)])
+        assert self.frontier.is_done(("Boek", 2, 0))
+
+    def test_in_flight_requeued_after_crash(self):
+        """Test dat items die in behandeling waren na heropenen weer openstaan"""
+        self.frontier.discover([("Boek", 30, 0), ("Boek", 31, 0)])
+        self.frontier.start(("Boek", 30, 0))
+        self.frontier.start(("Boek", 30, 0))
+        self.frontier.close()
+
+        self.frontier = CrawlFrontier(self.db_path)
+        assert self.frontier.state(("Boek", 30, 0)) == DISCOVERED
+        assert self.frontier.pending("Boek")[0] == ("Boek", 30, 0)
+        attempts = self.frontier._conn.execute(
+            "SELECT attempts FROM items WHERE chapter = 30"
+        ).fetchone()[0]
+        assert attempts == 2
+
+    def test_finished_run_clears_frontier(self):
+        """Test dat een afgeronde run de frontier wist en een afgebroken doorloop hem bewaart"""
+        output_dir = Path(tempfile.mkdtemp())
+        runner = _batch_runner(output_dir)
+        asyncio.run(runner.run())
+        frontier = CrawlFrontier.for_config(runner.config)
+        assert not frontier.is_done(("Boek", 1, 0))
+        frontier.close()
+
+        runner = _batch_runner(output_dir, fail=True)
+        asyncio.run(runner.run())
+        frontier = CrawlFrontier.for_config(runner.config)
+        assert frontier.is_done(("Boek", 1, 0))
+        assert frontier.pending() == [("Boek", 2, 0)]
+        frontier.close()
+
+    def test_update_config_closes_old_frontier(self):
+        """Test dat een nieuwe configuratie uit de GUI thread de oude frontier in de event loop sluit"""
+        runner = _batch_runner(self.db_path.parent)
+        new_config = runner.config.model_copy(update={"target": runner.config.target.model_copy(update={"books": [2]})})
+
+        async def scenario():
+            runner.loop = asyncio.get_running_loop()
+            old = runner._get_frontier()
+            close = old.close
+            old.close = lambda: (closed_in.append(threading.get_ident()), close())
+            await asyncio.to_thread(runner.update_config, new_config)  # Zoals vanuit de GUI thread
+            assert runner.frontier is None
+            await asyncio.wait_for(runner.config_updated_event.wait(), timeout=1)
+            return old
+
+        closed_in = []
+        old = asyncio.run(scenario())
+        assert closed_in == [threading.get_ident()]  # In de loop thread, niet in de GUI thread
+        with pytest.raises(sqlite3.ProgrammingError):
+            old.state(("Boek", 1, 0))
+
+        # Zonder event loop wordt de oude frontier direct gesloten
+        runner.loop = None
+        old = runner._get_frontier()
+        runner.update_config(runner.config)
+        with pytest.raises(sqlite3.ProgrammingError):
+            old.state(("Boek", 1, 0))
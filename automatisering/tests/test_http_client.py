@@ -0,0 +1,208 @@
+# tests/test_http_client.py
+"""
+Unit tests voor HttpClient tegen een lokale aiohttp server.
+"""
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from config.config_manager import DownloadConfig
+from storage.http_client import HttpClient
+from tests.mock_server import serve
+
+
+class TestHttpClient:
+    """Test cases voor HttpClient"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.hits = {}
+        self.config = DownloadConfig(max_retries=3, retry_backoff=0.05)
+        self.temp_dir = Path(tempfile.mkdtemp())
+        # Resource voor /file, met Range/If-Range ondersteuning
+        self.content = bytes(range(256)) * 40
+        self.etag = '"v1"'
+        self.cut_first_response = 0  # >0: eerste response breekt na zoveel bytes af
+        self.file_requests = []
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+
+        async def flaky(request):
+            times = self.hits.setdefault("flaky", [])
+            times.append(time.monotonic())
+            if len(times) < 3:
+                return web.Response(status=503)
+            return web.Response(body=b"eindelijk", headers={"ETag": '"v1"'})
+
+        async def missing(request):
+            self.hits.setdefault("missing", []).append(time.monotonic())
+            return web.Response(status=404)
+
+        async def cookies(request):
+            return web.Response(text=request.headers.get("Cookie", ""))
+
+        async def conditional(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304, headers={"ETag": '"v1"'})
+            return web.Response(body=b"inhoud", headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+
+        async def file(request):
+            headers = dict(request.headers)
+            self.file_requests.append(headers)
+            validators = {"ETag": self.etag} if self.etag else {}
+            size = len(self.content)
+            start = 0
+            if "Range" in headers and headers.get("If-Range", self.etag) == self.etag:
+                start = int(headers["Range"].split("=")[1].rstrip("-"))
+                if start >= size:
+                    return web.Response(status=416, headers={"Content-Range": f"bytes */{size}"})
+            response = web.StreamResponse(status=206 if start else 200, headers=validators)
+            if start:
+                response.headers["Content-Range"] = f"bytes {start}-{size - 1}/{size}"
+            response.content_length = size - start
+            await response.prepare(request)
+            if self.cut_first_response and len(self.file_requests) == 1:
+                await response.write(self.content[:self.cut_first_response])
+                await asyncio.sleep(0.2)  # Client leest de eerste bytes, daarna...
+                request.transport.close()  # ...valt de verbinding weg midden in de body
+                return response
+            await response.write(self.content[start:])
+            await response.write_eof()
+            return response
+
+        app.router.add_get("/file", file)
+        app.router.add_get("/flaky", flaky)
+        app.router.add_get("/missing", missing)
+        app.router.add_get("/cookies", cookies)
+        app.router.add_get("/conditional", conditional)
+        return app
+
+    def _run(self, scenario, client: HttpClient):
+        async def wrapper():
+            async with serve(self._app()) as base:
+                try:
+                    return await scenario(base)
+                finally:
+                    await client.close()
+        return asyncio.run(wrapper())
+
+    def test_retry_with_exponential_backoff(self):
+        """Test dat 5xx opnieuw geprobeerd wordt met een verdubbelende wachttijd"""
+        client = HttpClient(self.config)
+        body = self._run(lambda base: client.get_bytes(f"{base}/flaky"), client)
+
+        assert body == b"eindelijk"
+        times = self.hits["flaky"]
+        assert len(times) == 3
+        assert times[1] - times[0] >= 0.05
+        assert times[2] - times[1] >= 0.1
+
+    def test_no_retry_statuses_short_circuit(self):
+        """Test dat een 404 direct opgegeven wordt zonder retry of wachttijd"""
+        client = HttpClient(self.config)
+        result = self._run(lambda base: client.fetch(f"{base}/missing"), client)
+
+        assert result is None
+        assert len(self.hits["missing"]) == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test dat na max_retries pogingen None terugkomt"""
+        client = HttpClient(DownloadConfig(max_retries=2, retry_backoff=0.01))
+        assert self._run(lambda base: client.get_bytes(f"{base}/flaky"), client) is None
+        assert len(self.hits["flaky"]) == 2
+
+    def test_browser_cookies_are_sent(self):
+        """Test dat de cookies van de browser context als Cookie header meegaan"""
+        requested = []
+
+        async def cookie_provider(url):
+            requested.append(url)
+            return [{"name": "sessie", "value": "abc"}, {"name": "taal", "value": "nl"}]
+
+        client = HttpClient(self.config, cookie_provider=cookie_provider)
+        body = self._run(lambda base: client.get_bytes(f"{base}/cookies"), client)
+        assert body == b"sessie=abc; taal=nl"
+        assert requested[0].endswith("/cookies")
+
+        off = HttpClient(DownloadConfig(use_browser_cookies=False), cookie_provider=cookie_provider)
+        assert self._run(lambda base: off.get_bytes(f"{base}/cookies"), off) == b""
+
+    def test_conditional_fetch_returns_not_modified(self):
+        """Test de validators van een fetch en een 304 zonder body bij een bekende ETag"""
+        client = HttpClient(self.config)
+
+        async def scenario(base):
+            first = await client.fetch(f"{base}/conditional")
+            second = await client.fetch(f"{base}/conditional", etag=first.etag)
+            return first, second
+
+        first, second = self._run(scenario, client)
+        assert (first.status, first.body, first.etag) == (200, b"inhoud", '"v1"')
+        assert first.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert second.not_modified and second.body is None
+
+    def _part(self, data: bytes, **meta):
+        """Leg een part bestand (en metadata) neer zoals een afgebroken download doet"""
+        dest = self.temp_dir / "video.mp4"
+        dest.with_name("video.mp4.part").write_bytes(data)
+        dest.with_name("video.mp4.part.json").write_text(json.dumps(meta), encoding="utf-8")
+        return dest
+
+    def _download(self, dest: Path, progress=None) -> bool:
+        client = HttpClient(self.config)
+        return self._run(lambda base: client.download_to_file(f"{base}/file", dest, on_progress=progress,
+                                                              chunk_size=1024), client)
+
+    def test_resumes_after_truncated_response(self):
+        """Test dat een afgebroken body bij de volgende poging met Range/If-Range hervat wordt"""
+        self.cut_first_response = 4096
+        dest = self.temp_dir / "video.mp4"
+        progress = []
+
+        assert self._download(dest, lambda new, done, total: progress.append((done, total)))
+        assert dest.read_bytes() == self.content
+        assert not dest.with_name("video.mp4.part").exists()
+        assert not dest.with_name("video.mp4.part.json").exists()
+        assert len(self.file_requests) == 2
+        assert self.file_requests[1]["Range"] == "bytes=4096-"
+        assert self.file_requests[1]["If-Range"] == '"v1"'
+        assert progress[-1] == (len(self.content), len(self.content))
+
+    def test_changed_validator_restarts_from_scratch(self):
+        """Test dat een 200 op een Range request (bestand veranderd) het part bestand vervangt"""
+        dest = self._part(b"oud" * 100, etag='"v0"', total=len(self.content))
+
+        assert self._download(dest)
+        assert dest.read_bytes() == self.content  # Niet achter de oude bytes geplakt
+        assert self.file_requests[0]["If-Range"] == '"v0"'
+
+    def test_416_with_complete_part_file(self):
+        """Test dat een compleet part bestand bij 416 zonder nieuwe download afgerond wordt"""
+        dest = self._part(self.content, etag='"v1"', total=len(self.content))
+
+        assert self._download(dest)
+        assert dest.read_bytes() == self.content
+        assert len(self.file_requests) == 1
+
+    def test_416_with_invalid_part_file_restarts(self):
+        """Test dat een part bestand dat niet bij de metadata past weggegooid wordt"""
+        dest = self._part(self.content + b"rommel", etag='"v1"', total=len(self.content))
+
+        assert self._download(dest)
+        assert dest.read_bytes() == self.content
+        assert "Range" not in self.file_requests[-1]
+
+    def test_missing_validator_sends_no_if_range(self):
+        """Test dat zonder ETag/Last-Modified wel Range maar geen If-Range gestuurd wordt"""
+        self.etag = None
+        dest = self._part(self.content[:1000], etag=None, last_modified=None, total=len(self.content))
+
+        assert self._download(dest)
+        assert dest.read_bytes() == self.content
+        assert self.file_requests[0]["Range"] == "bytes=1000-"
+        assert "If-Range" not in self.file_requests[0]
@@ -0,0 +1,105 @@
+# tests/test_image_capture.py
+"""
+Unit tests voor ImageCapture.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from runner.image_capture import ImageCapture
+
+
+def fake_response(url: str, body: bytes, resource_type: str = "image", status: int = 200,
+                  reads: list = None, headers: dict = None):
+    """Minimale stand-in voor een Playwright Response; reads houdt gelezen URLs bij"""
+    async def read_body():
+        if reads is not None:
+            reads.append(url)
+        await asyncio.sleep(0)
+        return body
+    return SimpleNamespace(
+        url=url,
+        status=status,
+        request=SimpleNamespace(resource_type=resource_type),
+        headers={"etag": '"v1"', **(headers or {})},
+        body=read_body
+    )
+
+
+class TestImageCapture:
+    """Test cases voor ImageCapture"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.capture = ImageCapture(max_bytes=10, max_item_bytes=6)
+
+    def test_hit_waits_for_pending_body(self):
+        """Test dat een body die nog gelezen wordt toch als hit terugkomt"""
+        async def scenario():
+            self.capture.on_response(fake_response("https://cdn/a.png", b"abc"))
+            return await self.capture.get("https://cdn/a.png")
+
+        result = asyncio.run(scenario())
+        assert result.body == b"abc"
+        assert result.etag == '"v1"'
+        assert self.capture.hits == 1
+
+    def test_ignores_non_images_and_misses(self):
+        """Test dat alleen geslaagde afbeelding responses bewaard worden"""
+        async def scenario():
+            self.capture.on_response(fake_response("https://cdn/app.js", b"js", resource_type="script"))
+            self.capture.on_response(fake_response("https://cdn/b.png", b"x", status=404))
+            return await self.capture.get("https://cdn/app.js"), await self.capture.get("https://cdn/b.png")
+
+        assert asyncio.run(scenario()) == (None, None)
+        assert self.capture.misses == 2
+
+    def test_lru_eviction(self):
+        """Test dat de oudste afbeeldingen verdwijnen als de cache vol is"""
+        async def scenario():
+            for name in ("a", "b", "c", "groot"):
+                body = b"1234567" if name == "groot" else b"1234"
+                self.capture.on_response(fake_response(f"https://cdn/{name}.png", body))
+                await self.capture.get(f"https://cdn/{name}.png")
+            return [await self.capture.get(f"https://cdn/{name}.png") is not None
+                    for name in ("a", "b", "c", "groot")]
+
+        assert asyncio.run(scenario()) == [False, True, True, False]
+        assert self.capture.size_bytes == 8
+
+    def test_body_read_only_on_lookup(self):
+        """Test dat alleen de body van opgevraagde afbeeldingen uit de browser gelezen wordt, één keer"""
+        reads = []
+
+        async def scenario():
+            for name in ("figuur", "logo", "icoon"):
+                self.capture.on_response(fake_response(f"https://cdn/{name}.png", b"abc", reads=reads))
+            await asyncio.sleep(0.01)
+            assert reads == []
+            first, second = await asyncio.gather(self.capture.get("https://cdn/figuur.png"),
+                                                 self.capture.get("https://cdn/figuur.png"))
+            again = await self.capture.get("https://cdn/figuur.png")
+            return first, second, again
+
+        first, second, again = asyncio.run(scenario())
+        assert first.body == second.body == again.body == b"abc"
+        assert reads == ["https://cdn/figuur.png"]
+        assert self.capture.hits == 3 and self.capture.size_bytes == 3
+
+    def test_response_bounds(self):
+        """Test dat het aantal onthouden responses begrensd is en te grote afbeeldingen direct afvallen"""
+        capture = ImageCapture(max_bytes=10, max_item_bytes=6, max_responses=2)
+        reads = []
+
+        async def scenario():
+            for name in ("a", "b", "c"):
+                capture.on_response(fake_response(f"https://cdn/{name}.png", b"1", reads=reads))
+            capture.on_response(fake_response("https://cdn/groot.png", b"1234567", reads=reads,
+                                              headers={"content-length": "7"}))
+            return [await capture.get(f"https://cdn/{name}.png") is not None
+                    for name in ("a", "b", "c", "groot")]
+
+        assert asyncio.run(scenario()) == [False, True, True, False]
+        assert reads == ["https://cdn/b.png", "https://cdn/c.png"]
+        capture.on_response(fake_response("https://cdn/d.png", b"1"))
+        capture.clear()
+        assert asyncio.run(capture.get("https://cdn/d.png")) is None and capture.size_bytes == 0
@@ -0,0 +1,70 @@
+# tests/test_journal.py
+"""
+Unit tests voor RunJournal en het compacteren tot manifest.
+"""
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from config.config_manager import OutputConfig
+from storage.journal import RunJournal
+from storage.saver import DataSaver
+
+
+class TestRunJournal:
+    """Test cases voor RunJournal"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / RunJournal.FILENAME
+
+    def test_manifest_matches_journal(self):
+        """Test dat manifest.json precies de records uit het journal bevat, in volgorde"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False), run_id="run1")
+        saver.setup_directories("Biologie")
+        for index in range(1, 4):
+            saver.write_data({"book": "Biologie", "chapter_index": 1, "paragraph_index": index,
+                              "objectives": "Doel", "lesson": f"Les {index}"})
+        saver.journal.append("image", {"chapter_index": 1, "paragraph_index": 2, "image_index": 1,
+                                       "blob": "ab12", "size_bytes": 42})
+
+        manifest_path = Path(asyncio.run(saver.save_manifest()))
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        journal = [json.loads(line) for line in saver.journal.path.read_text(encoding="utf-8").splitlines()]
+
+        def without_kind(kind):
+            return [{k: v for k, v in r.items() if k != "kind"} for r in journal if r["kind"] == kind]
+
+        assert manifest["files"] == without_kind("file")
+        assert [f["paragraph_index"] for f in manifest["files"]] == [1, 2, 3]
+        assert manifest["images"] == without_kind("image")
+        assert (manifest["metadata"]["total_files"], manifest["metadata"]["total_images"]) == (3, 1)
+        assert "Les" not in manifest_path.with_name("run_summary.txt").read_text(encoding="utf-8")
+        assert not manifest_path.with_suffix(".tmp").exists()
+        saver.journal.close()
+
+    def test_empty_journal_gives_valid_manifest(self):
+        """Test dat een run zonder records een geldig manifest met lege lijsten geeft"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False), run_id="leeg")
+        manifest = json.loads(Path(asyncio.run(saver.save_manifest())).read_text(encoding="utf-8"))
+        assert (manifest["files"], manifest["images"]) == ([], [])
+
+    def test_truncated_last_line_is_tolerated(self):
+        """Test dat een half geschreven laatste regel (crash) overgeslagen wordt en hervatten niet breekt"""
+        journal = RunJournal(self.path)
+        journal.append("file", {"paragraph_index": 1})
+        journal.append("file", {"paragraph_index": 2})
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"kind": "file", "paragraph_in')  # Crash midden in een write
+
+        resumed = RunJournal(self.path)
+        assert resumed.count("file") == 2
+        assert [r["paragraph_index"] for r in resumed.iter_records("file")] == [1, 2]
+
+        # Het eerste nieuwe record mag niet aan de kapotte regel vastgeplakt worden
+        resumed.append("file", {"paragraph_index": 3})
+        resumed.close()
+        assert [r["paragraph_index"] for r in RunJournal(self.path).iter_records("file")] == [1, 2, 3]
@@ -0,0 +1,145 @@
+# tests/test_log_bus.py
+"""
+Unit tests voor LogBus en de gebufferde log aflevering van de runner.
+"""
+import asyncio
+
+from config.config_manager import ScraperConfig, UIConfig
+from runner.playwright_runner import OVERLAY_JS, ScrapeRunner
+from utils.log_bus import LogBus
+
+
+class FakePage:
+    """Page stub die evaluate calls bijhoudt; de overlay bestaat pas na injectie"""
+
+    def __init__(self):
+        self.calls = []
+        self.has_overlay = False
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        if script == OVERLAY_JS:
+            self.has_overlay = True
+            return None
+        return self.has_overlay
+
+
+class TestLogBus:
+    """Test cases voor LogBus"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.bus = LogBus(interval=0.01, max_buffer=20)
+        self.gui = []
+        self.overlay = []
+        self.bus.add_sink("gui", self.gui.append, "DEBUG")
+
+        async def overlay(entries):
+            self.overlay.append(entries)
+
+        self.bus.add_sink("overlay", overlay, "WARNING")
+
+    def test_batches_and_levels(self):
+        """Test dat regels per interval in één batch komen, gefilterd per sink"""
+        async def scenario():
+            self.bus.start()
+            for i in range(10):
+                self.bus.publish(f"regel {i}", "DEBUG" if i % 2 else "INFO")
+            self.bus.publish("mis", "ERROR")
+            await self.bus.close()
+
+        asyncio.run(scenario())
+        assert len(self.gui) == 1 and len(self.gui[0]) == 11
+        assert self.overlay == [[self.gui[0][-1]]]
+        assert self.gui[0][-1][:2] == ("mis", "ERROR")
+
+    def test_sync_sink_direct_when_not_running(self):
+        """Test dat de GUI zonder draaiende bus elke regel direct krijgt"""
+        self.bus.publish("voor start", "INFO")
+        assert [[entry[:2] for entry in batch] for batch in self.gui] == [[("voor start", "INFO")]]
+
+    def test_slow_overlay_is_skipped_and_bounded(self):
+        """Test dat een trage overlay de GUI niet ophoudt en de oudste regels laat vallen"""
+        async def scenario():
+            gate = asyncio.Event()
+            calls = []
+
+            async def slow(entries):
+                calls.append(entries)
+                await gate.wait()
+
+            self.bus.interval = 60  # Alleen handmatige flushes
+            self.bus.start()
+            self.bus.add_sink("overlay", slow, "DEBUG")
+            self.bus.publish("eerste", "INFO")
+            self.bus.flush_nowait()
+            await asyncio.sleep(0)
+            for i in range(50):
+                self.bus.publish(f"regel {i}", "INFO")
+            self.bus.flush_nowait()  # Overlay is nog bezig: overgeslagen
+            assert len(calls) == 1
+            gate.set()
+            await self.bus.close()
+            return calls
+
+        calls = asyncio.run(scenario())
+        # De GUI kreeg zijn batch al terwijl de overlay nog bezig was
+        assert len(self.gui) == 2 and self.gui[1][-1][0] == "regel 49"
+        assert len(calls) == 2
+        assert calls[1][0][:2] == ("… 30 log regel(s) overgeslagen", "WARNING")
+        assert calls[1][-1][0] == "regel 49" and len(calls[1]) == 21
+
+    def test_runner_pushes_one_evaluate_per_batch(self):
+        """Test dat de runner per batch één evaluate doet en de overlay alleen injecteert als die ontbreekt"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com", ui=UIConfig(overlay_log_level="INFO")), None)
+        runner.page = FakePage()
+        batches = []
+        runner.log_batch.connect(batches.append)
+
+        async def scenario():
+            runner.log_bus.start()
+            for i in range(5):
+                runner.log(f"regel {i}", "INFO")
+            runner.log("detail", "DEBUG")
+            await runner.log_bus.flush()
+            runner.log("nog een", "SUCCESS")
+            await runner.log_bus.close()
+
+        asyncio.run(scenario())
+        scripts = [script for script, _ in runner.page.calls]
+        assert scripts.count(OVERLAY_JS) == 1
+        assert len(scripts) == 4  # push (geen overlay), injectie, push, push
+        assert [entry[0] for entry in runner.page.calls[-1][1]] == ["nog een"]
+        assert len(batches) == 2 and len(batches[0]) == 6
+
+    def test_bus_keeps_running_across_recovery_cleanup(self):
+        """Test dat herstel na een crash de bus laat draaien en alleen de laatste cleanup hem stopt"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+
+        async def scenario():
+            runner.log_bus.start()
+            await runner.cleanup(final=False)
+            recovered = runner.log_bus.running
+            await runner.cleanup()
+            return recovered
+
+        assert asyncio.run(scenario())
+        assert not runner.log_bus.running
+
+    def test_runner_log_emits_no_signal_per_line(self):
+        """Test dat runner.log geen Qt signaal per regel meer geeft: de GUI krijgt alleen batches"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+        batches = []
+        runner.log_batch.connect(batches.append)
+
+        async def scenario():
+            runner.log_bus.start()
+            for i in range(20):
+                runner.log(f"regel {i}", "INFO")
+            emitted_before_flush = len(batches)
+            await runner.log_bus.close()
+            return emitted_before_flush
+
+        assert asyncio.run(scenario()) == 0
+        assert len(batches) == 1 and len(batches[0]) == 20
+        assert not hasattr(runner, "log_message")
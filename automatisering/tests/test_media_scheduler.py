@@ -0,0 +1,77 @@
+# tests/test_media_scheduler.py
+"""
+Unit tests voor MediaScheduler.
+"""
+import asyncio
+
+from storage.media_scheduler import MediaScheduler, media_key
+from utils.metrics import MetricsTracker
+
+
+class FakeSaver:
+    """Houdt bij hoeveel downloads er tegelijk (per host) lopen"""
+
+    def __init__(self):
+        self.running = {}
+        self.peak = 0
+        self.peak_per_host = 0
+        self.started = []
+
+    async def save_media(self, url, chapter_index, paragraph_index, metrics=None):
+        host = url.split("/")[2]
+        self.started.append(url)
+        self.running[host] = self.running.get(host, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.peak_per_host = max(self.peak_per_host, self.running[host])
+        await asyncio.sleep(0.01)
+        self.running[host] -= 1
+
+
+class TestMediaScheduler:
+    """Test cases voor MediaScheduler"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.saver = FakeSaver()
+        self.metrics = MetricsTracker()
+        self.scheduler = MediaScheduler(self.saver, self.metrics, max_concurrent=3, max_per_host=2)
+
+    def test_media_key_ignores_ranges(self):
+        """Test dat range requests van dezelfde video dezelfde sleutel hebben"""
+        assert media_key("https://CDN.example.com/v.mp4?token=1&range=0-99#t=3") == \
+            media_key("https://cdn.example.com/v.mp4?token=1&range=100-199")
+        assert media_key("https://cdn.example.com/v.mp4?token=1") != \
+            media_key("https://cdn.example.com/v.mp4?token=2")
+
+    def test_dedup_limits_and_drain(self):
+        """Test dedup, gelijktijdigheidslimieten en wachten tot alles klaar is"""
+        async def scenario():
+            accepted = 0
+            for i in range(6):
+                for offset in range(3):
+                    if self.scheduler.submit(f"https://h{i % 2}/v{i}.mp4?range={offset}-", 1, 1):
+                        accepted += 1
+            queued = self.metrics.data.media_queued
+            drained = await self.scheduler.drain(timeout=5)
+            return accepted, queued, drained
+
+        accepted, queued, drained = asyncio.run(scenario())
+        assert accepted == 6
+        assert queued == 3
+        assert drained
+        assert len(self.saver.started) == 6
+        assert self.saver.peak <= 3
+        assert self.saver.peak_per_host <= 2
+        assert self.metrics.data.media_queued == 0
+
+    def test_priority_order(self):
+        """Test dat wachtende downloads met hogere prioriteit eerst starten"""
+        async def scenario():
+            self.scheduler.max_concurrent = 1
+            self.scheduler.submit("https://h/eerste.mp4", 1, 1, priority=1)
+            self.scheduler.submit("https://h/laag.mp4", 1, 1, priority=1)
+            self.scheduler.submit("https://h/hoog.mp4", 1, 1, priority=0)
+            await self.scheduler.drain(timeout=5)
+
+        asyncio.run(scenario())
+        assert self.saver.started == ["https://h/eerste.mp4", "https://h/hoog.mp4", "https://h/laag.mp4"]
@@ -0,0 +1,66 @@
+# tests/test_metrics.py
+"""
+Unit tests voor MetricsTracker.
+"""
+import json
+import tempfile
+from pathlib import Path
+
+from utils.metrics import EwmaRate, LatencyHistogram, MetricsTracker
+
+
+class TestMetrics:
+    """Test cases voor MetricsTracker"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.metrics = MetricsTracker()
+        self.metrics.reset(total_items=10)
+
+    def test_histogram_percentiles(self):
+        """Test dat percentielen binnen één bucket van de echte waarde liggen"""
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.observe(ms / 1000)
+        assert hist.count == 1000
+        assert abs(hist.percentile(0.5) - 0.5) < 0.5 * 0.2
+        assert abs(hist.percentile(0.99) - 0.99) < 0.99 * 0.2
+        assert hist.percentile(1.0) == hist.max == 1.0
+        assert LatencyHistogram().percentile(0.5) == 0.0
+
+    def test_ewma_rate_follows_and_decays(self):
+        """Test dat de EWMA doorvoer naar het werkelijke tempo groeit en daarna afneemt"""
+        rate = EwmaRate(tau=10)
+        for second in range(200):
+            rate.tick(now=second)
+        assert abs(rate.rate(now=199) - 1.0) < 0.1
+        assert rate.rate(now=229) < 0.1
+
+    def test_stage_summary_and_files(self):
+        """Test fase metingen in de samenvatting en de JSON/Prometheus bestanden"""
+        with self.metrics.stage("extraction"):
+            pass
+        self.metrics.record_stage("save", 0.25)
+        self.metrics.paragraph_completed()
+
+        stages = self.metrics.get_summary()["stages"]
+        assert set(stages) >= {"navigation", "ready", "extraction", "images", "save"}
+        assert stages["extraction"]["count"] == 1
+        assert stages["save"]["max_ms"] == 250.0
+        assert stages["navigation"]["count"] == 0
+
+        self.metrics.write_files(Path(self.temp_dir))
+        data = json.loads((Path(self.temp_dir) / "metrics.json").read_text(encoding="utf-8"))
+        assert data["completed"] == 1
+        assert data["stages"]["save"]["count"] == 1
+        prom = (Path(self.temp_dir) / "metrics.prom").read_text(encoding="utf-8")
+        assert 'scraper_stage_seconds_count{stage="save"} 1' in prom
+        assert 'scraper_items_total{status="completed"} 1' in prom
+
+    def test_speed_window_is_bounded(self):
+        """Test dat het venster voor de snelheid niet onbeperkt groeit"""
+        for _ in range(200):
+            self.metrics.item_completed()
+        assert len(self.metrics.item_times) == 50
+        assert self.metrics.get_speed() >= 0
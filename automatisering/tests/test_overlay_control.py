@@ -0,0 +1,90 @@
+# tests/test_overlay_control.py
+"""
+Unit tests voor de pauze/hervat/skip opdrachten die de overlay naar de runner pusht.
+"""
+import asyncio
+
+import pytest
+
+from config.config_manager import ScraperConfig
+from runner.playwright_runner import NavigationInterrupt, ScrapeRunner
+
+
+class FakeContext:
+    """BrowserContext stub die de geregistreerde bindings bewaart"""
+
+    def __init__(self):
+        self.bindings = {}
+
+    async def expose_binding(self, name, callback):
+        self.bindings[name] = callback
+
+
+class TestOverlayControl:
+    """Test cases voor _on_overlay_control en check_status"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+        self.context = FakeContext()
+        asyncio.run(self.runner._expose_bindings(self.context))
+        self.control = lambda command: self.context.bindings["pythonControl"](None, command)
+
+    def test_bindings_are_exposed(self):
+        """Test dat de overlay de status kan opvragen en opdrachten kan pushen"""
+        assert set(self.context.bindings) == {"pythonGetState", "pythonControl", "pythonRecordAction",
+                                              "pythonCaptureSelector"}
+        self.runner.is_recording = True
+        assert self.context.bindings["pythonGetState"](None)["is_recording"] is True
+
+    def test_pause_and_resume(self):
+        """Test dat een gepushte pauze check_status laat wachten tot de hervat opdracht binnenkomt"""
+        async def scenario():
+            self.control({"type": "pause"})
+            assert self.runner.is_paused and self.runner.control_event.is_set()
+
+            waiter = asyncio.create_task(self.runner.check_status())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            self.control({"type": "resume"})
+            assert not self.runner.is_paused and self.runner.control_event.is_set()
+            await asyncio.wait_for(waiter, timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_skip_while_paused_and_running(self):
+        """Test dat skip een gepauzeerde check_status wekt en als NavigationInterrupt doorgeeft"""
+        async def scenario():
+            self.control({"type": "pause"})
+            waiter = asyncio.create_task(self.runner.check_status())
+            await asyncio.sleep(0.05)
+            self.control({"type": "skip", "direction": 1})
+            assert not self.runner.is_paused
+            with pytest.raises(NavigationInterrupt) as forward:
+                await asyncio.wait_for(waiter, timeout=1)
+
+            self.control({"type": "skip", "direction": 0})  # Geen richting: genegeerd
+            await self.runner.check_status()
+
+            self.control({"type": "skip", "direction": -1})
+            with pytest.raises(NavigationInterrupt) as back:
+                await self.runner.check_status()
+            return forward.value.direction, back.value.direction
+
+        assert asyncio.run(scenario()) == (1, -1)
+        assert self.runner.pending_skip_direction == 0
+
+    def test_stop_wakes_paused_runner(self):
+        """Test dat stop() een gepauzeerde check_status wekt en de volgende check de run afbreekt"""
+        async def scenario():
+            self.runner.loop = asyncio.get_running_loop()
+            self.control({"type": "pause"})
+            waiter = asyncio.create_task(self.runner.check_status())
+            await asyncio.sleep(0.05)
+            self.runner.stop()
+            await asyncio.wait_for(waiter, timeout=1)
+            with pytest.raises(asyncio.CancelledError):
+                await self.runner.check_status()
+
+        asyncio.run(scenario())
@@ -0,0 +1,107 @@
+# tests/test_page_pool.py
+"""
+Unit tests voor PagePool en het parallel verwerken van paragrafen.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config.config_manager import ScraperConfig
+from runner.page_pool import PagePool
+from runner.playwright_runner import ScrapeRunner
+from tests.mock_server import MockNoordhoffServer, serve
+
+
+class FakeImageSaver:
+    """Saver stub die bijhoudt onder welke (hoofdstuk, paragraaf, index) afbeeldingen landen"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def save_image(self, image_url, chapter_index, paragraph_index, image_index):
+        await asyncio.sleep(0.01)  # Laat de parallelle paragrafen door elkaar lopen
+        self.calls.append((chapter_index, paragraph_index, image_index, image_url))
+        return f"/images/{chapter_index}_{paragraph_index}_{image_index}.png"
+
+
+class TestPagePool:
+    """Test cases voor PagePool tegen de mock server"""
+
+    def test_warm_up_acquire_reset_and_replace(self):
+        """Test warm_up, gelijktijdige leningen, reset_page, vervangen van een gesloten pagina en een nieuw boek"""
+        from playwright.async_api import async_playwright
+
+        async def scenario():
+            async with async_playwright() as p, serve(MockNoordhoffServer().app) as base:
+                try:
+                    browser = await p.chromium.launch()
+                except Exception as e:
+                    pytest.skip(f"Geen Playwright browser beschikbaar: {e}")
+                try:
+                    context = await browser.new_context()
+                    created = []
+
+                    async def on_page_created(page):
+                        created.append(page)
+
+                    pool = PagePool(context, size=2, on_page_created=on_page_created)
+                    await pool.warm_up(f"{base}/book/1")
+                    assert len(created) == 2 and all(pool.owns(page) for page in created)
+
+                    async def borrow():
+                        async with pool.acquire() as page:
+                            return page
+
+                    # Elke lening krijgt een eigen warme pagina; een derde wacht tot er een vrijkomt
+                    async with pool.acquire() as first, pool.acquire() as second:
+                        assert first is not second
+                        assert first.url == second.url == f"{base}/book/1"
+                        with pytest.raises(asyncio.TimeoutError):
+                            await asyncio.wait_for(borrow(), timeout=0.2)
+
+                        # Van de boekweergave af geraakt: reset_page laadt de shell opnieuw
+                        await first.goto(f"{base}/login")
+                        await pool.reset_page(first)
+                        assert first.url == f"{base}/book/1"
+
+                    # Een pagina die in de pool dichtgaat wordt bij de volgende lening vervangen
+                    closed = created[0]
+                    await closed.close()
+                    async with pool.acquire() as first, pool.acquire() as second:
+                        assert not first.is_closed() and not second.is_closed()
+                        assert closed not in (first, second)
+                    assert not pool.owns(closed) and len(pool._pages) == 2
+                    assert len(created) == 3
+
+                    # Een ander boek: bestaande pagina's worden bij acquire opnieuw geladen
+                    await pool.warm_up(f"{base}/book/2")
+                    page = await borrow()
+                    assert page.url == f"{base}/book/2"
+                    assert len(created) == 3
+
+                    await pool.close()
+                    assert pool._pages == [] and all(page.is_closed() for page in created)
+                finally:
+                    await browser.close()
+
+        asyncio.run(scenario())
+
+    def test_parallel_paragraph_images_keep_their_own_indices(self):
+        """Test dat gelijktijdige paragrafen hun afbeeldingen onder hun eigen hoofdstuk/paragraaf opslaan"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+        runner.saver = FakeImageSaver()
+        page = SimpleNamespace(url="https://example.com/boek/1")
+
+        async def scenario():
+            # In parallel mode zet niemand status.current_paragraph
+            return await asyncio.gather(
+                runner.extract_images(3, 1, page, srcs=["a.png", "b.png"]),
+                runner.extract_images(3, 2, page, srcs=["c.png", None, "d.png"])
+            )
+
+        first, second = asyncio.run(scenario())
+        assert sorted(call[:3] for call in runner.saver.calls) == [(3, 1, 1), (3, 1, 2), (3, 2, 1), (3, 2, 3)]
+        assert (3, 2, 1, "https://example.com/boek/c.png") in runner.saver.calls
+        assert [image["local_path"] for image in second] == ["/images/3_2_1.png", "/images/3_2_3.png"]
+        assert [image["index"] for image in first] == [1, 2]
@@ -0,0 +1,80 @@
+# tests/test_postprocess.py
+"""
+Unit tests voor de batch nabewerking.
+"""
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from config.config_manager import OutputConfig
+from runner.extractor import Extractor
+from storage.postprocess import iter_export_records, postprocess_output, postprocess_records
+from storage.saver import DataSaver
+
+
+class TestPostprocess:
+    """Test cases voor postprocess"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def test_extractor_text_helpers(self):
+        """Test de voorgecompileerde tekstfuncties van Extractor"""
+        assert Extractor.clean_text("  een\r\n\n  twee\tdrie  ") == "een twee drie"
+        structure = Extractor.extract_structured_content("INLEIDING\nTekst hier.\n- punt a\n1. punt b\nVerder.")
+        assert structure["headings"] == ["INLEIDING"]
+        assert structure["lists"] == ["- punt a\n1. punt b"]
+        assert structure["paragraphs"] == ["Tekst hier.", "Verder."]
+        assert Extractor.detect_content_type("Maak de OPDRACHT") == "exercise"
+        assert Extractor.detect_content_type("Na dit hoofdstuk ken je de samenvatting") == "objectives"
+        assert Extractor.calculate_statistics("a b.\tc")["characters_no_whitespace"] == 4
+
+    def test_records_keep_order_across_batches(self):
+        """Test dat een stroom records in volgorde in één dataset belandt"""
+        records = [{"book": "B", "chapter_index": 1, "paragraph_index": i, "lesson": f"Les {i}. Zie www.example.com"}
+                   for i in range(10)]
+        target = Path(self.temp_dir) / "out.jsonl"
+        assert postprocess_records(records, target, max_workers=1, batch_size=3) == 10
+
+        rows = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+        assert [row["paragraph_index"] for row in rows] == list(range(10))
+        assert rows[0]["links"] == ["https://www.example.com"]
+        assert rows[0]["statistics"]["words"] == 4
+
+    def test_postprocess_output_from_exports(self):
+        """Test dat bestaande txt exports via de voortgangsindex verwerkt worden"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False))
+        saver.setup_directories("Geschiedenis")
+        saver.write_data({"book": "Geschiedenis", "chapter_index": 2, "paragraph_index": 1,
+                          "objectives": "Je leert   de  oorzaken", "lesson": "DE REVOLUTIE\nHet volk kwam in opstand."})
+
+        assert postprocess_output(self.temp_dir, max_workers=1) == 1
+        row = json.loads((Path(self.temp_dir) / "dataset.jsonl").read_text(encoding="utf-8"))
+        assert (row["book"], row["chapter_index"], row["paragraph_index"]) == ("Geschiedenis", 2, 1)
+        assert row["objectives"] == "Je leert de oorzaken"
+        assert row["structure"]["headings"] == ["DE REVOLUTIE"]
+
+    def test_process_pool_matches_inline(self):
+        """Test dat het spawn proces pad (max_workers > 1) dezelfde dataset geeft als in-proces"""
+        records = [{"book": "B", "chapter_index": i // 10, "paragraph_index": i % 10,
+                    "lesson": f"KOP {i}\nLes {i} over www.example.com/{i}."} for i in range(50)]
+        inline = Path(self.temp_dir) / "inline.jsonl"
+        pooled = Path(self.temp_dir) / "pool.jsonl"
+
+        assert postprocess_records(records, inline, max_workers=1, batch_size=4) == 50
+        assert postprocess_records(iter(records), pooled, max_workers=2, batch_size=4) == 50
+        assert pooled.read_text(encoding="utf-8") == inline.read_text(encoding="utf-8")
+
+    def test_archive_backend_records(self):
+        """Test dat paragrafen uit het archief backend via hun virtuele pad gelezen worden"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False, output_backend="sqlite"))
+        saver.setup_directories("Economie")
+        saver.write_data({"book": "Economie", "chapter_index": 1, "paragraph_index": 4,
+                          "objectives": "", "lesson": "Vraag en aanbod"})
+        asyncio.run(saver.close())
+
+        records = list(iter_export_records(self.temp_dir))
+        assert [(r["book"], r["paragraph_index"], r["lesson"]) for r in records] == [("Economie", 4, "Vraag en aanbod")]
+        assert ".sqlite" in records[0]["path"]
@@ -0,0 +1,125 @@
+# tests/test_progress_index.py
+"""
+Unit tests voor ProgressIndex.
+"""
+import asyncio
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from config.config_manager import OutputConfig
+from storage.progress_index import ProgressIndex
+from storage.saver import DataSaver
+
+
+class TestProgressIndex:
+    """Test cases voor ProgressIndex"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = ProgressIndex.for_output_dir(self.temp_dir)
+
+    def teardown_method(self):
+        self.index.close()
+
+    def test_mark_and_lookup(self):
+        """Test registreren en opvragen van voltooide paragrafen"""
+        self.index.mark_completed("Boek A", 1, 2, run_id="run1", path="exports/a.txt")
+        self.index.mark_completed("Boek A", 1, 3)
+        self.index.mark_completed("Boek B", 1, 2)
+
+        assert self.index.is_completed("Boek A", 1, 2)
+        assert not self.index.is_completed("Boek A", 2, 1)
+        assert self.index.completed_items("Boek A") == {(1, 2), (1, 3)}
+        assert self.index.count("Boek B") == 1
+
+    def test_mark_is_idempotent(self):
+        """Test dat dubbel registreren geen dubbele rijen geeft"""
+        self.index.mark_completed("Boek A", 1, 1, run_id="run1")
+        self.index.mark_completed("Boek A", 1, 1, run_id="run2")
+        assert self.index.count() == 1
+
+    def test_shared_between_connections(self):
+        """Test dat een tweede verbinding (ander proces) dezelfde voortgang ziet"""
+        self.index.mark_completed("Boek A", 4, 1)
+        other = ProgressIndex(Path(self.temp_dir) / ProgressIndex.FILENAME)
+        try:
+            assert other.is_completed("Boek A", 4, 1)
+        finally:
+            other.close()
+
+    def test_import_manifests_once(self):
+        """Test eenmalige import van manifesten uit oudere runs"""
+        run_dir = Path(self.temp_dir) / "runs" / "oude_run"
+        run_dir.mkdir(parents=True)
+        manifest = {
+            "metadata": {"run_id": "oude_run", "book_title": "Boek A"},
+            "files": [
+                {"chapter_index": 1, "paragraph_index": 1, "path": "exports/a.txt"},
+                {"chapter_index": 1, "paragraph_index": 2, "path": "exports/b.txt"}
+            ]
+        }
+        (run_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+        assert self.index.import_manifests(Path(self.temp_dir) / "runs") == 2
+        assert self.index.completed_items("Boek A") == {(1, 1), (1, 2)}
+
+        # Tweede keer wordt er niets meer gelezen
+        assert self.index.import_manifests(Path(self.temp_dir) / "runs") == 0
+
+    def test_digest_and_image_validators(self):
+        """Test opslaan van content digests en afbeelding validators (incrementele modus)"""
+        assert self.index.get_digest("Boek A", 1, 1) is None
+        self.index.mark_completed("Boek A", 1, 1, digest="abc")
+        assert self.index.get_digest("Boek A", 1, 1) == "abc"
+
+        assert self.index.get_image_validator("https://cdn.example.com/a.png") is None
+        self.index.set_image_validator("https://cdn.example.com/a.png", "exports/a.png", etag='"v1"')
+        assert self.index.get_image_validator("https://cdn.example.com/a.png") == {
+            "etag": '"v1"', "last_modified": None, "path": "exports/a.png"
+        }
+
+    def test_adds_digest_column_to_old_index(self):
+        """Test dat een index zonder digest kolom bij openen gemigreerd wordt"""
+        old_dir = Path(tempfile.mkdtemp())
+        conn = sqlite3.connect(str(old_dir / ProgressIndex.FILENAME))
+        conn.execute("""
+            CREATE TABLE completed (book_title TEXT NOT NULL, chapter_index INTEGER NOT NULL,
+                paragraph_index INTEGER NOT NULL, run_id TEXT, path TEXT, completed_at TEXT,
+                PRIMARY KEY (book_title, chapter_index, paragraph_index))
+        """)
+        conn.execute("INSERT INTO completed VALUES ('Boek A', 1, 1, 'r', 'p', 't')")
+        conn.commit()
+        conn.close()
+
+        index = ProgressIndex.for_output_dir(old_dir)
+        assert index.is_completed("Boek A", 1, 1)
+        assert index.get_digest("Boek A", 1, 1) is None
+        index.mark_completed("Boek A", 1, 1, digest="nieuw")
+        assert index.get_digest("Boek A", 1, 1) == "nieuw"
+        index.close()
+
+    def test_saver_close_releases_databases(self):
+        """Test dat DataSaver.close voortgangsindex, zoekindex en blob store sluit en ze daarna heropent"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, dedupe_images=True))
+        saver.setup_directories("Biologie")
+        record = {"book": "Biologie", "chapter_index": 1, "paragraph_index": 1, "objectives": "", "lesson": "Cellen"}
+        saver.write_data(record)
+        opened = [saver.progress_index, saver.search_index, saver.blob_store]
+        assert all(opened)
+
+        asyncio.run(saver.close())
+        for index in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                index._conn.execute("SELECT 1")
+
+        # De saver blijft bruikbaar, bijv. na herstel van een crash
+        saver.write_data(dict(record, paragraph_index=2))
+        assert saver.progress_index is not opened[0]
+        assert saver.progress_index.completed_items("Biologie") == {(1, 1), (1, 2)}
+        assert saver.search_index.count() == 2
+        asyncio.run(saver.close())
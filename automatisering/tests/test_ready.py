@@ -0,0 +1,116 @@
+# tests/test_ready.py
+"""
+Unit tests voor wait_until_ready en DOM_SETTLE_JS.
+"""
+import asyncio
+import time
+
+import pytest
+
+from config.config_manager import ReadyConfig, ReadyStrategy
+from runner.ready import DOM_SETTLE_JS, wait_until_ready
+
+
+class FakePage:
+    """Page stub die bijhoudt waarop gewacht wordt; evaluate kan de eerste keer falen (navigatie)"""
+
+    def __init__(self, navigate_first: bool = False):
+        self.calls = []
+        self.navigate_first = navigate_first
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.calls.append(("selector", selector, timeout))
+
+    async def wait_for_load_state(self, state, timeout=None):
+        self.calls.append(("load_state", state, timeout))
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append(("evaluate", script, arg))
+        if self.navigate_first:
+            self.navigate_first = False
+            raise RuntimeError("Execution context was destroyed, most likely because of a navigation")
+        return True
+
+
+class TestReady:
+    """Test cases voor wait_until_ready"""
+
+    def _wait(self, page, ready, **kwargs):
+        return asyncio.run(wait_until_ready(page, ready, **kwargs))
+
+    def test_selector_strategy(self):
+        """Test dat 'selector' op de eigen selector wacht, anders op de standaard voor deze plek"""
+        page = FakePage()
+        strategy, _ = self._wait(page, ReadyConfig(strategy=ReadyStrategy.SELECTOR, selector="#les", timeout_ms=2000),
+                                 default_selector=".lesson-content")
+        assert strategy == "selector"
+        assert page.calls == [("selector", "#les", 2000)]
+
+        page = FakePage()
+        self._wait(page, ReadyConfig(strategy=ReadyStrategy.SELECTOR), default_selector=".lesson-content",
+                   default_timeout=9000)
+        assert page.calls == [("selector", ".lesson-content", 9000)]
+
+    def test_selector_without_target_settles_dom(self):
+        """Test dat 'selector' zonder doel-element terugvalt op dom_settle"""
+        page = FakePage()
+        strategy, _ = self._wait(page, ReadyConfig(strategy=ReadyStrategy.SELECTOR, quiet_ms=150),
+                                 default_timeout=4000)
+        assert strategy == "dom_settle"
+        assert page.calls == [("evaluate", DOM_SETTLE_JS, {"quiet": 150, "timeout": 4000})]
+
+    def test_dom_settle_survives_navigation(self):
+        """Test dat een navigatie tijdens het wachten eerst het nieuwe document afwacht en dan opnieuw meet"""
+        page = FakePage(navigate_first=True)
+        strategy, _ = self._wait(page, ReadyConfig(strategy=ReadyStrategy.DOM_SETTLE, timeout_ms=3000))
+        assert strategy == "dom_settle"
+        assert [call[:2] for call in page.calls] == [
+            ("evaluate", DOM_SETTLE_JS), ("load_state", "domcontentloaded"), ("evaluate", DOM_SETTLE_JS)
+        ]
+        assert page.calls[1][2] == 3000
+
+    def test_networkidle_with_settle_pause(self):
+        """Test dat 'networkidle' op het netwerk wacht plus de vaste pauze, en de wachttijd meet"""
+        page = FakePage()
+        strategy, elapsed_ms = self._wait(page, ReadyConfig(settle_ms=50), default_timeout=7000)
+        assert strategy == "networkidle"
+        assert page.calls == [("load_state", "networkidle", 7000)]
+        assert elapsed_ms >= 50
+
+    def test_selector_timeout_propagates(self):
+        """Test dat een verlopen selector timeout naar de aanroeper gaat (die de stap dan laat falen)"""
+        class SlowPage(FakePage):
+            async def wait_for_selector(self, selector, timeout=None):
+                raise TimeoutError(f"Timeout {timeout}ms exceeded")
+
+        with pytest.raises(TimeoutError):
+            self._wait(SlowPage(), ReadyConfig(strategy=ReadyStrategy.SELECTOR, selector="#nooit", timeout_ms=100))
+
+    def test_dom_settle_js_in_browser(self):
+        """Test DOM_SETTLE_JS: een rustige pagina is na 'quiet' ms stabiel, een blijvend veranderende valt terug op de timeout"""
+        from playwright.async_api import async_playwright
+
+        async def scenario():
+            async with async_playwright() as p:
+                try:
+                    browser = await p.chromium.launch()
+                except Exception as e:
+                    pytest.skip(f"Geen Playwright browser beschikbaar: {e}")
+                try:
+                    page = await browser.new_page()
+                    await page.set_content("<div id='teller'>0</div>")
+                    started = time.perf_counter()
+                    quiet = await page.evaluate(DOM_SETTLE_JS, {"quiet": 100, "timeout": 2000})
+                    quiet_ms = (time.perf_counter() - started) * 1000
+
+                    await page.evaluate("setInterval(() => { teller.textContent = Date.now(); }, 20)")
+                    started = time.perf_counter()
+                    busy = await page.evaluate(DOM_SETTLE_JS, {"quiet": 100, "timeout": 400})
+                    busy_ms = (time.perf_counter() - started) * 1000
+                    return quiet, quiet_ms, busy, busy_ms
+                finally:
+                    await browser.close()
+
+        quiet, quiet_ms, busy, busy_ms = asyncio.run(scenario())
+        assert quiet is True and 100 <= quiet_ms < 2000
+        assert busy is False and busy_ms >= 400
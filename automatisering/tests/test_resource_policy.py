@@ -0,0 +1,104 @@
+# tests/test_resource_policy.py
+"""
+Unit tests voor ResourcePolicy en de glob naar regex vertaling.
+"""
+import re
+from types import SimpleNamespace
+
+from config.config_manager import ResourcePolicyConfig
+from runner.resource_policy import ResourcePolicy, glob_to_regex
+
+# (glob, url, verwacht match)
+GLOB_CASES = [
+    ("**/analytics/**", "https://cdn.example.com/analytics/v2/track.js", True),
+    ("**/analytics/**", "https://cdn.example.com/stats/track.js", False),
+    ("https://cdn.example.com/*.js", "https://cdn.example.com/app.js", True),
+    ("https://cdn.example.com/*.js", "https://cdn.example.com/lib/app.js", False),  # '*' stopt bij '/'
+    ("https://cdn.example.com/**.js", "https://cdn.example.com/lib/app.js", True),
+    ("https://example.com/img?.png", "https://example.com/img1.png", True),
+    ("https://example.com/img?.png", "https://example.com/img12.png", False),
+    # Regex metatekens in de glob zijn letterlijk
+    ("https://example.com/a.b", "https://example.com/aXb", False),
+    ("https://example.com/a.b", "https://example.com/a.b", True),
+    ("**/track(v2)+[1]", "https://example.com/track(v2)+[1]", True),
+    ("**/track(v2)+[1]", "https://example.com/trackv2v21", False),
+    ("https://example.com/$^|{}", "https://example.com/$^|{}", True),
+]
+
+
+def _request(url: str, resource_type: str = "script"):
+    return SimpleNamespace(url=url, resource_type=resource_type)
+
+
+def _routed(matcher, url: str) -> bool:
+    """Of Playwright een URL met dit patroon naar Python zou sturen"""
+    if isinstance(matcher, str):
+        matcher = re.compile(f"^{glob_to_regex(matcher)}$")
+    return bool(matcher.match(url))
+
+
+class TestResourcePolicy:
+    """Test cases voor ResourcePolicy"""
+
+    def test_glob_to_regex_table(self):
+        """Test '**' tegen '*', '?' en letterlijke regex metatekens"""
+        for glob, url, expected in GLOB_CASES:
+            assert bool(re.fullmatch(glob_to_regex(glob), url)) is expected, (glob, url)
+
+    def test_url_rules_route_only_blocked_urls(self):
+        """Test dat met alleen URL regels uitsluitend te blokkeren, niet doorgelaten URLs Python bereiken"""
+        policy = ResourcePolicy(ResourcePolicyConfig(
+            blocked_url_patterns=["**/analytics/**", "**/*.woff2"],
+            passthrough_url_patterns=["**/analytics/consent/**"]
+        ))
+        matcher = policy.route_matcher()
+        cases = [
+            ("https://example.com/analytics/track.js", True),
+            ("https://example.com/fonts/roboto.woff2", True),
+            ("https://example.com/analytics/consent/banner.js", False),  # Pass-through wint
+            ("https://example.com/book/1", False),
+        ]
+        for url, routed in cases:
+            assert _routed(matcher, url) is routed, url
+        assert policy.should_block(_request("https://example.com/analytics/track.js"))
+        assert not policy.should_block(_request("https://example.com/book/1"))
+
+    def test_resource_types_route_everything_but_passthrough(self):
+        """Test dat bij resource types alles behalve de pass-through URLs gerouteerd wordt"""
+        policy = ResourcePolicy(ResourcePolicyConfig(
+            blocked_resource_types=["Font", "media"],
+            passthrough_url_patterns=["https://example.com/api/**"]
+        ))
+        matcher = policy.route_matcher()
+        assert _routed(matcher, "https://example.com/fonts/a.woff2")
+        assert _routed(matcher, "https://example.com/book/1")
+        assert not _routed(matcher, "https://example.com/api/chapters")
+
+        assert policy.should_block(_request("https://example.com/fonts/a.woff2", "font"))
+        assert not policy.should_block(_request("https://example.com/book/1", "document"))
+        assert ResourcePolicy(ResourcePolicyConfig(blocked_resource_types=["font"])).route_matcher() == "**/*"
+
+    def test_no_rules_no_route(self):
+        """Test dat zonder blokkeerregels geen route nodig is (pass-through alleen telt niet)"""
+        assert not ResourcePolicy(ResourcePolicyConfig()).needs_route
+        assert not ResourcePolicy(ResourcePolicyConfig(passthrough_url_patterns=["**/api/**"])).needs_route
+
+    def test_captcha_and_video_detection(self):
+        """Test de herkenning van CAPTCHA URLs en video responses"""
+        captcha = [
+            ("https://www.google.com/recaptcha/api2/anchor", True),
+            ("https://challenges.cloudflare.com/turnstile", True),
+            ("https://example.com/HCaptcha/check", True),
+            ("https://example.com/book/1", False),
+        ]
+        for url, expected in captcha:
+            assert ResourcePolicy.is_captcha_url(url) is expected, url
+
+        video = [
+            ("https://cdn.example.com/uitleg.MP4", "other", True),
+            ("https://cdn.example.com/stream?id=4", "media", True),
+            ("https://cdn.example.com/clip.webm?token=1", "xhr", True),
+            ("https://cdn.example.com/plaatje.png", "image", False),
+        ]
+        for url, resource_type, expected in video:
+            assert ResourcePolicy.is_video(url, resource_type) is expected, url
@@ -0,0 +1,116 @@
+# tests/test_search_index.py
+"""
+Unit tests voor SearchIndex.
+"""
+import tempfile
+
+import pytest
+
+from config.config_manager import OutputConfig
+from storage.progress_index import ProgressIndex
+from storage.saver import DataSaver
+from storage.search_index import SearchIndex
+
+
+class TestSearchIndex:
+    """Test cases voor SearchIndex"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = SearchIndex.for_output_dir(self.temp_dir)
+
+    def teardown_method(self):
+        self.index.close()
+
+    def test_search_and_replace(self):
+        """Test zoeken, ranking per boek en vervangen van een paragraaf"""
+        self.index.add("Biologie", 1, 1, "Je kent de celkern", "De cel bestaat uit een kern en cytoplasma")
+        self.index.add("Biologie", 1, 2, "", "Fotosynthese in bladgroenkorrels", {"begrip": "chlorofyl"})
+        self.index.add("Scheikunde", 2, 1, "", "Een cel in een batterij")
+
+        assert {(h.book, h.paragraph_index) for h in self.index.search("cel")} == {("Biologie", 1), ("Scheikunde", 1)}
+        assert [h.book for h in self.index.search("cel", book="Scheikunde")] == ["Scheikunde"]
+        assert self.index.search("chlorofyl")[0].paragraph_index == 2
+        assert "[Fotosynthese]" in self.index.search("fotosynthese")[0].snippet
+
+        self.index.add("Biologie", 1, 2, "", "Nieuwe tekst over ademhaling")
+        assert self.index.search("fotosynthese") == []
+        assert self.index.count("Biologie") == 2
+
+    def test_invalid_syntax_falls_back_to_literal(self):
+        """Test dat losse leestekens in de query geen fout geven"""
+        self.index.add("Wiskunde", 1, 1, "", "De formule a-b \"c\" werkt")
+        assert len(self.index.search('formule "c')) == 1
+
+    def test_rebuild_from_exports(self):
+        """Test dat rebuild bestaande txt exports terugvindt via de voortgangsindex"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False))
+        saver.setup_directories("Aardrijkskunde")
+        saver.write_data({"book": "Aardrijkskunde", "chapter_index": 3, "paragraph_index": 1,
+                          "objectives": "Vulkanen herkennen", "lesson": "Magma stijgt op"})
+
+        assert self.index.count() == 0
+        assert self.index.rebuild(self.temp_dir) == 1
+        hit = self.index.search("magma")[0]
+        assert (hit.book, hit.chapter_index, hit.paragraph_index) == ("Aardrijkskunde", 3, 1)
+        assert self.index.search("vulkanen")
+
+    def test_rebuild_keeps_custom_fields(self):
+        """Test dat custom velden een rebuild overleven, uit txt/md exports en voor oudere exports uit de index"""
+        for export_format, book in (("txt", "Biologie"), ("md", "Natuurkunde")):
+            saver = DataSaver(OutputConfig(output_dir=self.temp_dir, export_format=export_format))
+            saver.setup_directories(book)
+            saver.write_data({"book": book, "chapter_index": 1, "paragraph_index": 1, "objectives": "",
+                              "lesson": "Planten", "custom_data": {"begrip": f"fotosynthese {export_format}"}})
+            saver.search_index.close()
+        # Oudere export zonder "Extra velden" sectie: alleen de index kent de custom tekst
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False))
+        saver.setup_directories("Scheikunde")
+        saver.write_data({"book": "Scheikunde", "chapter_index": 2, "paragraph_index": 1,
+                          "objectives": "", "lesson": "Zouten"})
+        self.index.add("Scheikunde", 2, 1, "", "Zouten", {"begrip": "kristalrooster"})
+
+        assert self.index.rebuild(self.temp_dir) == 3
+        assert [h.book for h in self.index.search("fotosynthese txt")] == ["Biologie"]
+        assert [h.book for h in self.index.search("fotosynthese md")] == ["Natuurkunde"]
+        assert [h.book for h in self.index.search("kristalrooster")] == ["Scheikunde"]
+
+    def test_failed_rebuild_keeps_old_index(self, monkeypatch):
+        """Test dat een rebuild die halverwege mislukt de oude index ongewijzigd laat"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False))
+        saver.setup_directories("Aardrijkskunde")
+        for paragraph_index in (1, 2):
+            saver.write_data({"book": "Aardrijkskunde", "chapter_index": 1, "paragraph_index": paragraph_index,
+                              "objectives": "", "lesson": f"Magma deel {paragraph_index}"})
+        self.index.add("Biologie", 1, 1, "", "De celkern")
+
+        # Fout tijdens het inlezen: de voortgangsindex valt weg na één paragraaf
+        def broken_iter(progress):
+            yield ("Aardrijkskunde", 1, 1, "Aardrijkskunde/hoofdstuk_01/paragraaf_01.txt")
+            raise OSError("schijf weg")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(ProgressIndex, "iter_completed", broken_iter)
+            with pytest.raises(OSError):
+                self.index.rebuild(self.temp_dir)
+        assert self.index.count() == 1 and self.index.search("celkern")
+
+        # Fout tijdens het schrijven: de transactie wordt teruggedraaid
+        original_add = SearchIndex._add
+        calls = []
+
+        def failing_add(index, *doc):
+            calls.append(doc)
+            if len(calls) == 2:
+                raise RuntimeError("kapot")
+            original_add(index, *doc)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(SearchIndex, "_add", failing_add)
+            with pytest.raises(RuntimeError):
+                self.index.rebuild(self.temp_dir)
+        assert self.index.count() == 1 and self.index.search("celkern") and not self.index.search("magma")
+
+        assert self.index.rebuild(self.temp_dir) == 2
+        assert self.index.count("Aardrijkskunde") == 2 and not self.index.search("celkern")
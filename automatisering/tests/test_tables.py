@@ -0,0 +1,110 @@
+# tests/test_tables.py
+"""
+Unit tests voor het wegschrijven van tabellen uit 'Tabel' velden.
+"""
+import asyncio
+import csv
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from config.config_manager import OutputConfig
+from runner.dom_extraction import extract_table
+from storage.archive import BookArchive
+from storage.saver import DataSaver
+from tests.mock_server import MockNoordhoffServer, serve
+from utils.helpers import content_digest
+
+TABLE = {
+    "rows": [["x", "f(x)", ""], ["1", "2", "3"], ["2", "4, 8", "6"]],
+    "header": True
+}
+
+
+def _record(**extra):
+    record = {"book": "Wiskunde", "chapter_index": 4, "paragraph_index": 2,
+              "objectives": "", "lesson": "Opgaven", "tables": {"Opgave tabel": TABLE}}
+    record.update(extra)
+    return record
+
+
+class TestTables:
+    """Test cases voor tabel export"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def test_csv_next_to_paragraph(self):
+        """Test dat een tabel als CSV naast de paragraaf export komt"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False))
+        saver.setup_directories("Wiskunde")
+        filepath = Path(saver.write_data(_record()))
+
+        tables = list(filepath.parent.glob("*.csv"))
+        assert [t.name for t in tables] == [f"{filepath.stem}_opgave_tabel.csv"]
+        with open(tables[0], newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == TABLE["rows"]
+
+    def test_jsonl_uses_header_row(self):
+        """Test dat JSONL objecten per rij schrijft met aangevulde kolomnamen"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False, table_format="jsonl"))
+        saver.setup_directories("Wiskunde")
+        filepath = Path(saver.write_data(_record()))
+
+        lines = next(filepath.parent.glob("*.jsonl")).read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"x": "1", "f(x)": "2", "kolom_3": "3"},
+            {"x": "2", "f(x)": "4, 8", "kolom_3": "6"},
+        ]
+
+    def test_archive_backend(self):
+        """Test dat tabellen bij het archief backend als eigen soort in het archief staan"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False, output_backend="sqlite"))
+        saver.setup_directories("Wiskunde")
+        saver.write_data(_record())
+        asyncio.run(saver.close())
+
+        archive = BookArchive.for_book(self.temp_dir, "Wiskunde")
+        try:
+            tables = archive.read_paragraph(4, 2, kind="table")
+            assert len(tables) == 1
+            assert list(tables.values())[0].decode("utf-8").startswith("x,f(x),")
+        finally:
+            archive.close()
+
+    def test_digest_unchanged_without_tables(self):
+        """Test dat paragrafen zonder tabellen dezelfde digest houden als voorheen"""
+        assert content_digest(_record(tables={})) == content_digest({k: v for k, v in _record().items() if k != "tables"})
+        assert content_digest(_record()) != content_digest(_record(tables={}))
+
+    def test_extract_table_expands_spans_in_browser(self):
+        """Test extract_table tegen mock_site/tables.html: rowspan/colspan worden uitgevouwen, th telt als kop"""
+        from playwright.async_api import async_playwright
+
+        async def scenario():
+            async with async_playwright() as p, serve(MockNoordhoffServer().app) as base:
+                try:
+                    browser = await p.chromium.launch()
+                except Exception as e:
+                    pytest.skip(f"Geen Playwright browser beschikbaar: {e}")
+                try:
+                    page = await browser.new_page()
+                    await page.goto(f"{base}/static/tables.html")
+                    return (await extract_table(page, "#rooster"), await extract_table(page, "#opgave"),
+                            await extract_table(page, "#bestaat-niet"))
+                finally:
+                    await browser.close()
+
+        rooster, opgave, missing = asyncio.run(scenario())
+        assert rooster == {
+            "rows": [["Dag", "Ochtend", "Ochtend", "Middag"],
+                     ["Maandag", "Wiskunde", "Biologie", "Sport"],
+                     ["Maandag", "Excursie", "Excursie", "Sport"],
+                     ["Dinsdag", "Engels", "", "Duits"]],
+            "header": True
+        }
+        assert opgave == {"rows": [["x", "f(x) = 2x"], ["1", "f(x) = 2x"]], "header": False}
+        assert missing is None
@@ -0,0 +1,108 @@
+# tests/test_tracing.py
+"""
+Unit tests voor Tracer.
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from config.config_manager import OutputConfig, ScraperConfig
+from runner.playwright_runner import ScrapeRunner
+from storage.saver import DataSaver
+from utils.tracing import Tracer, load_trace, merge_traces
+
+
+class TestTracing:
+    """Test cases voor Tracer"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracer = Tracer.for_run(self.temp_dir, "run1")
+
+    def teardown_method(self):
+        self.tracer.close()
+
+    def _spans(self, path=None):
+        return [e for e in load_trace(path or self.tracer.path) if e["ph"] == "X"]
+
+    def test_concurrent_tasks_get_own_lanes(self):
+        """Test dat overlappende tasks op aparte banen komen en geneste spans op dezelfde"""
+        async def paragraph(index):
+            with self.tracer.span("paragraph", paragraph=index):
+                await asyncio.sleep(0.01)
+                with self.tracer.span("extract", selector="#les"):
+                    await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(paragraph(1), paragraph(2))
+            await paragraph(3)
+
+        asyncio.run(scenario())
+        self.tracer.close()
+
+        spans = self._spans()
+        lanes = {s["args"]["paragraph"]: s["tid"] for s in spans if s["name"] == "paragraph"}
+        assert lanes[1] != lanes[2]
+        assert lanes[3] in (lanes[1], lanes[2])  # Vrijgekomen baan wordt hergebruikt
+        extract = [s for s in spans if s["name"] == "extract"]
+        assert {s["tid"] for s in extract} == {lanes[1], lanes[2], lanes[3]}
+        assert all(s["dur"] >= 10000 for s in spans if s["name"] == "paragraph")
+
+    def test_disabled_tracer_writes_nothing(self):
+        """Test dat een tracer zonder pad niets schrijft"""
+        tracer = Tracer()
+        with tracer.span("niets"):
+            pass
+        tracer.close()
+        assert not tracer.enabled
+        assert not self.tracer.path.exists()
+
+    def test_saver_writes_are_traced_and_unclosed_trace_loads(self):
+        """Test de span rond DataSaver.write_data en het lezen van een niet afgesloten trace"""
+        saver = DataSaver(OutputConfig(output_dir=self.temp_dir, search_index=False),
+                          run_id="run1", tracer=self.tracer)
+        saver.setup_directories("Natuurkunde")
+        saver.write_data({"book": "Natuurkunde", "chapter_index": 5, "paragraph_index": 2,
+                          "objectives": "", "lesson": "Kracht"})
+        self.tracer._file.flush()
+
+        span = self._spans()[0]
+        assert (span["name"], span["cat"]) == ("write_data", "storage")
+        assert span["args"] == {"chapter": 5, "paragraph": 2}
+
+        self.tracer.close()
+        merged = Path(self.temp_dir) / "merged.json"
+        assert merge_traces([self.tracer.path, self.tracer.path], merged) == 2 * len(load_trace(self.tracer.path))
+
+    def test_trace_survives_recovery_cleanup(self):
+        """Test dat herstel na een crash de trace open laat en alleen de laatste cleanup hem sluit"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com",
+                                            output=OutputConfig(output_dir=self.temp_dir, trace=True)), None)
+        runner.tracer = self.tracer
+        with self.tracer.span("poging", attempt=1):
+            pass
+        asyncio.run(runner.cleanup(final=False))
+        assert self.tracer.enabled
+        with self.tracer.span("poging", attempt=2):
+            pass
+        asyncio.run(runner.cleanup())
+        assert not self.tracer.enabled
+        assert [s["args"]["attempt"] for s in self._spans() if s["name"] == "poging"] == [1, 2]
+
+    def test_parallel_image_spans_use_paragraph_arguments(self):
+        """Test dat afbeelding spans in parallel mode de paragraaf uit de argumenten krijgen, niet uit self.status"""
+        runner = ScrapeRunner(ScraperConfig(start_url="https://example.com"), None)
+        runner.tracer = self.tracer
+        runner.saver = SimpleNamespace(save_image=lambda *args: asyncio.sleep(0))
+        page = SimpleNamespace(url="https://example.com/boek/1")
+
+        async def scenario():
+            await asyncio.gather(runner.extract_images(2, 1, page, srcs=["a.png"]),
+                                 runner.extract_images(2, 4, page, srcs=["b.png"]))
+
+        asyncio.run(scenario())
+        self.tracer.close()
+        assert sorted((s["args"]["chapter"], s["args"]["paragraph"])
+                      for s in self._spans() if s["name"] == "images") == [(2, 1), (2, 4)]
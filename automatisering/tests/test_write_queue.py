@@ -0,0 +1,167 @@
+# tests/test_write_queue.py
+"""
+Unit tests voor WriteQueue.
+"""
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from config.config_manager import ScraperConfig
+from runner.playwright_runner import ScrapeRunner
+from storage.write_queue import WriteQueue
+
+
+class FakeSaver:
+    """Saver stub: schrijft niets, houdt bij wat er weggeschreven is en kan blokkeren"""
+
+    def __init__(self):
+        self.written = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def write_data(self, data):
+        self.gate.wait(timeout=5)
+        if data.get("fail"):
+            return ""  # Net als DataSaver.write_data bij een schrijffout
+        self.written.append(data["paragraph_index"])
+        return f"/export/{data['paragraph_index']}.txt"
+
+
+def _record(index: int, **extra):
+    record = {"chapter_index": 1, "paragraph_index": index}
+    record.update(extra)
+    return record
+
+
+class TestWriteQueue:
+    """Test cases voor WriteQueue"""
+
+    def setup_method(self):
+        """Setup voor elke test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.saver = FakeSaver()
+        self.written = []
+        self.queue = WriteQueue(self.saver, maxsize=16, batch_size=4,
+                                on_written=lambda kind, payload, result: self.written.append((kind, result)))
+        self.batches = []
+        write_batch = self.queue._write_batch
+
+        def record_batch(batch):
+            self.batches.append(len(batch))
+            return write_batch(batch)
+
+        self.queue._write_batch = record_batch
+
+    def test_batches_while_writer_is_busy(self):
+        """Test dat records die binnenkomen terwijl de writer bezig is samen weggeschreven worden"""
+        async def scenario():
+            self.saver.gate.clear()
+            await self.queue.submit(_record(0))
+            await asyncio.sleep(0.05)  # Writer zit vast in de eerste schrijfronde
+            for index in range(1, 10):
+                await self.queue.submit(_record(index))
+            self.saver.gate.set()
+            await self.queue.close()
+
+        asyncio.run(scenario())
+        assert self.batches == [1, 4, 4, 1]
+        assert self.saver.written == list(range(10))
+
+    def test_backpressure_at_maxsize(self):
+        """Test dat submit wacht zodra de queue vol is en weer doorgaat als de schijf bijloopt"""
+        queue = WriteQueue(self.saver, maxsize=2, batch_size=1)
+
+        async def scenario():
+            self.saver.gate.clear()
+            await queue.submit(_record(0))
+            await asyncio.sleep(0.05)  # Record 0 is opgehaald, de writer blokkeert
+            await queue.submit(_record(1))
+            await queue.submit(_record(2))
+            assert queue.pending == 2
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(queue.submit(_record(3)), timeout=0.1)
+            self.saver.gate.set()
+            await asyncio.wait_for(queue.submit(_record(3)), timeout=5)
+            await queue.close()
+
+        asyncio.run(scenario())
+        assert self.saver.written == [0, 1, 2, 3]
+
+    def test_on_written_reports_results_and_failures(self):
+        """Test de callback per record, ook voor losse tekst en mislukte paragrafen"""
+        text_path = self.temp_dir / "stappen" / "tekst.txt"
+
+        async def scenario():
+            await self.queue.submit(_record(1))
+            await self.queue.submit_text(text_path, "Uit een stap")
+            await self.queue.submit(_record(2, fail=True))
+            await self.queue.flush()
+
+        asyncio.run(scenario())
+        assert text_path.read_text(encoding="utf-8") == "Uit een stap"
+        assert self.written == [("paragraph", "/export/1.txt"), ("text", str(text_path)), ("paragraph", "")]
+
+    def test_close_drains_and_queue_is_reusable(self):
+        """Test dat close() alles wegschrijft en de queue daarna opnieuw gebruikt kan worden"""
+        async def first_run():
+            for index in range(6):
+                await self.queue.submit(_record(index))
+            await self.queue.close()
+            return self.queue.pending
+
+        async def second_run():
+            await self.queue.submit(_record(6))
+            await self.queue.close()
+
+        assert asyncio.run(first_run()) == 0
+        assert self.saver.written == list(range(6))
+        assert len(self.written) == 6
+        asyncio.run(second_run())  # Nieuwe event loop, zoals bij herstel na een crash
+        assert self.saver.written == list(range(7))
+
+
+class FakeChapterPage:
+    """Page stub voor een hoofdstuk zonder paragrafen"""
+
+    url = "https://example.com/boek/1"
+
+    async def wait_for_selector(self, selector, timeout=None):
+        return None
+
+    async def query_selector_all(self, selector):
+        return []
+
+
+class FakeChapterElement:
+    async def click(self):
+        pass
+
+
+class TestChapterFlush:
+    """Test de flush van de write queue aan het einde van een hoofdstuk"""
+
+    def test_chapter_completes_without_write_queue(self):
+        """Test dat process_chapter zonder write queue (nooit aangemaakt) het hoofdstuk gewoon afrondt"""
+        config = ScraperConfig.model_validate({
+            "start_url": "https://example.com",
+            "output": {"output_dir": tempfile.mkdtemp(), "search_index": False}
+        })
+        runner = ScrapeRunner(config, None)
+        runner.page = FakeChapterPage()
+        runner.status.current_book = "Biologie"
+
+        async def ready(*args, **kwargs):
+            pass
+
+        runner._wait_ready = ready
+        assert runner.write_queue is None
+
+        asyncio.run(runner.process_chapter(FakeChapterElement(), 3))
+        frontier = runner._get_frontier()
+        try:
+            assert frontier.is_done(("Biologie", 3, 0))
+        finally:
+            frontier.close()
@@ -1,5 +1,7 @@
 # utils/helpers.py
 import re
+import json
+import hashlib
 import unicodedata
 from pathlib import Path
 import shortuuid
@@ -99,6 +101,24 @@ def validate_directory(path: str) -> tuple[bool, str]:
     except Exception as e:
         return False, f"Ongeldig pad: {str(e)}"
 
+def content_digest(data: dict) -> str:
+    """
+    Digest van de geëxtraheerde inhoud van een paragraaf (leerdoelen, leerstof,
+    custom velden, tabellen en afbeelding URLs). Tijdstempels en run info tellen niet mee,
+    zodat een ongewijzigde paragraaf bij een nieuwe run dezelfde digest heeft.
+    """
+    content = {
+        "objectives": data.get("objectives", ""),
+        "lesson": data.get("lesson", ""),
+        "custom_data": data.get("custom_data") or {},
+        "images": [img.get("src", "") for img in data.get("images") or [] if isinstance(img, dict)]
+    }
+    if data.get("tables"):
+        # Alleen als er tabellen zijn, zodat bestaande digests geldig blijven
+        content["tables"] = data["tables"]
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 def truncate_text(text: str, max_length: int = 500) -> str:
     """
     Truncate tekst voor weergave in UI.
@@ -0,0 +1,172 @@
+# utils/log_bus.py
+"""
+Gebufferde aflevering van runner logs aan de browser overlay en de GUI.
+
+Elke log regel direct doorsturen kost een page.evaluate (over hetzelfde
+CDP kanaal als het echte scrapewerk) en een Qt signaal per regel. De
+LogBus verzamelt regels per sink en levert ze met een vaste frequentie in
+één batch af. Elke sink heeft een eigen drempel, zodat bijvoorbeeld DEBUG
+regels wel in de GUI maar niet in de overlay terechtkomen.
+"""
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Runner niveaus (strings) naar een rangorde; onbekende niveaus tellen als INFO
+LEVELS = {"DEBUG": 10, "INFO": 20, "STEP": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+# (bericht, niveau, tijdstip in epoch ms)
+LogEntry = Tuple[str, str, int]
+
+# Ontvangt een batch; mag een coroutine functie zijn (bijv. een page.evaluate)
+LogDeliver = Callable[[List[LogEntry]], Any]
+
+
+def level_value(level: str) -> int:
+    return LEVELS.get(str(level).upper(), LEVELS["INFO"])
+
+
+class _Sink:
+    def __init__(self, name: str, deliver: LogDeliver, min_level: str, max_buffer: int):
+        self.name = name
+        self.deliver = deliver
+        self.min_level = level_value(min_level)
+        self.is_async = inspect.iscoroutinefunction(deliver)
+        self.buffer: Deque[LogEntry] = deque(maxlen=max_buffer)
+        self.dropped = 0
+        self.busy = False
+
+
+class LogBus:
+    """
+    Verzamelt log regels en levert ze per sink in batches af.
+
+    Zolang de bus niet draait (vóór start() of na close()) krijgen
+    synchrone sinks elke regel direct; asynchrone sinks wachten op de
+    volgende flush. Een trage asynchrone sink (overlay op een drukke pagina)
+    houdt de andere sinks niet op: zolang zijn vorige batch nog loopt wordt
+    hij overgeslagen, en bij een volle buffer vallen de oudste regels weg.
+    """
+
+    def __init__(self, interval: float = 0.1, max_buffer: int = 500):
+        """
+        Args:
+            interval: Seconden tussen twee flushes (0.1 = 10 keer per seconde)
+            max_buffer: Maximaal aantal wachtende regels per sink
+        """
+        self.interval = interval
+        self.max_buffer = max(1, max_buffer)
+        self._sinks: Dict[str, _Sink] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._pending: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_sink(self, name: str, deliver: LogDeliver, min_level: str = "DEBUG"):
+        """Registreer (of vervang) een sink met een eigen minimum niveau"""
+        with self._lock:
+            self._sinks[name] = _Sink(name, deliver, min_level, self.max_buffer)
+
+    def remove_sink(self, name: str):
+        with self._lock:
+            self._sinks.pop(name, None)
+
+    def set_level(self, name: str, min_level: str):
+        """Pas de drempel van een sink aan"""
+        with self._lock:
+            sink = self._sinks.get(name)
+            if sink:
+                sink.min_level = level_value(min_level)
+
+    def publish(self, message: str, level: str = "INFO"):
+        """Zet een regel klaar voor alle sinks waarvan de drempel gehaald wordt (thread-safe)"""
+        entry = (message, level, int(time.time() * 1000))
+        value = level_value(level)
+        direct = []
+        with self._lock:
+            for sink in self._sinks.values():
+                if value < sink.min_level:
+                    continue
+                if not self.running and not sink.is_async:
+                    direct.append(sink)
+                    continue
+                if len(sink.buffer) == sink.buffer.maxlen:
+                    sink.dropped += 1
+                sink.buffer.append(entry)
+        for sink in direct:
+            self._call(sink, [entry])
+
+    def start(self):
+        """Start de periodieke flush in de huidige event loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush_nowait()
+
+    def _take(self, sink: _Sink) -> List[LogEntry]:
+        """Haal de buffer van een sink leeg (aanroeper houdt de lock vast)"""
+        entries = list(sink.buffer)
+        sink.buffer.clear()
+        if sink.dropped:
+            entries.insert(0, (f"… {sink.dropped} log regel(s) overgeslagen", "WARNING", entries[0][2]))
+            sink.dropped = 0
+        return entries
+
+    def flush_nowait(self):
+        """Lever alle gebufferde regels af; asynchrone sinks krijgen een eigen task"""
+        batches = []
+        with self._lock:
+            for sink in self._sinks.values():
+                if sink.buffer and not sink.busy:
+                    sink.busy = sink.is_async
+                    batches.append((sink, self._take(sink)))
+        for sink, entries in batches:
+            if sink.is_async:
+                task = asyncio.create_task(self._deliver_async(sink, entries))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+            else:
+                self._call(sink, entries)
+
+    async def _deliver_async(self, sink: _Sink, entries: List[LogEntry]):
+        try:
+            await sink.deliver(entries)
+        except Exception:
+            pass  # Overlay weg (navigatie, pagina gesloten): deze batch vervalt
+        finally:
+            sink.busy = False
+
+    @staticmethod
+    def _call(sink: _Sink, entries: List[LogEntry]):
+        try:
+            sink.deliver(entries)
+        except Exception as e:
+            print(f"Fout in log sink '{sink.name}': {str(e)}")
+
+    async def flush(self):
+        """Lever alles af en wacht tot lopende asynchrone batches klaar zijn"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        self.flush_nowait()
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def close(self):
+        """Laatste flush en stop; daarna gaan regels weer direct naar synchrone sinks"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -4,25 +4,35 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
-from PyQt6.QtCore import QObject, pyqtSignal
+from typing import Optional
 
-class QtHandler(logging.Handler, QObject):
-    """Log handler die naar Qt signal stuurt voor GUI weergave"""
-    log_signal = pyqtSignal(str, int)  # message, level
-    
-    def __init__(self):
-        logging.Handler.__init__(self)
-        QObject.__init__(self)
+# PyQt6 is optioneel: zonder Qt (CLI/headless) is er geen GUI handler
+try:
+    from PyQt6.QtCore import QObject, pyqtSignal
+    HAS_QT = True
+except ImportError:
+    HAS_QT = False
+
+if HAS_QT:
+    class QtHandler(logging.Handler, QObject):
+        """Log handler die naar Qt signal stuurt voor GUI weergave"""
+        log_signal = pyqtSignal(str, int)  # message, level
         
-    def emit(self, record):
-        msg = self.format(record)
-        self.log_signal.emit(msg, record.levelno)
+        def __init__(self):
+            logging.Handler.__init__(self)
+            QObject.__init__(self)
+            
+        def emit(self, record):
+            msg = self.format(record)
+            self.log_signal.emit(msg, record.levelno)
 
 class Logger:
     """Gecentraliseerde logger voor applicatie"""
     
-    def __init__(self, app_name: str = "NoordhoffScraper"):
+    def __init__(self, app_name: str = "NoordhoffScraper", use_qt: bool = True):
         self.app_name = app_name
+        self.use_qt = use_qt and HAS_QT
+        self.qt_handler = None
         self.log_dir = Path.home() / "AppData" / "Local" / app_name / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
@@ -64,13 +74,14 @@ class Logger:
         self.logger.addHandler(file_handler)
         
         # Qt handler voor GUI
-        self.qt_handler = QtHandler()
-        self.qt_handler.setLevel(logging.INFO)
-        qt_formatter = logging.Formatter('%(levelname)s: %(message)s')
-        self.qt_handler.setFormatter(qt_formatter)
-        self.logger.addHandler(self.qt_handler)
+        if self.use_qt:
+            self.qt_handler = QtHandler()
+            self.qt_handler.setLevel(logging.INFO)
+            qt_formatter = logging.Formatter('%(levelname)s: %(message)s')
+            self.qt_handler.setFormatter(qt_formatter)
+            self.logger.addHandler(self.qt_handler)
         
-    def get_qt_handler(self) -> QtHandler:
+    def get_qt_handler(self) -> Optional["QtHandler"]:
         """Retourneer Qt handler voor GUI integratie"""
         return self.qt_handler
     
@@ -97,5 +108,5 @@ class Logger:
     def cleanup(self):
         """Verwijder handlers om fouten bij afsluiten te voorkomen"""
         self.logger.handlers.clear()
-        if hasattr(self, 'qt_handler'):
+        if self.qt_handler:
             self.qt_handler.close()
\ No newline at end of file
@@ -1,8 +1,95 @@
+import asyncio
+import bisect
+import json
+import math
+import threading
 import time
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
 
+# Fasen van een paragraaf waarvan de duur gemeten wordt (sleutel -> label voor de GUI)
+STAGES = {
+    "navigation": "Navigatie",
+    "ready": "Wachten op pagina",
+    "extraction": "Extractie",
+    "images": "Afbeeldingen",
+    "save": "Opslaan",
+}
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Streaming histogram met logaritmische buckets (1 ms tot ~10 min, 20% per
+    bucket). Geheugen en kosten per meting zijn constant, percentielen worden
+    binnen de bucket geïnterpoleerd (fout hooguit één bucketbreedte).
+    """
+
+    BOUNDS = tuple(0.001 * 1.2 ** i for i in range(74))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # Laatste bucket: boven de hoogste grens
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        seconds = max(0.0, seconds)
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Geschatte waarde (seconden) waaronder een fractie q van de metingen valt"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for idx, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                lower = self.BOUNDS[idx - 1] if idx > 0 else 0.0
+                upper = self.BOUNDS[idx] if idx < len(self.BOUNDS) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / n, self.max)
+            cumulative += n
+        return self.max
+
+
+class EwmaRate:
+    """
+    Exponentieel gewogen aantal gebeurtenissen per seconde. Oude gebeurtenissen
+    tellen steeds minder mee (tijdconstante tau), zodat de waarde snel volgt
+    als de scraper versnelt of vastloopt.
+    """
+
+    def __init__(self, tau: float = 60.0):
+        self.tau = tau
+        self._rate = 0.0
+        self._last: Optional[float] = None
+
+    def tick(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self._rate = self.rate(now) + 1.0 / self.tau
+        self._last = now
+
+    def rate(self, now: Optional[float] = None) -> float:
+        if self._last is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return self._rate * math.exp(-max(0.0, now - self._last) / self.tau)
+
+
+@dataclass
+class StageStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    throughput: EwmaRate = field(default_factory=EwmaRate)
+
+
 @dataclass
 class MetricsData:
     start_time: float = field(default_factory=time.time)
@@ -16,17 +103,30 @@ class MetricsData:
     completed_chapters: int = 0
     total_paragraphs: int = 0
     completed_paragraphs: int = 0
+    
+    # Media downloads (video's)
+    media_active: int = 0
+    media_completed: int = 0
+    media_failed: int = 0
+    media_bytes: int = 0
+    media_queued: int = 0
+    media_first_start: Optional[float] = None
 
 class MetricsTracker:
     """Tracks scraping progress and calculates ETA"""
     
     def __init__(self):
         self.data = MetricsData()
-        self.item_times = [] # List of (timestamp, completed_count)
+        self.item_times = deque(maxlen=50) # (timestamp, completed_count) for moving average
+        # Fase metingen komen ook uit de write queue thread
+        self._stage_lock = threading.Lock()
+        self.stages = {name: StageStats() for name in STAGES}
         
     def reset(self, total_items: int = 0):
         self.data = MetricsData(start_time=time.time(), total_items=total_items)
-        self.item_times = [(self.data.start_time, 0)]
+        self.item_times = deque([(self.data.start_time, 0)], maxlen=50)
+        with self._stage_lock:
+            self.stages = {name: StageStats() for name in STAGES}
         
     def set_total_items(self, count: int):
         self.data.total_items = count
@@ -38,9 +138,6 @@ class MetricsTracker:
             self.data.failed_items += 1
             
         self.item_times.append((time.time(), self.data.completed_items))
-        # Keep only last 50 entries for moving average
-        if len(self.item_times) > 50:
-            self.item_times.pop(0)
             
     def update_hierarchy(self, chapters: int = None, paragraphs: int = None):
         if chapters is not None:
@@ -55,6 +152,57 @@ class MetricsTracker:
         self.data.completed_paragraphs += 1
         self.item_completed(True)
 
+    def media_started(self):
+        self.data.media_active += 1
+        if self.data.media_first_start is None:
+            self.data.media_first_start = time.time()
+        
+    def media_queue_changed(self, depth: int):
+        self.data.media_queued = depth
+        
+    def media_progress(self, nbytes: int):
+        self.data.media_bytes += nbytes
+        
+    def media_finished(self, success: bool = True):
+        self.data.media_active = max(0, self.data.media_active - 1)
+        if success:
+            self.data.media_completed += 1
+        else:
+            self.data.media_failed += 1
+
+    def record_stage(self, stage: str, seconds: float):
+        """Registreer de duur van één keer een fase (zie STAGES)"""
+        with self._stage_lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.histogram.observe(seconds)
+            stats.throughput.tick()
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Meet de duur van een blok code, ook rond awaits: `with metrics.stage("save"): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def get_stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Per fase: aantal, p50/p95/p99/max in ms en EWMA doorvoer per minuut"""
+        now = time.time()
+        summary = {}
+        with self._stage_lock:
+            for name, stats in self.stages.items():
+                hist = stats.histogram
+                entry = {"count": hist.count}
+                for q in PERCENTILES:
+                    entry[f"p{int(q * 100)}_ms"] = round(hist.percentile(q) * 1000, 1)
+                entry["max_ms"] = round(hist.max * 1000, 1)
+                entry["per_min"] = round(stats.throughput.rate(now) * 60, 2)
+                summary[name] = entry
+        return summary
+
     def get_speed(self) -> float:
         """Items per minute"""
         if len(self.item_times) < 2:
@@ -70,6 +218,15 @@ class MetricsTracker:
         items_done = end_c - start_c
         return (items_done / duration_sec) * 60
 
+    def get_media_throughput(self) -> float:
+        """Gemiddelde media doorvoer in MB/s sinds de eerste download"""
+        if self.data.media_first_start is None:
+            return 0.0
+        duration_sec = time.time() - self.data.media_first_start
+        if duration_sec <= 0:
+            return 0.0
+        return self.data.media_bytes / (1024 * 1024) / duration_sec
+
     def get_eta(self) -> Optional[timedelta]:
         """Estimated time remaining"""
         speed_per_sec = self.get_speed() / 60
@@ -96,5 +253,67 @@ class MetricsTracker:
             "speed": self.get_speed(),
             "eta": str(self.get_eta()) if self.get_eta() else "Onbekend",
             "progress": self.get_progress_percentage(),
-            "elapsed": str(timedelta(seconds=int(time.time() - self.data.start_time)))
+            "elapsed": str(timedelta(seconds=int(time.time() - self.data.start_time))),
+            "media_active": self.data.media_active,
+            "media_completed": self.data.media_completed,
+            "media_failed": self.data.media_failed,
+            "media_mb": round(self.data.media_bytes / (1024 * 1024), 1),
+            "media_queued": self.data.media_queued,
+            "media_mb_s": round(self.get_media_throughput(), 2),
+            "stages": self.get_stage_summary()
         }
+
+    def to_prometheus(self) -> str:
+        """Metrics in het Prometheus tekstformaat (bijv. voor de node_exporter textfile collector)"""
+        lines = [
+            "# HELP scraper_items_total Verwerkte items per status",
+            "# TYPE scraper_items_total counter",
+            f'scraper_items_total{{status="completed"}} {self.data.completed_items}',
+            f'scraper_items_total{{status="failed"}} {self.data.failed_items}',
+            "# HELP scraper_items_expected Verwachte aantal items",
+            "# TYPE scraper_items_expected gauge",
+            f"scraper_items_expected {self.data.total_items}",
+            "# HELP scraper_media_bytes_total Gedownloade media bytes",
+            "# TYPE scraper_media_bytes_total counter",
+            f"scraper_media_bytes_total {self.data.media_bytes}",
+            "# HELP scraper_stage_seconds Duur per fase",
+            "# TYPE scraper_stage_seconds summary",
+        ]
+        rates = []
+        now = time.time()
+        with self._stage_lock:
+            for name, stats in self.stages.items():
+                hist = stats.histogram
+                for q in PERCENTILES:
+                    lines.append(f'scraper_stage_seconds{{stage="{name}",quantile="{q}"}} {hist.percentile(q):.6f}')
+                lines.append(f'scraper_stage_seconds_sum{{stage="{name}"}} {hist.total:.6f}')
+                lines.append(f'scraper_stage_seconds_count{{stage="{name}"}} {hist.count}')
+                rates.append(f'scraper_stage_rate{{stage="{name}"}} {stats.throughput.rate(now):.6f}')
+        lines += [
+            "# HELP scraper_stage_rate EWMA doorvoer per fase (per seconde)",
+            "# TYPE scraper_stage_rate gauge",
+        ] + rates
+        return "\n".join(lines) + "\n"
+
+    def write_files(self, directory: Path):
+        """Schrijf metrics.json en metrics.prom (atomair) in een map"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        summary = self.get_summary()
+        summary["timestamp"] = datetime.now().isoformat()
+        for filename, content in (
+            ("metrics.json", json.dumps(summary, ensure_ascii=False, indent=2)),
+            ("metrics.prom", self.to_prometheus()),
+        ):
+            temp_path = directory / (filename + ".tmp")
+            temp_path.write_text(content, encoding="utf-8")
+            temp_path.replace(directory / filename)  # Atomic Save
+
+    async def export_periodically(self, directory: Path, interval: float):
+        """Schrijf de metrics bestanden elke interval seconden, tot de task geannuleerd wordt"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.write_files, directory)
+            except Exception as e:
+                print(f"Fout bij wegschrijven metrics: {str(e)}")
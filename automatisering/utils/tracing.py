@@ -0,0 +1,229 @@
+# utils/tracing.py
+"""
+Opt-in tracing van de runner in het Chrome trace-event formaat.
+
+Spans worden tijdens de run direct naar runs/<id>/trace.json gestreamd
+(JSON array formaat, ook na een crash te openen) en zijn te bekijken in
+chrome://tracing of https://ui.perfetto.dev. Gelijktijdige asyncio tasks en
+threads krijgen elk een eigen baan (tid), zodat overlap zichtbaar blijft.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Lange attributen (bijv. data: URLs) worden afgekapt
+MAX_ATTRIBUTE_LENGTH = 200
+
+
+class Tracer:
+    """
+    Schrijft spans (complete events, ph "X") met start, duur en attributen.
+    Zonder pad is de tracer uitgeschakeld en kost een span vrijwel niets.
+    """
+
+    FILENAME = "trace.json"
+
+    def __init__(self, path: Optional[Path] = None, process_name: str = "scraper"):
+        """
+        Args:
+            path: Doelbestand; None = tracing uit
+            process_name: Naam van het proces in de trace viewer
+        """
+        self.path = Path(path) if path else None
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._file = None
+        self._closed = False
+        # Baan per task/thread; een baan komt vrij als de laatste open span sluit
+        self._lanes: Dict[Any, int] = {}
+        self._depth: Dict[Any, int] = {}
+        self._free_lanes: list = []
+        self._lane_count = 0
+
+    @classmethod
+    def for_run(cls, output_dir, run_id: str) -> "Tracer":
+        """Tracer voor runs/<run_id>/trace.json in een output directory"""
+        return cls(Path(output_dir) / "runs" / run_id / cls.FILENAME, process_name=f"run {run_id}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and not self._closed
+
+    @staticmethod
+    def _owner() -> Any:
+        """De asyncio task of thread waarin de span loopt"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return task if task is not None else ("thread", threading.get_ident())
+
+    def _acquire_lane(self, owner: Any) -> int:
+        lane = self._lanes.get(owner)
+        if lane is None:
+            if self._free_lanes:
+                self._free_lanes.sort()
+                lane = self._free_lanes.pop(0)
+            else:
+                self._lane_count += 1
+                lane = self._lane_count
+                self._write({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": lane,
+                             "args": {"name": f"baan {lane}"}})
+            self._lanes[owner] = lane
+        self._depth[owner] = self._depth.get(owner, 0) + 1
+        return lane
+
+    def _release_lane(self, owner: Any):
+        self._depth[owner] -= 1
+        if self._depth[owner] == 0:
+            del self._depth[owner]
+            self._free_lanes.append(self._lanes.pop(owner))
+
+    @contextmanager
+    def span(self, name: str, category: str = "runner", **attributes):
+        """
+        Meet een blok code als span: `with tracer.span("paragraph", chapter=1): ...`
+
+        Args:
+            name: Naam van de span
+            category: Categorie (filter in de trace viewer)
+            **attributes: Extra informatie, bijv. hoofdstuk, paragraaf of selector
+        """
+        if not self.enabled:
+            yield
+            return
+
+        owner = self._owner()
+        with self._lock:
+            lane = self._acquire_lane(owner)
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter_ns()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration_us = (time.perf_counter_ns() - start) // 1000
+            args = {}
+            for key, value in attributes.items():
+                if isinstance(value, str) and len(value) > MAX_ATTRIBUTE_LENGTH:
+                    value = value[:MAX_ATTRIBUTE_LENGTH] + "…"
+                if value is not None:
+                    args[key] = value
+            if error:
+                args["error"] = error
+            with self._lock:
+                self._release_lane(owner)
+                self._write({"name": name, "cat": category, "ph": "X", "ts": start_us,
+                             "dur": duration_us, "pid": self.pid, "tid": lane, "args": args})
+
+    def _write(self, event: Dict[str, Any]):
+        """Schrijf één event (aanroeper houdt de lock vast)"""
+        if self._closed:
+            return
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._file.write("[\n")
+                self._file.write(json.dumps({"name": "process_name", "ph": "M", "pid": self.pid,
+                                             "args": {"name": self.process_name}}) + ",\n")
+            self._file.write(json.dumps(event, ensure_ascii=False, default=str) + ",\n")
+        except OSError as e:
+            print(f"Tracing uitgeschakeld, kon {self.path} niet schrijven: {str(e)}")
+            self._closed = True
+
+    def close(self):
+        """Sluit het trace bestand af (geldige JSON array)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps({"name": "trace_end", "ph": "i", "s": "g", "pid": self.pid,
+                                             "ts": time.time_ns() // 1000}) + "\n]\n")
+                self._file.close()
+                self._file = None
+            self._closed = True
+
+
+def traced(name: str, category: str = "runner", **attribute_paths: str):
+    """
+    Decorator die een (async) methode als span meet via self.tracer.
+
+    Attributen worden uit de argumenten gehaald met een (gestippeld) pad, ook
+    door dictionaries heen, bijv. @traced("step", action="step.action") of
+    @traced("write_data", chapter="data.chapter_index").
+    """
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+
+        def attributes(args, kwargs) -> Dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = {}
+            for key, path in attribute_paths.items():
+                root, *parts = path.split(".")
+                value = bound.arguments.get(root)
+                for part in parts:
+                    value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+                values[key] = value
+            return values
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                tracer = getattr(self, "tracer", None)
+                if tracer is None or not tracer.enabled:
+                    return await func(self, *args, **kwargs)
+                with tracer.span(name, category, **attributes((self,) + args, kwargs)):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, "tracer", None)
+            if tracer is None or not tracer.enabled:
+                return func(self, *args, **kwargs)
+            with tracer.span(name, category, **attributes((self,) + args, kwargs)):
+                return func(self, *args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def load_trace(path: Path) -> list:
+    """Lees een trace bestand, ook als het niet afgesloten is (run gecrasht)"""
+    text = Path(path).read_text(encoding="utf-8").strip()
+    if not text.endswith("]"):
+        text = text.rstrip(",") + "]"
+    return json.loads(text)
+
+
+def merge_traces(paths: Iterable[Path], target: Path) -> int:
+    """
+    Voeg de traces van meerdere processen (parallel mode) samen tot één bestand.
+    Elk proces houdt zijn eigen pid, tijdstempels zijn wall clock en lijnen dus uit.
+
+    Returns:
+        Aantal events in het samengevoegde bestand
+    """
+    events = []
+    for path in paths:
+        try:
+            events.extend(load_trace(path))
+        except (OSError, ValueError) as e:
+            print(f"Waarschuwing: Kon trace {path} niet lezen: {str(e)}")
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_target = target.with_name(target.name + ".tmp")
+    temp_target.write_text(json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    temp_target.replace(target)  # Atomic Save
+    return len(events)